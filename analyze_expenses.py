@@ -1,126 +1,30 @@
-import csv
-import glob
-import os
-from datetime import datetime
+import transaction_store
+import categorizer
+import bas_periods
 
 # Define periods
 # FY Previous: July 1, 2024 to June 30, 2025
-FY_START = datetime(2024, 7, 1)
-FY_END = datetime(2025, 6, 30)
+FY_START, FY_END = bas_periods.period_range("FY2025")
 
 # Recent Quarter: Oct 1, 2025 to Dec 31, 2025
-OCT_DEC_START = datetime(2025, 10, 1)
-OCT_DEC_END = datetime(2025, 12, 31)
+OCT_DEC_START, OCT_DEC_END = bas_periods.period_range("FY2026-Q2")
 
-def parse_amount(amount_str):
-    if not amount_str: return 0.0
-    # Remove Currency symbol and commas
-    clean = amount_str.replace('$', '').replace(',', '').strip()
-    try:
-        return float(clean)
-    except ValueError:
-        return 0.0
-
-def parse_date(date_str):
-    # Try multiple formats
-    # NAB usually: 25 Jun 25 or 25/06/2025
-    formats = ['%d %b %y', '%d/%m/%Y', '%Y-%m-%d']
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str.strip(), fmt)
-        except ValueError:
-            continue
-    return None
+# Rent, Facebook Ads (incl. 'paypal *facebook'), software... - see category_rules.json
+EXPENSE_RULES = categorizer.load_categorizer("expenses")
 
 def load_transactions():
-    files = ['Transactions.csv', 'Transactions (1).csv', 'Transactions (2).csv']
-    all_transactions = []
-    seen_hashes = set()
-
-    print("Checking for transaction files...")
-    for f in files:
-        if os.path.exists(f):
-            print(f"  -> Reading {f}...")
-            try:
-                with open(f, 'r', encoding='utf-8-sig') as csvfile:
-                    reader = csv.reader(csvfile)
-                    rows = list(reader)
-                    
-                    if not rows: continue
-                    
-                    start_idx = 1 # Skip header
-                    
-                    for row in rows[start_idx:]:
-                        if len(row) < 6: continue 
-                        
-                        date_str = row[0]
-                        amount_str = row[1]
-                        details = row[5] # Index 5 is Transaction Details
-                        
-                        dt = parse_date(date_str)
-                        if not dt: continue 
-                        
-                        amt = parse_amount(amount_str)
-                        
-                        txn_hash = (date_str, amount_str, details)
-                        if txn_hash in seen_hashes:
-                            continue
-                        seen_hashes.add(txn_hash)
-                        
-                        all_transactions.append({
-                            'date': dt,
-                            'amount': amt,
-                            'details': details,
-                            'original_date': date_str
-                        })
-                        
-            except Exception as e:
-                print(f"  -> Error reading {f}: {e}")
-        else:
-            print(f"  -> File not found: {f}")
-            
+    print("Loading transactions from the transaction store...")
+    # Export file / line order: the float category sums (and so the half-cent
+    # monthly averages and projections) come out as they always have
+    all_transactions = transaction_store.load_transactions(order="id")
     print(f"Total unique transactions loaded: {len(all_transactions)}")
     return all_transactions
 
-def categorize_expense(details):
-    details = str(details).lower()
-    
-    # RENT
-    if 'dre bre' in details or 'drebre' in details or 'dbre' in details: return 'Rent (Business Premises)'
-    
-    # Marketing (Prioritize to catch 'paypal *facebook')
-    if 'facebook' in details or 'meta' in details or 'facebk' in details or 'fb.me' in details or 'ads' in details: 
-        # Exclude 'refund' or 'credit' if appearing in details (though we filter for negative amounts anyway)
-        return 'Marketing: Facebook Ads'
-
-    # Software & Subscriptions
-    if 'manychat' in details: return 'Software: ManyChat'
-    if 'zapier' in details: return 'Software: Zapier'
-    if 'cursor' in details: return 'Software: Cursor AI'
-    if 'trainerize' in details: return 'Software: ABC Trainerize'
-    if 'wix' in details: return 'Software: Wix'
-    if 'google' in details: return 'Software: Google'
-    if 'microsoft' in details: return 'Software: Microsoft'
-    if 'canva' in details: return 'Software: Canva'
-    if 'openai' in details or 'anthropic' in details or 'claude' in details or 'chatgpt' in details: return 'Software: AI Models'
-    if 'apple.com/bill' in details or 'itunes' in details: return 'Software: Apple Services'
-    
-    # Generic PayPal (Catch-all for other subs)
-    if 'paypal' in details: return 'Software: Other PayPal Services'
-    
-    # Internet & Phone
-    if 'tpg' in details or 'vodafone' in details: return 'Internet & Phone'
-    
-    # Insurance
-    if 'bizcover' in details or 'insurance' in details or 'nib' in details: return 'Insurance'
-    
-    return 'Other'
-
 def analyze_period(transactions, start_date, end_date, period_name):
     print(f"\n=== ANALYSIS FOR {period_name.upper()} ===")
-    print(f"Range: {start_date.date()} to {end_date.date()}")
+    print(f"Range: {start_date} to {end_date}")
     
-    in_period = [t for t in transactions if start_date <= t['date'] <= end_date]
+    in_period = [t for t in transactions if start_date <= t['date'].date() <= end_date]
     print(f"Transactions in period: {len(in_period)}")
     
     if not in_period:
@@ -130,8 +34,8 @@ def analyze_period(transactions, start_date, end_date, period_name):
     expenses = [t for t in in_period if t['amount'] < 0]
     category_totals = {}
     
-    for txn in expenses:
-        cat = categorize_expense(txn['details'])
+    categories = EXPENSE_RULES.classify_all([t['details'] for t in expenses], [t['amount'] for t in expenses])
+    for txn, (cat, rule, keyword) in zip(expenses, categories):
         amount = abs(txn['amount'])
         category_totals[cat] = category_totals.get(cat, 0) + amount
         
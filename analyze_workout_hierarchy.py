@@ -1,5 +1,4 @@
-import re
-import json
+from workout_library import Parser, ParseError
 
 def analyze_full_structure(filename, variable_name):
     print(f"\n--- Analyzing {filename} ---")
@@ -10,34 +9,17 @@ def analyze_full_structure(filename, variable_name):
         print(f"File not found: {filename}")
         return
 
-    # Extract the JS object string roughly
-    # This is a bit hacky because it's JS, not JSON.
-    # We'll try to parse the structure using regex indentation for a summary.
-    
-    lines = content.split('\n')
-    current_category = None
-    current_subcategory = None
-    
-    structure = {}
-    
-    for line in lines:
-        # Category: "key": {
-        cat_match = re.match(r'^\s{2}"([\w\s-]+)": \{', line)
-        if cat_match:
-            current_category = cat_match.group(1)
-            structure[current_category] = []
-            current_subcategory = None
-            continue
-            
-        # Subcategory: "key": {  (usually 6 spaces indent in the file structure I saw)
-        sub_match = re.match(r'^\s{6}"([\w\s-]+)": \{', line)
-        if sub_match and current_category:
-            sub = sub_match.group(1)
-            structure[current_category].append(sub)
-    
-    for cat, subs in structure.items():
+    # Parsed as a JS object literal (workout_library.Parser), so layout and
+    # indentation don't matter
+    try:
+        library = Parser.const(content, variable_name)
+    except ParseError as e:
+        print(f"Could not parse {variable_name}: {e}")
+        return
+
+    for cat, category in library.items():
         print(f"Category: {cat}")
-        for sub in subs:
+        for sub in category.get("subcategories", {}):
             print(f"  - {sub}")
 
 analyze_full_structure('workout_library.js', 'WORKOUT_LIBRARY')
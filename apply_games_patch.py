@@ -1,7 +1,5 @@
 import sys
-
-with open('lib/games.js', 'r') as f:
-    text = f.read()
+from patch_engine import Edit, patch_file
 
 # Replace accept/decline logic
 search1 = """      if (modal) modal.remove();
@@ -96,14 +94,12 @@ replace3 = """      const winnerId = checkResult.winner === 'me' ? myId : (match
       return;
     }"""
 
-if search1 in text:
-    text = text.replace(search1, replace1)
-if search2 in text:
-    text = text.replace(search2, replace2)
-if search3 in text:
-    text = text.replace(search3, replace3)
-
-with open('lib/games.js', 'w') as f:
-    f.write(text)
-
-print("Done")
+# Optional so re-running on an already patched file is a no-op
+result = patch_file('lib/games.js', [
+    Edit(search1, replace1, count="all", optional=True, label="accept/decline nudges"),
+    Edit(search2, replace2, count="all", optional=True, label="normal move nudge"),
+    Edit(search3, replace3, count="all", optional=True, label="game complete nudge"),
+], dry_run="--dry-run" in sys.argv)
+print(result.report())
+if result.diff:
+    print(result.diff)
@@ -0,0 +1,206 @@
+import os
+import re
+import sys
+import hashlib
+from datetime import date, timedelta
+import transaction_store
+import categorizer
+
+# BAS figures for any period from one pass over the ledger.
+#
+#   python bas_periods.py                     -> every quarter + FY in the data
+#   python bas_periods.py FY2025              -> one financial year, by quarter
+#   python bas_periods.py FY2026-Q2 2025-04-01..2025-06-30
+#
+# Every bank row is classified once with the "bas" rules and summed into
+# per-day totals (G1 sales, G11 GST-claimable purchases, private/no-GST
+# purchases, internal transfers). Those rollups are cached in the transaction
+# store next to the rows they came from and turned into prefix sums, so a
+# period of any length is two lookups: prefix[end] - prefix[start - 1].
+
+COLUMNS = ("g1", "g11", "no_gst", "internal")
+ROLLUP_VERSION = 1
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bas_daily (
+    day INTEGER PRIMARY KEY,
+    g1 INTEGER NOT NULL,
+    g11 INTEGER NOT NULL,
+    no_gst INTEGER NOT NULL,
+    internal INTEGER NOT NULL
+);
+"""
+
+QUARTER_NAMES = {1: "Jul-Sep", 2: "Oct-Dec", 3: "Jan-Mar", 4: "Apr-Jun"}
+
+
+def fy_range(fy):
+    # Australian financial year: FY2025 = 1 Jul 2024 - 30 Jun 2025
+    return date(fy - 1, 7, 1), date(fy, 6, 30)
+
+def quarter_range(fy, quarter):
+    # Q1 = Jul-Sep of the previous calendar year ... Q4 = Apr-Jun
+    year = fy - 1 if quarter <= 2 else fy
+    start_month = {1: 7, 2: 10, 3: 1, 4: 4}[quarter]
+    start = date(year, start_month, 1)
+    next_start = date(year + 1, 1, 1) if start_month == 10 else date(year, start_month + 3, 1)
+    return start, next_start - timedelta(days=1)
+
+def fy_of(day):
+    return day.year + 1 if day.month >= 7 else day.year
+
+def period_range(spec):
+    # "FY2025", "FY2026-Q2", "2025-04-01..2025-06-30" -> (start, end) dates
+    spec = spec.strip().upper()
+    m = re.fullmatch(r'FY(\d{4})(?:-?Q([1-4]))?', spec)
+    if m:
+        fy = int(m.group(1))
+        return quarter_range(fy, int(m.group(2))) if m.group(2) else fy_range(fy)
+    m = re.fullmatch(r'(\d{4}-\d{2}-\d{2})\.\.(\d{4}-\d{2}-\d{2})', spec)
+    if m:
+        return date.fromisoformat(m.group(1)), date.fromisoformat(m.group(2))
+    raise ValueError(f"Unknown period '{spec}' (use FY2025, FY2026-Q2 or 2025-04-01..2025-06-30)")
+
+def period_label(spec):
+    start, end = period_range(spec)
+    m = re.fullmatch(r'FY(\d{4})-?Q([1-4])', spec.strip().upper())
+    if m:
+        return f"{QUARTER_NAMES[int(m.group(2))]} {start.year} (FY{m.group(1)} Q{m.group(2)})"
+    if spec.strip().upper().startswith("FY"):
+        return spec.strip().upper()
+    return f"{start.strftime('%d %b %Y')} - {end.strftime('%d %b %Y')}"
+
+
+class DailyRollup:
+    # Prefix sums of per-day integer totals over a contiguous run of days
+
+    def __init__(self, columns, daily):
+        # daily: {day ordinal: {column: value}}
+        self.columns = columns
+        self.first = min(daily) if daily else 0
+        self.last = max(daily) if daily else -1
+        self.prefix = {}
+        for col in columns:
+            running, sums = 0, [0]
+            for day in range(self.first, self.last + 1):
+                running += daily.get(day, {}).get(col, 0)
+                sums.append(running)
+            self.prefix[col] = sums
+
+    def total(self, start, end):
+        # Inclusive range of dates/datetimes/ordinals, clamped to the data
+        lo = max(transaction_store.to_day(start) if not isinstance(start, int) else start, self.first)
+        hi = min(transaction_store.to_day(end) if not isinstance(end, int) else end, self.last)
+        if hi < lo:
+            return {col: 0 for col in self.columns}
+        return {col: self.prefix[col][hi - self.first + 1] - self.prefix[col][lo - self.first]
+                for col in self.columns}
+
+    def covers(self, start, end):
+        return self.first <= transaction_store.to_day(start) and transaction_store.to_day(end) <= self.last
+
+
+def rules_signature(store):
+    # Rollups depend on the ledger and on the rules that classified it
+    digest = hashlib.sha1(str(ROLLUP_VERSION).encode())
+    for path in (categorizer.RULES_FILE, categorizer.OVERRIDES_FILE):
+        if os.path.exists(path):
+            digest.update(transaction_store.file_sha1(path).encode())
+    for row in store.conn.execute("SELECT path, sha1 FROM sources WHERE kind = 'bank' ORDER BY path"):
+        digest.update(f"{row[0]}:{row[1]}".encode())
+    return digest.hexdigest()
+
+def build_daily(store):
+    rows = store.query()
+    amounts = [r["amount_cents"] for r in rows]
+    results = categorizer.load_categorizer("bas").classify_all(
+        [f"{r['details']} {r['merchant']}" for r in rows], amounts)
+
+    daily = {}
+    for row, cents, (category, rule, keyword) in zip(rows, amounts, results):
+        totals = daily.setdefault(row["day"], dict.fromkeys(COLUMNS, 0))
+        if cents > 0:
+            # Every inflow except internal / linked account transfers is a sale
+            totals["internal" if category == "INTERNAL" else "g1"] += cents
+        elif cents < 0:
+            totals["g11" if category == "GST" else "no_gst"] += -cents
+    return daily
+
+def load_rollup(store=None, verbose=False):
+    own_store = store is None
+    store = store or transaction_store.TransactionStore()
+    store.refresh(verbose=verbose)
+    store.conn.executescript(ROLLUP_SCHEMA)
+
+    signature = rules_signature(store)
+    cached = store.conn.execute("SELECT value FROM meta WHERE key = 'bas_daily'").fetchone()
+    if cached and cached[0] == signature:
+        daily = {r[0]: dict(zip(COLUMNS, r[1:])) for r in
+                 store.conn.execute("SELECT day, g1, g11, no_gst, internal FROM bas_daily")}
+    else:
+        daily = build_daily(store)
+        with store.conn:
+            store.conn.execute("DELETE FROM bas_daily")
+            store.conn.executemany("INSERT INTO bas_daily VALUES (?, ?, ?, ?, ?)",
+                                   [(day, *(t[c] for c in COLUMNS)) for day, t in daily.items()])
+            store.conn.execute("INSERT OR REPLACE INTO meta VALUES ('bas_daily', ?)", (signature,))
+    if own_store:
+        store.close()
+    return DailyRollup(COLUMNS, daily)
+
+def bas_figures(rollup, start, end):
+    totals = rollup.total(start, end)
+    g1, g11 = totals["g1"] / 100, totals["g11"] / 100
+    return {
+        "G1": g1,
+        "1A": g1 / 11,
+        "G11": g11,
+        "1B": g11 / 11,
+        "no_gst": totals["no_gst"] / 100,
+        "payable": (g1 - g11) / 11,
+    }
+
+def print_bas(title, figures):
+    print("-" * 50)
+    print(f"BAS ESTIMATE: {title}")
+    print("-" * 50)
+    print(f"G1 (Total Sales):           ${figures['G1']:,.2f}")
+    print(f"1A (GST on Sales):          ${figures['1A']:,.2f}")
+    print("-" * 50)
+    print(f"G11 (Non-Capital Purch):    ${figures['G11']:,.2f}")
+    print(f"1B (GST on Purchases):      ${figures['1B']:,.2f}")
+    print("-" * 50)
+    print(f"PAYABLE AMOUNT:             ${figures['payable']:,.2f}")
+    print("-" * 50)
+
+def print_table(rollup, specs):
+    print(f"{'Period':<34} {'G1':>12} {'1A':>10} {'G11':>12} {'1B':>10} {'Payable':>10}")
+    for spec in specs:
+        f = bas_figures(rollup, *period_range(spec))
+        partial = "" if rollup.covers(*period_range(spec)) else " *"
+        print(f"{period_label(spec) + partial:<34} {f['G1']:>12,.2f} {f['1A']:>10,.2f} "
+              f"{f['G11']:>12,.2f} {f['1B']:>10,.2f} {f['payable']:>10,.2f}")
+
+def main():
+    args = sys.argv[1:]
+    rollup = load_rollup(verbose=True)
+    if rollup.last < rollup.first:
+        print("No transactions found.")
+        return
+
+    if not args:
+        # Every FY the ledger touches, quarter by quarter
+        first_fy = fy_of(date.fromordinal(rollup.first))
+        last_fy = fy_of(date.fromordinal(rollup.last))
+        args = [f"FY{fy}" for fy in range(first_fy, last_fy + 1)]
+
+    specs = []
+    for arg in args:
+        if re.fullmatch(r'FY\d{4}', arg.strip().upper()):
+            specs.extend(f"{arg.upper()}-Q{q}" for q in range(1, 5))
+        specs.append(arg)
+    print_table(rollup, specs)
+    print("\n* period only partly covered by the bank exports")
+
+if __name__ == "__main__":
+    main()
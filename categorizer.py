@@ -0,0 +1,143 @@
+import os
+import re
+import sys
+import json
+import bisect
+
+RULES_FILE = "category_rules.json"
+OVERRIDES_FILE = "category_rules.local.json"
+
+# Keyword rule engine for the finance scripts.
+#
+#   from categorizer import load_categorizer
+#   bas = load_categorizer("bas")
+#   category, rule, keyword = bas.classify("DBRE PTY LTD Y7432616407", -3865.68)
+#   results = bas.classify_all(descriptions, amounts)
+#
+# Rules live in category_rules.json, grouped into rulesets. Each rule has a
+# name, a category, case-insensitive substring keywords, a priority and an
+# optional direction ("debit" / "credit"). When several rules match, the
+# highest priority wins and ties go to the rule listed first. A ruleset's
+# "default" gives the category for rows no rule matched.
+#
+# category_rules.local.json (optional) is layered on top: a rule with the same
+# name replaces the packaged one, {"name": ..., "disabled": true} removes it,
+# and new names are added - so one-off corrections never touch the shared file.
+
+
+def merge_rules(base, overrides):
+    rules = {r["name"]: r for r in base}
+    order = [r["name"] for r in base]
+    for rule in overrides:
+        if rule["name"] not in rules:
+            order.append(rule["name"])
+        rules[rule["name"]] = rule
+    return [rules[name] for name in order if not rules[name].get("disabled")]
+
+def load_rules(ruleset, path=RULES_FILE, overrides_path=OVERRIDES_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    if ruleset not in config:
+        raise KeyError(f"Unknown ruleset '{ruleset}' in {path} (have: {', '.join(config)})")
+    spec = dict(config[ruleset])
+    if overrides_path and os.path.exists(overrides_path):
+        with open(overrides_path, 'r', encoding='utf-8') as f:
+            local = json.load(f).get(ruleset, {})
+        spec["rules"] = merge_rules(spec["rules"], local.get("rules", []))
+        spec["default"] = {**spec.get("default", {}), **local.get("default", {})}
+    return spec
+
+def direction_of(amount):
+    if amount is None:
+        return None
+    return "credit" if amount > 0 else "debit"
+
+
+class Categorizer:
+    def __init__(self, rules, default=None):
+        self.rules = rules
+        self.default = default or {}
+        # keyword -> [(priority, -position, rule index)]. Every keyword of every
+        # rule goes into one alternation, longest first, behind a zero-width
+        # lookahead so overlapping hits are all reported in a single scan.
+        # Keywords that are a prefix of the one that matched at a position also
+        # match there; those come from a precomputed table.
+        self.keyword_rules = {}
+        for i, rule in enumerate(rules):
+            for keyword in rule["keywords"]:
+                self.keyword_rules.setdefault(keyword.upper(), []).append((rule.get("priority", 0), -i, i))
+        keywords = sorted(self.keyword_rules, key=len, reverse=True)
+        self.prefixes = {k: [s for s in keywords if s != k and k.startswith(s)] for k in keywords}
+        self.scanner = re.compile("(?=(" + "|".join(re.escape(k) for k in keywords) + "))") if keywords else None
+
+    def classify_all(self, descriptions, amounts=None):
+        # One scan over the whole ledger. Returns [(category, rule name, keyword)];
+        # rule name and keyword are None when the default applied.
+        if amounts is None:
+            amounts = [None] * len(descriptions)
+        best = [None] * len(descriptions)    # (priority, -position, rule index, keyword)
+        if self.scanner and descriptions:
+            starts, pos = [], 0
+            for desc in descriptions:
+                starts.append(pos)
+                pos += len(desc) + 1
+            text = "\n".join(d.replace("\n", " ") for d in descriptions).upper()
+            for m in self.scanner.finditer(text):
+                row = bisect.bisect_right(starts, m.start()) - 1
+                direction = direction_of(amounts[row])
+                for keyword in [m.group(1)] + self.prefixes[m.group(1)]:
+                    for priority, order, i in self.keyword_rules[keyword]:
+                        wanted = self.rules[i].get("direction")
+                        if wanted and direction and wanted != direction:
+                            continue
+                        if best[row] is None or (priority, order) > best[row][:2]:
+                            best[row] = (priority, order, i, keyword)
+
+        results = []
+        for hit, amount in zip(best, amounts):
+            if hit is None:
+                results.append((self.default.get(direction_of(amount) or "debit"), None, None))
+            else:
+                rule = self.rules[hit[2]]
+                results.append((rule["category"], rule["name"], hit[3]))
+        return results
+
+    def classify(self, description, amount=None):
+        return self.classify_all([description], [amount])[0]
+
+def load_categorizer(ruleset, path=RULES_FILE, overrides_path=OVERRIDES_FILE):
+    spec = load_rules(ruleset, path, overrides_path)
+    return Categorizer(spec["rules"], spec.get("default"))
+
+
+def main():
+    # python categorizer.py [ruleset] [--audit]
+    # Classifies the bank ledger from transaction_store and reports totals per
+    # category and hits per rule; --audit lists every row with the rule and
+    # keyword that decided it.
+    import transaction_store
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    ruleset = args[0] if args else "bas"
+    categorizer = load_categorizer(ruleset)
+    rows = transaction_store.load_transactions()
+    descriptions = [f"{t['details']} {t['merchant']}" for t in rows]
+    results = categorizer.classify_all(descriptions, [t['amount'] for t in rows])
+
+    totals, hits = {}, {}
+    for t, (category, rule, keyword) in zip(rows, results):
+        totals[str(category)] = totals.get(str(category), 0) + t['amount']
+        hits[rule or "(default)"] = hits.get(rule or "(default)", 0) + 1
+        if "--audit" in sys.argv:
+            print(f"{t['original_date']:>10} {t['amount']:>10.2f}  {str(category):<28} "
+                  f"{rule or '-':<18} {keyword or '-':<14} {t['details']}")
+
+    print(f"\n--- {ruleset}: {len(rows)} transactions ---")
+    for category, total in sorted(totals.items(), key=lambda x: x[1]):
+        print(f"{category:<35} : ${total:,.2f}")
+    print("\n--- Rule hits ---")
+    for rule, count in sorted(hits.items(), key=lambda x: -x[1]):
+        print(f"{rule:<35} : {count}")
+
+if __name__ == "__main__":
+    main()
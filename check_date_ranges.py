@@ -1,43 +1,16 @@
-import csv
-import glob
-from datetime import datetime
+import transaction_store
 
 def check_dates():
-    files = glob.glob('Transactions*.csv')
-    min_date = datetime.max
-    max_date = datetime.min
-    
-    # Date formats to try
-    formats = ["%d/%m/%Y", "%Y-%m-%d", "%d-%b-%y", "%d/%m/%y"]
+    store = transaction_store.TransactionStore()
+    store.refresh()
+    for row in store.conn.execute("SELECT file, MIN(date), MAX(date), COUNT(*) FROM transactions "
+                                  "WHERE source = 'bank' GROUP BY file ORDER BY file"):
+        print(f"Checking {row[0]}... {row[3]} unique rows, {row[1]} to {row[2]}")
 
-    for filename in files:
-        print(f"Checking {filename}...")
-        with open(filename, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            if not reader.fieldnames: continue
-            
-            # Find date column
-            date_col = next((k for k in reader.fieldnames if 'Date' in k), None)
-            if not date_col: continue
-
-            for row in reader:
-                d_str = row[date_col].strip()
-                if not d_str: continue
-                
-                dt = None
-                for fmt in formats:
-                    try:
-                        dt = datetime.strptime(d_str, fmt)
-                        break
-                    except ValueError:
-                        continue
-                
-                if dt:
-                    if dt < min_date: min_date = dt
-                    if dt > max_date: max_date = dt
-    
-    if min_date != datetime.max:
-        print(f"Range found: {min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}")
+    min_date, max_date, count = store.date_range()
+    store.close()
+    if count:
+        print(f"Range found: {min_date} to {max_date}")
     else:
         print("No valid dates found.")
 
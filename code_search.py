@@ -0,0 +1,242 @@
+import os
+import re
+import sys
+import time
+import pickle
+
+ROOT = "."
+INDEX_FILE = ".code_search_index.pickle"
+INDEX_VERSION = 1
+SOURCE_EXTENSIONS = ('.js', '.html', '.sql')
+SKIP_DIRS = {'.git', 'node_modules', 'assets', 'android', 'ios', '__pycache__'}
+
+# Trigram index over the web sources. Every file maps to the set of lower-cased
+# 3-character substrings it contains, and each trigram maps to the file ids that
+# contain it. A query only opens the files holding every trigram of its required
+# literals, instead of walking the tree and reading everything.
+#
+#   python code_search.py handleLogout
+#   python code_search.py game_matches "Failed to send challenge"
+#   python code_search.py -e "function\s+checkAndShow\w+" -i mealtip
+
+ESCAPE_RE = re.compile(r'\\(?:x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|N\{[^}]*\}'
+                       r'|[0-7]{3}|0[0-7]{0,2}|[1-9][0-9]?|.)', re.DOTALL)
+
+
+def trigrams(text):
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def required_literals(pattern):
+    # Literal runs every match of the regex must contain. Conservative: any
+    # alternation means nothing is required and all files are scanned.
+    if '|' in pattern:
+        return []
+    runs, current = [], ""
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\' and i + 1 < len(pattern):
+            escape = ESCAPE_RE.match(pattern, i).group()
+            if escape[1].isalnum():
+                # \w, \d, \b, \x41, \u00e9, \1 ... are classes, anchors, coded
+                # characters or backreferences - the whole escape ends the run
+                runs.append(current)
+                current = ""
+            else:
+                current += escape[1]
+            i += len(escape)
+            continue
+        if ch in '?*{':
+            # The previous character is optional
+            runs.append(current[:-1])
+            current = ""
+            if ch == '{':
+                i = pattern.find('}', i) + 1 or len(pattern)
+                continue
+        elif ch in '+':
+            runs.append(current)
+            current = ""
+        elif ch == '[':
+            runs.append(current)
+            current = ""
+            i = pattern.find(']', i + 2) + 1 or len(pattern)
+            continue
+        elif ch == '(':
+            # Groups may be optional or repeated zero times - skip their contents
+            runs.append(current)
+            current = ""
+            depth = 0
+            while i < len(pattern):
+                if pattern[i] == '\\':
+                    i += 1
+                elif pattern[i] == '(':
+                    depth += 1
+                elif pattern[i] == ')':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                i += 1
+            if i + 1 < len(pattern) and pattern[i + 1] in '?*{':
+                i += 1
+                if pattern[i] == '{':
+                    i = pattern.find('}', i) + 1 or len(pattern)
+                    continue
+        elif ch in ').^$':
+            runs.append(current)
+            current = ""
+        else:
+            current += ch
+        i += 1
+    runs.append(current)
+    return [r for r in runs if len(r) >= 3]
+
+
+class CodeIndex:
+    def __init__(self, root=ROOT, index_path=INDEX_FILE):
+        self.root = root
+        self.index_path = index_path
+        self.files = {}       # path -> (mtime_ns, size)
+        self.ids = {}         # path -> int
+        self.paths = []       # int -> path (None once removed)
+        self.postings = {}    # trigram -> int bitmask of file ids
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception:
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        self.files, self.paths, self.postings = data["files"], data["paths"], data["postings"]
+        self.ids = {p: i for i, p in enumerate(self.paths) if p is not None}
+
+    def save(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({"version": INDEX_VERSION, "files": self.files, "paths": self.paths,
+                         "postings": self.postings}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.index_path)
+
+    def scan(self):
+        found = {}
+        for dirpath, dirs, filenames in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for filename in filenames:
+                if filename.endswith(SOURCE_EXTENSIONS):
+                    path = os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, "/")
+                    st = os.stat(os.path.join(dirpath, filename))
+                    found[path] = (st.st_mtime_ns, st.st_size)
+        return found
+
+    def add(self, path, stamp):
+        with open(os.path.join(self.root, path), 'r', encoding='utf-8', errors='replace') as f:
+            tris = trigrams(f.read())
+        file_id = len(self.paths)
+        self.paths.append(path)
+        self.ids[path] = file_id
+        self.files[path] = stamp
+        bit = 1 << file_id
+        postings = self.postings
+        for tri in tris:
+            postings[tri] = postings.get(tri, 0) | bit
+
+    def update(self):
+        # Re-index only files whose mtime/size moved; returns number changed
+        found = self.scan()
+        stale = [p for p in self.files if found.get(p) != self.files[p]]
+        if stale:
+            # Clear the old bits in one sweep over the postings
+            mask = 0
+            for path in stale:
+                mask |= 1 << self.ids.pop(path)
+                del self.files[path]
+            self.paths = [p if not (mask >> i) & 1 else None for i, p in enumerate(self.paths)]
+            keep = ~mask
+            self.postings = {tri: ids & keep for tri, ids in self.postings.items() if ids & keep}
+
+        added = [p for p in found if p not in self.files]
+        if self.paths.count(None) > len(self.paths) // 2:
+            # Too many holes - renumber from scratch
+            self.files, self.ids, self.paths, self.postings = {}, {}, [], {}
+            added = list(found)
+        for path in added:
+            self.add(path, found[path])
+
+        changed = len(set(stale) | set(added))
+        if changed:
+            self.save()
+        return changed
+
+    def candidates(self, literals):
+        # Files containing every trigram of every required literal
+        result = -1
+        for literal in literals:
+            for tri in trigrams(literal):
+                result &= self.postings.get(tri, 0)
+                if not result:
+                    return []
+        return [i for i, p in enumerate(self.paths) if p is not None and (result >> i) & 1]
+
+    def search(self, terms):
+        # terms: list of (label, compiled regex, required literals).
+        # Each candidate file is read once and checked for all terms that want it.
+        wanted = {}
+        for term in terms:
+            for file_id in self.candidates(term[2]):
+                wanted.setdefault(file_id, []).append(term)
+
+        hits = []
+        for file_id in sorted(wanted, key=lambda i: self.paths[i]):
+            path = self.paths[file_id]
+            with open(os.path.join(self.root, path), 'r', encoding='utf-8', errors='replace') as f:
+                for line_no, line in enumerate(f, 1):
+                    for label, regex, _ in wanted[file_id]:
+                        if regex.search(line):
+                            hits.append((label, path, line_no, line.rstrip("\n")))
+        return hits
+
+def build_terms(args):
+    terms = []
+    ignore_case = "-i" in args
+    flags = re.IGNORECASE if ignore_case else 0
+    args = [a for a in args if a != "-i"]
+    i = 0
+    while i < len(args):
+        if args[i] == "-e" and i + 1 < len(args):
+            pattern = args[i + 1]
+            terms.append((pattern, re.compile(pattern, flags), required_literals(pattern)))
+            i += 2
+        else:
+            literal = args[i]
+            terms.append((literal, re.compile(re.escape(literal), flags), [literal]))
+            i += 1
+    return terms
+
+def main():
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: python code_search.py [-i] term [term ...] [-e regex ...]")
+        return
+
+    started = time.time()
+    index = CodeIndex()
+    changed = index.update()
+    indexed = time.time()
+
+    hits = index.search(build_terms(args))
+    for label, path, line_no, line in hits:
+        if len(line) > 200:
+            line = line[:200] + "..."
+        print(f"{path}:{line_no}: [{label}] {line.strip()}")
+
+    print(f"\n{len(hits)} hits in {len(index.files)} indexed files "
+          f"({changed} re-indexed, update {1000 * (indexed - started):.0f} ms, "
+          f"search {1000 * (time.time() - indexed):.0f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,161 @@
-from PIL import Image
+from PIL import Image, features
 import os
+import sys
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-def compress_images(directory):
+SOURCE_DIR = "assets"
+OUTPUT_DIR = os.path.join("assets", "optimized")
+MANIFEST_FILE = "image_manifest.json"
+
+WIDTHS = (320, 640, 1000)
+SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+# format -> Pillow save options. AVIF only when this Pillow build has it.
+FORMATS = {
+    "webp": {"format": "WEBP", "quality": 75, "method": 6},
+    "jpg": {"format": "JPEG", "quality": 70, "optimize": True, "progressive": True},
+}
+if features.check("avif"):
+    FORMATS["avif"] = {"format": "AVIF", "quality": 55}
+
+
+def file_sha1(path):
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+def variant_widths(width):
+    # Never upscale; tiny images still get one variant at their own width
+    widths = [w for w in WIDTHS if w < width]
+    if not widths or width <= WIDTHS[-1]:
+        widths.append(min(width, WIDTHS[-1]))
+    return sorted(set(widths))
+
+def variant_name(rel_path, width, ext):
+    # The source extension stays in the name: foo.png and foo.jpg side by
+    # side must not write the same foo-640.webp
+    return f"{rel_path.replace(os.sep, '__')}-{width}.{ext}"
+
+def process_image(source_dir, output_dir, rel_path, sha1):
+    # Runs in a worker process: decode once, resize once per width, encode per format
+    src_path = os.path.join(source_dir, rel_path)
+    variants = []
+    with Image.open(src_path) as img:
+        img.load()
+        width, height = img.size
+        has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+        base = img.convert('RGBA' if has_alpha else 'RGB')
+
+    for target in variant_widths(width):
+        target_height = max(1, round(height * target / width))
+        resized = base if target == width else base.resize((target, target_height), Image.Resampling.LANCZOS)
+        flat = None
+        for ext, options in FORMATS.items():
+            out_img = resized
+            if options["format"] == "JPEG" and has_alpha:
+                # JPEG has no alpha channel - flatten onto white like the site background
+                if flat is None:
+                    flat = Image.new('RGB', resized.size, (255, 255, 255))
+                    flat.paste(resized, mask=resized.getchannel('A'))
+                out_img = flat
+            out_name = variant_name(rel_path, target, ext)
+            out_path = os.path.join(output_dir, out_name)
+            out_img.save(out_path, **options)
+            variants.append({
+                "path": os.path.join(output_dir, out_name).replace(os.sep, "/"),
+                "format": ext,
+                "width": target,
+                "height": target_height,
+                "bytes": os.path.getsize(out_path),
+            })
+
+    source_bytes = os.path.getsize(src_path)
+    largest_webp = max((v for v in variants if v["format"] == "webp"), key=lambda v: v["width"])
+    return rel_path, {
+        "sha1": sha1,
+        "width": width,
+        "height": height,
+        "bytes": source_bytes,
+        "variants": variants,
+        "bytes_saved": source_bytes - largest_webp["bytes"],
+    }
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    with open(MANIFEST_FILE, 'r') as f:
+        return json.load(f)
+
+def save_manifest(manifest):
+    tmp_path = MANIFEST_FILE + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+def find_sources(directory, output_dir):
+    output_dir = os.path.abspath(output_dir)
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != output_dir]
+        for filename in files:
+            if filename.lower().endswith(SOURCE_EXTENSIONS):
+                yield os.path.relpath(os.path.join(root, filename), directory)
+
+def variants_present(entry, rel_path, output_dir):
+    # Every variant exists under the name variant_name() gives it today
+    return all(v["path"] == os.path.join(output_dir, variant_name(rel_path, v["width"], v["format"])).replace(os.sep, "/")
+               and os.path.exists(v["path"]) for v in entry["variants"])
+
+def is_current(entry, sha1, rel_path, output_dir):
+    return entry is not None and entry["sha1"] == sha1 and variants_present(entry, rel_path, output_dir)
+
+def compress_images(directory, output_dir=OUTPUT_DIR, workers=None):
     print(f"Compressing images in {directory}...")
-    for filename in os.listdir(directory):
-        if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-            filepath = os.path.join(directory, filename)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest()
+
+    # Content hash decides what is stale; the stat check avoids hashing 300 MB every run
+    todo = []
+    sources = set()
+    for rel_path in find_sources(directory, output_dir):
+        sources.add(rel_path)
+        stat = os.stat(os.path.join(directory, rel_path))
+        entry = manifest.get(rel_path)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime") == int(stat.st_mtime) \
+                and variants_present(entry, rel_path, output_dir):
+            continue
+        sha1 = file_sha1(os.path.join(directory, rel_path))
+        if is_current(entry, sha1, rel_path, output_dir):
+            entry["size"], entry["mtime"] = stat.st_size, int(stat.st_mtime)
+            continue
+        todo.append((rel_path, sha1, stat))
+
+    for rel_path in list(manifest):
+        if rel_path not in sources:
+            del manifest[rel_path]
+
+    print(f"{len(sources)} images, {len(todo)} new or changed.")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_image, directory, output_dir, rel_path, sha1): (rel_path, stat)
+                   for rel_path, sha1, stat in todo}
+        for done, future in enumerate(as_completed(futures), 1):
+            rel_path, stat = futures[future]
             try:
-                with Image.open(filepath) as img:
-                    # Convert to RGB (in case of RGBA pngs) for saving as JPEG if we wanted, 
-                    # but let's keep format and just resize/optimize.
-                    # actually converting to JPEG is much better for photos.
-                    
-                    if img.mode in ('RGBA', 'P'):
-                        img = img.convert('RGB')
-                        
-                    # Calculate new size maintaining aspect ratio
-                    max_size = 1000
-                    ratio = min(max_size / float(img.size[0]), max_size / float(img.size[1]))
-                    
-                    if ratio < 1:
-                        new_size = (int(img.size[0] * ratio), int(img.size[1] * ratio))
-                        img = img.resize(new_size, Image.Resampling.LANCZOS)
-                        print(f"Resized {filename} to {new_size}")
-                    
-                    # Save as JPEG with optimization
-                    # We will replace the original PNGs with JPEGs in the code later, or 
-                    # actually, let's just overwrite the file as a compressed PNG or JPEG depending on original?
-                    # "Screenshot_..." are likely PNGs. PNGs can be large.
-                    # Best to save as optimized JPEG.
-                    
-                    new_filename = os.path.splitext(filename)[0] + ".jpg"
-                    new_filepath = os.path.join(directory, new_filename)
-                    
-                    img.save(new_filepath, 'JPEG', quality=60, optimize=True)
-                    print(f"Saved compressed {new_filename}")
-                    
+                _, entry = future.result()
             except Exception as e:
-                print(f"Error processing {filename}: {e}")
+                print(f"Error processing {rel_path}: {e}")
+                continue
+            entry["size"], entry["mtime"] = stat.st_size, int(stat.st_mtime)
+            manifest[rel_path] = entry
+            print(f"[{done}/{len(todo)}] {rel_path}: {len(entry['variants'])} variants, "
+                  f"saved {entry['bytes_saved'] / 1024:.0f} KB")
+
+    save_manifest(manifest)
+    total_saved = sum(entry["bytes_saved"] for entry in manifest.values())
+    print(f"Manifest written to {MANIFEST_FILE} ({total_saved / 1e6:.1f} MB saved at full width).")
 
 if __name__ == "__main__":
-    compress_images(r"C:\Users\shann\.gemini\antigravity\plant_based_balance\images")
+    compress_images(sys.argv[1] if len(sys.argv) > 1 else SOURCE_DIR)
@@ -1,6 +1,8 @@
 
 import json
 import os
+import sys
+from video_catalog import VideoCatalog
 
 INPUT_FILE = "scanned_drive_videos.json"
 OUTPUT_FILE = "exercise_videos.js"
@@ -16,12 +18,13 @@ def main():
     
     print(f"Found {len(videos)} videos.")
     
-    # Format as JS
-    js_content = "const EXERCISE_VIDEOS = " + json.dumps(videos, indent=2) + ";"
-    
+    # The scan owns the catalog's "drive" source only - B2 URLs stay, and the
+    # JS file picks per exercise by the catalog policy
+    catalog = VideoCatalog()
+    removed = catalog.replace_source("drive", videos)
     print(f"Writing to {OUTPUT_FILE}...")
-    with open(OUTPUT_FILE, 'w') as f:
-        f.write(js_content)
+    changed = catalog.write_js(OUTPUT_FILE, minified="--minified" in sys.argv, sharded="--sharded" in sys.argv)
+    print(f"{changed} entries changed ({removed} Drive entries gone from the scan).")
         
     print("Done!")
 
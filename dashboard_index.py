@@ -0,0 +1,189 @@
+import os
+import re
+import sys
+import json
+import bisect
+import hashlib
+
+HTML_FILE = "dashboard.html"
+CACHE_FILE = ".dashboard_index.json"
+CACHE_VERSION = 1
+
+SCRIPT_RE = re.compile(r'<script\b([^>]*)>(.*?)</script\s*>', re.DOTALL | re.IGNORECASE)
+SRC_RE = re.compile(r'''\bsrc\s*=\s*["']([^"']+)["']''', re.IGNORECASE)
+TYPE_RE = re.compile(r'''\btype\s*=\s*["']([^"']+)["']''', re.IGNORECASE)
+
+# Definitions the dashboard actually uses:
+#   function foo(   async function foo(   window.foo =   const foo = (...) =>
+#   const foo = function   const foo = async (   class Foo
+DEF_PATTERNS = [
+    ("function", re.compile(r'\b(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)\s*\(')),
+    ("window", re.compile(r'\bwindow\.([A-Za-z_$][\w$]*)\s*=(?!=)')),
+    ("variable", re.compile(r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s*)?(?:function\b|\([^()]*\)\s*=>|[A-Za-z_$][\w$]*\s*=>)')),
+    ("class", re.compile(r'\bclass\s+([A-Za-z_$][\w$]*)')),
+]
+CALL_RE = re.compile(r'(?<![\w$.])([A-Za-z_$][\w$]*)\s*\(|\bwindow\.([A-Za-z_$][\w$]*)\s*\(')
+JS_KEYWORDS = {'if', 'for', 'while', 'switch', 'catch', 'function', 'return', 'typeof', 'await', 'new', 'with'}
+
+
+def sha1_of(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def line_starts(text):
+    starts = [0]
+    pos = text.find("\n")
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = text.find("\n", pos + 1)
+    return starts
+
+def line_of(starts, offset):
+    return bisect.bisect_right(starts, offset)
+
+def resolve_src(src, base_dir):
+    if src.startswith(('http://', 'https://', '//')):
+        return None
+    path = os.path.normpath(os.path.join(base_dir, src.split('?')[0].split('#')[0]))
+    return path if os.path.exists(path) else None
+
+def scan_js(code, file, base_offset, starts, definitions, calls):
+    # Offsets are into `file`'s text; base_offset shifts an inline block to its
+    # position inside the HTML
+    def_spans = set()
+    for kind, pattern in DEF_PATTERNS:
+        for m in pattern.finditer(code):
+            def_spans.add(m.start(1))
+            definitions.setdefault(m.group(1), []).append(
+                {"file": file, "line": line_of(starts, base_offset + m.start(1)), "kind": kind})
+    for m in CALL_RE.finditer(code):
+        name, start = (m.group(1), m.start(1)) if m.group(1) else (m.group(2), m.start(2))
+        if name in JS_KEYWORDS or start in def_spans:
+            continue
+        calls.setdefault(name, []).append({"file": file, "line": line_of(starts, base_offset + start)})
+
+def scan_html_calls(markup, file, base_offset, starts, calls):
+    for m in re.finditer(r'''\bon\w+\s*=\s*(["'])(.*?)\1''', markup, re.DOTALL):
+        for c in CALL_RE.finditer(m.group(2)):
+            name = c.group(1) or c.group(2)
+            if name not in JS_KEYWORDS:
+                calls.setdefault(name, []).append(
+                    {"file": file, "line": line_of(starts, base_offset + m.start(2) + c.start())})
+
+
+def build_index(html_path=HTML_FILE):
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    base_dir = os.path.dirname(html_path) or "."
+    starts = line_starts(html)
+    definitions, calls = {}, {}
+    blocks = []
+    externals = {}
+
+    # Byte offsets are accumulated segment by segment instead of re-encoding
+    # the prefix for every block
+    byte_pos, char_pos = 0, 0
+    last_end = 0
+    for i, m in enumerate(SCRIPT_RE.finditer(html)):
+        attrs, body = m.group(1), m.group(2)
+        byte_pos += len(html[char_pos:m.start()].encode('utf-8'))
+        char_pos = m.start()
+        start_byte = byte_pos
+        byte_pos += len(html[m.start():m.end()].encode('utf-8'))
+        char_pos = m.end()
+
+        # Inline handlers (onclick="foo()") between script tags are call sites too
+        scan_html_calls(html[last_end:m.start()], html_path, last_end, starts, calls)
+        last_end = m.end()
+
+        src = SRC_RE.search(attrs)
+        type_match = TYPE_RE.search(attrs)
+        block = {
+            "index": i,
+            "start_line": line_of(starts, m.start()),
+            "end_line": line_of(starts, m.end()),
+            "start_byte": start_byte,
+            "end_byte": byte_pos,
+            "type": type_match.group(1) if type_match else None,
+        }
+        if src:
+            block["src"] = src.group(1)
+            block["path"] = resolve_src(src.group(1), base_dir)
+            if block["path"]:
+                externals[block["path"]] = None
+        else:
+            block["length"] = len(body)
+            if not block["type"] or 'javascript' in block["type"] or block["type"] == 'module':
+                scan_js(body, html_path, m.start(2), starts, definitions, calls)
+        blocks.append(block)
+    scan_html_calls(html[last_end:], html_path, last_end, starts, calls)
+
+    for path in externals:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            code = f.read()
+        externals[path] = sha1_of(path)
+        scan_js(code, path.replace(os.sep, "/"), 0, line_starts(code), definitions, calls)
+
+    # Only keep call sites of things defined somewhere in the dashboard
+    calls = {name: sites for name, sites in calls.items() if name in definitions}
+    return {
+        "version": CACHE_VERSION,
+        "html": html_path,
+        "hashes": {html_path: sha1_of(html_path), **externals},
+        "blocks": blocks,
+        "definitions": definitions,
+        "calls": calls,
+    }
+
+def is_valid(index):
+    if index.get("version") != CACHE_VERSION:
+        return False
+    for path, digest in index["hashes"].items():
+        if not os.path.exists(path) or sha1_of(path) != digest:
+            return False
+    return True
+
+def load_index(html_path=HTML_FILE, cache_path=CACHE_FILE):
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("html") == html_path and is_valid(index):
+            return index
+    index = build_index(html_path)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(tmp_path, cache_path)
+    return index
+
+def inline_block(index, block_no, html_path=HTML_FILE):
+    # Source of one inline <script> block, read straight from its byte range
+    block = index["blocks"][block_no]
+    with open(html_path, 'rb') as f:
+        f.seek(block["start_byte"])
+        return f.read(block["end_byte"] - block["start_byte"]).decode('utf-8')
+
+def main():
+    args = sys.argv[1:]
+    index = load_index()
+
+    if not args or args[0] == "--blocks":
+        for block in index["blocks"]:
+            where = block.get("path") or block.get("src") or f"inline, {block['length']} chars"
+            print(f"#{block['index']:3d}  lines {block['start_line']}-{block['end_line']}  {where}")
+        print(f"\n{len(index['blocks'])} script tags, {len(index['definitions'])} symbols defined.")
+        return
+
+    show_calls = "--calls" in args
+    for name in [a for a in args if not a.startswith("--")]:
+        defs = index["definitions"].get(name, [])
+        sites = index["calls"].get(name, [])
+        print(f"{name}: {len(defs)} definition(s), {len(sites)} call site(s)")
+        for d in defs:
+            print(f"  def   {d['file']}:{d['line']} ({d['kind']})")
+        if show_calls:
+            for c in sites:
+                print(f"  call  {c['file']}:{c['line']}")
+
+if __name__ == "__main__":
+    main()
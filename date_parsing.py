@@ -0,0 +1,133 @@
+import re
+import sys
+import calendar
+from datetime import date
+
+# Column-at-a-time date parsing for the exports.
+#
+#   dates, errors, fmt = parse_column(values)
+#
+# The format is inferred once from a sample of the column, every distinct
+# string is parsed once (exports repeat the same few hundred dates thousands
+# of times), and parsing is a compiled regex plus integer conversion - no
+# strptime and no exception per value. Values the inferred format does not
+# fit are retried against the other known formats; anything still unparsed is
+# returned in `errors` as (index, value) so callers can report it.
+
+# Tried in this order when the sample is ambiguous. Day-first: these are
+# Australian exports.
+FORMATS = ['%d %b %y', '%d %b %Y', '%d/%m/%Y', '%d/%m/%y', '%Y-%m-%d', '%d-%b-%y', '%d-%b-%Y']
+SAMPLE_SIZE = 50
+
+TOKENS = {
+    '%d': r'(?P<d>\d{1,2})',
+    '%m': r'(?P<m>\d{1,2})',
+    '%y': r'(?P<y>\d{2})',
+    '%Y': r'(?P<Y>\d{4})',
+    '%b': r'(?P<b>[A-Za-z]{3})',
+    '%B': r'(?P<B>[A-Za-z]{3,9})',
+}
+MONTHS = {m.lower(): i for i, m in enumerate(calendar.month_abbr) if m}
+MONTHS.update({m.lower(): i for i, m in enumerate(calendar.month_name) if m})
+_compiled = {}
+
+
+def compile_format(fmt):
+    if fmt not in _compiled:
+        pattern = re.sub(r'%[dmyYbB]|[^%]+', lambda m: TOKENS.get(m.group(), re.escape(m.group())), fmt)
+        _compiled[fmt] = re.compile(pattern)
+    return _compiled[fmt]
+
+def match_format(value, fmt):
+    m = compile_format(fmt).fullmatch(value)
+    if not m:
+        return None
+    parts = m.groupdict()
+    name = parts.get('b') or parts.get('B')
+    month = int(parts['m']) if parts.get('m') else MONTHS.get(name.lower()) if name else None
+    year = int(parts['Y']) if parts.get('Y') else 2000 + int(parts['y'])
+    day = int(parts['d'])
+    if not month or not 1 <= month <= 12 or not 1 <= day <= calendar.monthrange(year, month)[1]:
+        return None
+    return date(year, month, day)
+
+def infer_format(values, formats=FORMATS, sample_size=SAMPLE_SIZE):
+    # Format that parses the most of the first non-empty values; None if none fit
+    sample = []
+    for value in values:
+        value = value.strip()
+        if value:
+            sample.append(value)
+            if len(sample) >= sample_size:
+                break
+    best, best_hits = None, 0
+    for fmt in formats:
+        hits = sum(1 for v in sample if match_format(v, fmt))
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+    return best
+
+def parse_column(values, fmt=None, formats=FORMATS):
+    # -> (list of date or None, [(index, value)] unparseable, format used)
+    values = list(values)
+    fmt = fmt or infer_format(values, formats)
+    fallbacks = [f for f in formats if f != fmt]
+    cache = {}
+    dates, errors = [], []
+    for i, raw in enumerate(values):
+        value = raw.strip()
+        if value in cache:
+            parsed = cache[value]
+        else:
+            parsed = match_format(value, fmt) if fmt else None
+            if parsed is None:
+                for other in fallbacks:
+                    parsed = match_format(value, other)
+                    if parsed:
+                        break
+            cache[value] = parsed
+        dates.append(parsed)
+        if parsed is None and value:
+            errors.append((i, raw))
+    return dates, errors, fmt
+
+_value_cache = {}
+
+def parse_date(value, formats=FORMATS):
+    # Single value, memoised across calls; None when nothing fits
+    key = (value.strip(), tuple(formats))
+    if key not in _value_cache:
+        parsed = None
+        for fmt in formats:
+            parsed = match_format(key[0], fmt)
+            if parsed:
+                break
+        _value_cache[key] = parsed
+    return _value_cache[key]
+
+def main():
+    # python date_parsing.py file.csv [column]  -> inferred format, range and bad rows
+    import csv
+
+    if len(sys.argv) < 2:
+        print("Usage: python date_parsing.py file.csv [column]")
+        return
+    with open(sys.argv[1], 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        column = sys.argv[2] if len(sys.argv) > 2 else next((k for k in reader.fieldnames if 'Date' in k), None)
+        if column is None:
+            print(f"No date column in {reader.fieldnames}")
+            return
+        values = [row[column] or "" for row in reader]
+
+    dates, errors, fmt = parse_column(values)
+    parsed = [d for d in dates if d]
+    print(f"{sys.argv[1]} [{column}]: format {fmt}, {len(parsed)}/{len(values)} parsed, {len(set(values))} distinct")
+    if parsed:
+        print(f"Range: {min(parsed)} to {max(parsed)}")
+    for i, value in errors:
+        # +2: header line and 1-based numbering
+        print(f"  line {i + 2}: unparseable date {value!r}")
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,15 @@
-import csv
-import glob
+import transaction_store
 
 def debug_dates():
-    csv_files = glob.glob('Transactions*.csv')
-    for filename in csv_files:
+    store = transaction_store.TransactionStore()
+    store.refresh()
+    for (filename,) in store.conn.execute("SELECT DISTINCT file FROM transactions ORDER BY file"):
         print(f"Checking {filename}...")
-        with open(filename, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            date_col = next((k for k in reader.fieldnames if 'Date' in k), None)
-            if not date_col: continue
-            
-            # Print first 5 dates
-            count = 0
-            for row in reader:
-                print(f"  Raw Date: '{row[date_col]}'")
-                count += 1
-                if count > 5: break
+        # First 6 rows of each export as they were written, next to the parsed value
+        for row in store.conn.execute("SELECT raw_date, date FROM transactions WHERE file = ? "
+                                      "ORDER BY id LIMIT 6", (filename,)):
+            print(f"  Raw Date: '{row[0]}' -> {row[1]}")
+    store.close()
 
 if __name__ == "__main__":
     debug_dates()
@@ -0,0 +1,221 @@
+import re
+import sys
+import json
+from code_search import trigrams
+from video_map_store import JS_FILE, parse_js, atomic_write_lines
+
+OUTPUT_FILE = "exercise_video_matches.js"
+JS_PREFIX = "const EXERCISE_VIDEO_MATCHES = "
+NAME_SOURCES = [
+    "workout_library.js",
+    "workout_library_extended.js",
+    "js/dashboard/dashboard-script-5-initialize_stripe_for_inapp_pu.js",
+]
+MIN_SIMILARITY = 0.7     # trigram Dice coefficient for a fuzzy match
+
+# Offline matcher from the exercise names the workouts use to the keys of
+# EXERCISE_VIDEOS (raw video filenames). Names are normalised - case,
+# punctuation, plurals, equipment synonyms ("DB", "Banded", "Body Weight") -
+# and looked up in this order:
+#
+#   exact       - the name is a video key
+#   normalised  - same normalised words, or the same words in another order
+#   fuzzy       - best trigram similarity over the normalised keys; the
+#                 equipment words must agree and the other words must be the
+#                 same ("Push Up" ~ "Push Ups", never "Cable Crunch" ~ "Cable
+#                 Reverse Crunch" or "... Lateral Pulldown" ~ "... Lateral Raise")
+#   stripped    - the name without its equipment words is a key that names no
+#                 equipment ("Bodyweight Plank" -> "Plank", never
+#                 "Banded Hammer Curl" -> "Dumbbell Hammer Curl")
+#
+# Everything that is not an exact key goes into exercise_video_matches.js as
+# name -> URL, and names with no acceptable video as name -> "", so
+# findVideoMatch() answers every workout exercise with a dict lookup and its
+# scan of every key only runs for names the table has never seen.
+#
+#   python exercise_matcher.py                  -> rebuild the table
+#   python exercise_matcher.py --report         -> show every non-exact match and miss
+#   python exercise_matcher.py "db rdl" ...     -> look names up
+
+EXERCISE_NAME_RE = re.compile(r'''\{\s*name:\s*(["'])((?:(?!\1)[^\\]|\\.)*)\1\s*,\s*sets:''')
+
+PHRASES = [
+    (r'\b(resistance|mini|super) ?bands?\b', 'band'),
+    (r'\bbody ?weight\b', 'bodyweight'),
+    (r'\bkettle ?bells?\b', 'kettlebell'),
+    (r'\b(pull|push|chin|sit) ?ups?\b', r'\1up'),
+    (r'\bez ?bar\b', 'ezbar'),
+    (r'\bt ?bar\b', 'tbar'),
+    (r'\bworld s\b', 'world'),
+]
+SYNONYMS = {
+    'db': 'dumbbell', 'dumbell': 'dumbbell', 'dumbbells': 'dumbbell',
+    'bb': 'barbell', 'barbells': 'barbell',
+    'kb': 'kettlebell',
+    'bw': 'bodyweight',
+    'banded': 'band', 'bands': 'band',
+    'worlds': 'world',
+    'rdl': 'romanian deadlift',
+}
+EQUIPMENT = {'dumbbell', 'barbell', 'kettlebell', 'band', 'cable', 'machine', 'bodyweight', 'smith', 'ezbar',
+             'landmine', 'bosu', 'trx', 'sandbag'}
+STOP_WORDS = {'a', 'an', 'the', 'with', 'of'}
+KEEP_S = ('ss', 'us', 'is')
+
+
+def singular(word):
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 4 and word.endswith(('ches', 'shes', 'xes', 'sses')):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith(KEEP_S):
+        return word[:-1]
+    return word
+
+def normalise(name):
+    # -> tuple of words
+    text = name.lower().replace('&', ' and ').replace("'", '')
+    text = re.sub(r'[^a-z0-9]+', ' ', text)
+    for pattern, replacement in PHRASES:
+        text = re.sub(pattern, replacement, text)
+    words = []
+    for word in text.split():
+        word = SYNONYMS.get(word, word)
+        for part in word.split():
+            part = singular(part)
+            if part not in STOP_WORDS:
+                words.append(part)
+    return tuple(words)
+
+def without_equipment(words):
+    return tuple(w for w in words if w not in EQUIPMENT)
+
+
+class VideoKeyIndex:
+    def __init__(self, videos):
+        self.videos = videos
+        self.keys = list(videos)
+        self.words = [normalise(k) for k in self.keys]
+        self.grams = []
+        self.by_norm, self.by_bag, self.by_stripped = {}, {}, {}
+        self.postings = {}
+        for i, words in enumerate(self.words):
+            # First key wins on ties - the JS file lists the canonical names first
+            self.by_norm.setdefault(words, i)
+            self.by_bag.setdefault(tuple(sorted(words)), i)
+            # Only keys with no equipment: dropping the query's equipment must
+            # not land on a video for different equipment
+            if not EQUIPMENT.intersection(words):
+                self.by_stripped.setdefault(tuple(sorted(words)), i)
+            grams = trigrams(f" {' '.join(words)} ")
+            self.grams.append(grams)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+
+    def fuzzy(self, words):
+        # Best key sharing enough trigrams; only keys in the posting lists of
+        # the query's trigrams are scored
+        grams = trigrams(f" {' '.join(words)} ")
+        shared = {}
+        for gram in grams:
+            for i in self.postings.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+        equipment = EQUIPMENT.intersection(words)
+        movement = set(without_equipment(words))
+        best, best_score = None, MIN_SIMILARITY
+        for i, count in shared.items():
+            score = 2 * count / (len(grams) + len(self.grams[i]))
+            if score < best_score or (score == best_score and best is not None):
+                continue
+            other = EQUIPMENT.intersection(self.words[i])
+            if equipment and other and equipment != other:
+                continue
+            if set(without_equipment(self.words[i])) != movement:
+                continue
+            best, best_score = i, score
+        return best, best_score
+
+    def match(self, name):
+        # -> (video key or None, how, score)
+        if name in self.videos:
+            return name, "exact", 1.0
+        words = normalise(name)
+        if words in self.by_norm:
+            return self.keys[self.by_norm[words]], "normalised", 1.0
+        bag = tuple(sorted(words))
+        if bag in self.by_bag:
+            return self.keys[self.by_bag[bag]], "normalised", 1.0
+        i, score = self.fuzzy(words)
+        if i is not None:
+            return self.keys[i], "fuzzy", round(score, 3)
+        stripped = tuple(sorted(without_equipment(words)))
+        if stripped in self.by_stripped:
+            return self.keys[self.by_stripped[stripped]], "stripped", 0.0
+        return None, "none", 0.0
+
+
+def exercise_names(paths=NAME_SOURCES):
+    names = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for m in EXERCISE_NAME_RE.finditer(f.read()):
+                names.setdefault(json.loads(f'"{m.group(2)}"'), path)
+    return names
+
+def load_videos(js_path=JS_FILE):
+    with open(js_path, 'r', encoding='utf-8') as f:
+        return parse_js(f.read())
+
+def build_table(index, names):
+    # -> ({name: url, or "" for a known miss} for non-exact names,
+    #     {name: (key, how, score)})
+    table, results = {}, {}
+    for name in sorted(names):
+        key, how, score = index.match(name)
+        results[name] = (key, how, score)
+        if how != "exact":
+            table[name] = index.videos[key] if key is not None else ""
+    return table, results
+
+def write_table(table, path=OUTPUT_FILE):
+    lines = ["// Generated by exercise_matcher.py - exercise name -> video URL for names\n",
+             "// that are not an exact EXERCISE_VIDEOS key (\"\" = no video). Do not edit by hand.\n",
+             JS_PREFIX + "{\n"]
+    items = list(table.items())
+    for i, (name, url) in enumerate(items):
+        lines.append(f"  {json.dumps(name)}: {json.dumps(url)}{',' if i < len(items) - 1 else ''}\n")
+    lines.append("};\n")
+    atomic_write_lines(path, lines)
+
+def main():
+    args = sys.argv[1:]
+    index = VideoKeyIndex(load_videos())
+    queries = [a for a in args if not a.startswith("--")]
+    if queries:
+        for name in queries:
+            key, how, score = index.match(name)
+            print(f"{name!r} -> {key!r} [{how} {score}]")
+        return
+
+    names = exercise_names()
+    table, results = build_table(index, names)
+    counts = {}
+    for key, how, score in results.values():
+        counts[how] = counts.get(how, 0) + 1
+    print(f"  -> {len(names)} exercise names, {len(index.keys)} video keys")
+    for how in ("exact", "normalised", "fuzzy", "stripped", "none"):
+        print(f"  {how:<11}: {counts.get(how, 0)}")
+    if "--report" in args:
+        for name, (key, how, score) in results.items():
+            if how not in ("exact", "none"):
+                print(f"  [{how:<10} {score:.2f}] {name}  ->  {key}  ({names[name]})")
+        misses = [name for name, (key, how, score) in results.items() if how == "none"]
+        print(f"\nNo video ({len(misses)}):")
+        for name in misses:
+            print(f"  - {name}  ({names[name]})")
+    write_table(table)
+    misses = sum(1 for url in table.values() if not url)
+    print(f"Saved {len(table) - misses} matches and {misses} known misses to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+// Generated by exercise_matcher.py - exercise name -> video URL for names
+// that are not an exact EXERCISE_VIDEOS key ("" = no video). Do not edit by hand.
+const EXERCISE_VIDEO_MATCHES = {
+  "Banded Bent Over Row": "https://f005.backblazeb2.com/file/shannonsvideos/Band%20Bent%20Over%20Row.mp4",
+  "Banded Bicep Curl": "https://f005.backblazeb2.com/file/shannonsvideos/Band%20Bicep%20Curl.mp4",
+  "Banded Bicycle Crunch": "https://f005.backblazeb2.com/file/shannonsvideos/Mini%20Band%20Bicycle%20Crunch.mp4",
+  "Banded Chest Press": "https://f005.backblazeb2.com/file/shannonsvideos/Resistance%20Band%20Chest%20Press.mp4",
+  "Banded Clamshell": "https://f005.backblazeb2.com/file/shannonsvideos/Mini%20Band%20Clamshell.mp4",
+  "Banded Dead Bug": "https://f005.backblazeb2.com/file/shannonsvideos/Dead%20Bug%20%28Iso%20Hold%29.mp4",
+  "Banded Donkey Kick": "https://f005.backblazeb2.com/file/shannonsvideos/Mini%20Band%20Donkey%20Kicks.mp4",
+  "Banded Face Pull": "https://f005.backblazeb2.com/file/shannonsvideos/SuperBand%20Face%20Pulls.mp4",
+  "Banded Fire Hydrant": "https://f005.backblazeb2.com/file/shannonsvideos/Mini%20Band%20Fire%20Hydrants.mp4",
+  "Banded Frog Pump": "https://f005.backblazeb2.com/file/shannonsvideos/Mini%20Band%20Frog%20Pumps.mp4",
+  "Banded Front Raise": "",
+  "Banded Glute Bridge": "https://f005.backblazeb2.com/file/shannonsvideos/Mini%20Band%20Glute%20Bridge.mp4",
+  "Banded Glute Bridge March": "",
+  "Banded Good Morning": "https://f005.backblazeb2.com/file/shannonsvideos/Superband%20Good%20Morning.mp4",
+  "Banded Hammer Curl": "",
+  "Banded Hip Thrust": "",
+  "Banded Lateral Raise": "https://f005.backblazeb2.com/file/shannonsvideos/Band%20Lateral%20Raise.mp4",
+  "Banded Lateral Walk": "",
+  "Banded Mountain Climber": "https://f005.backblazeb2.com/file/shannonsvideos/Mini%20Band%20Mountain%20Climbers.mp4",
+  "Banded Overhead Press": "",
+  "Banded Pallof Press": "https://f005.backblazeb2.com/file/shannonsvideos/SuperBand%20Pallof%20Press.mp4",
+  "Banded Pull Apart": "https://f005.backblazeb2.com/file/shannonsvideos/Mini%20Band%20Pull%20Aparts.mp4",
+  "Banded Push Up": "https://f005.backblazeb2.com/file/shannonsvideos/SuperBand%20Push%20Up.mp4",
+  "Banded Reverse Fly": "",
+  "Banded Reverse Lunge": "https://f005.backblazeb2.com/file/shannonsvideos/Band%20Reverse%20Lunge.mp4",
+  "Banded Romanian Deadlift": "",
+  "Banded Row": "",
+  "Banded Shoulder Dislocate": "",
+  "Banded Single Arm Row": "https://f005.backblazeb2.com/file/shannonsvideos/SuperBand%20Single%20Arm%20Row.mp4",
+  "Banded Squat": "https://f005.backblazeb2.com/file/shannonsvideos/Resistance%20Band%20Squat.mp4",
+  "Banded Squat to Press": "",
+  "Banded Standing Abduction": "",
+  "Banded Standing Kickback": "",
+  "Banded Sumo Squat": "https://f005.backblazeb2.com/file/shannonsvideos/Pulse%20Sumo%20Squats.mp4",
+  "Banded Tricep Extension": "",
+  "Banded Woodchop": "",
+  "Barbell Overhead Shoulder Press": "",
+  "Body Weight Side Lunge": "",
+  "Cable Crunch": "https://f005.backblazeb2.com/file/shannonsvideos/Oblique%20Crunch.mp4",
+  "Cable Hammer Curl": "",
+  "Cable Pull-Through": "https://f005.backblazeb2.com/file/shannonsvideos/Cable%20Pull%20Through.mp4",
+  "Cable Single Arm Lateral Pulldown": "",
+  "Dumbbell Goblet Lateral Lunge": "",
+  "Dumbbell Goblet Sumo Squat": "",
+  "Dumbbell Incline Chest Press": "",
+  "Dumbbell Russian Twist": "https://f005.backblazeb2.com/file/shannonsvideos/Plate%20Russian%20Twist.mp4",
+  "Dumbbell Woodchop": "",
+  "Incline Dumbbell Bench Press": "https://f005.backblazeb2.com/file/shannonsvideos/Dumbbell%20Incline%20Bench%20Press.mp4",
+  "Light Walk or Bike": "",
+  "Machine Hack Squat": "https://f005.backblazeb2.com/file/shannonsvideos/Hack%20Squat.mp4",
+  "Plank with Band Row": "https://f005.backblazeb2.com/file/shannonsvideos/Band%20Plank%20Row.mp4",
+  "Seated Calf Raise Machine": "https://f005.backblazeb2.com/file/shannonsvideos/Machine%20Seated%20Calf%20Raise.mp4",
+  "Standing Calf Raise Machine": "https://f005.backblazeb2.com/file/shannonsvideos/Machine%20Standing%20Calf%20Raise.mp4",
+  "Walking Barbell Lunge": "https://f005.backblazeb2.com/file/shannonsvideos/Reverse%20Lunge.mp4",
+  "World Greatest Stretch": "https://f005.backblazeb2.com/file/shannonsvideos/Yoga%20-%20Lizard%20Pose%20%28Utthan%20Pristhasana%29.mp4",
+  "Yoga - Child Pose with Side Stretch": "",
+  "Yoga - Seated Spinal Twist (Ardha Matsyendrasana)": ""
+};
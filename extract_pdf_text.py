@@ -1,40 +1,36 @@
-import sys
-import glob
 import os
+import sys
+import stripe_reports
 
-def try_extract(path):
-    print(f"--- Extracting: {path} ---")
-    try:
-        from pypdf import PdfReader
-        reader = PdfReader(path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        print(text)
-        return
-    except ImportError:
-        pass
-
-    try:
-        import PyPDF2
-        reader = PyPDF2.PdfReader(path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        print(text)
-        return
-    except ImportError:
-        pass
-    
-    print("Could not find pypdf or PyPDF2 libraries to extract text.")
+# Dumps the raw text of PDFs (default: the Stripe balance reports). Pages are
+# extracted in parallel by stripe_reports.extract_pages; for the parsed rows
+# use `python stripe_reports.py` instead.
+#
+#   python extract_pdf_text.py [file.pdf ...]
 
 files = [
     "Balance – PlantBased-Balance – Stripe.pdf",
     "Balance – PlantBased-Balance – Stripe - oct-dec.pdf"
 ]
 
-for f in files:
-    if os.path.exists(f):
-        try_extract(f)
-    else:
-        print(f"File not found: {f}")
+def main():
+    paths = sys.argv[1:] or files
+    found = []
+    for f in paths:
+        if os.path.exists(f):
+            found.append(f)
+        else:
+            print(f"File not found: {f}")
+    if not found:
+        return
+    try:
+        texts = stripe_reports.extract_pages(found)
+    except ImportError:
+        print("Could not find pypdf or PyPDF2 libraries to extract text.")
+        return
+    for path, pages in texts.items():
+        print(f"--- Extracting: {path} ---")
+        print("\n".join(pages))
+
+if __name__ == "__main__":
+    main()
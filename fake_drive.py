@@ -0,0 +1,182 @@
+import os
+import re
+import sys
+import tempfile
+
+# In-memory stand-in for the parts of the Drive v3 service that
+# scan_google_drive.py uses: files().list, changes().getStartPageToken and
+# changes().list, each returning an object with .execute(). Every change bumps
+# a counter and is logged, so change tokens behave like Drive's: a token
+# returns everything that happened after it was issued. `calls` counts API
+# requests.
+#
+#   python fake_drive.py        -> runs the full/incremental scan scenario
+
+FOLDER_MIME = 'application/vnd.google-apps.folder'
+
+
+class Request:
+    def __init__(self, service, result):
+        self.service = service
+        self.result = result
+
+    def execute(self):
+        self.service.calls += 1
+        return self.result()
+
+
+class FakeDriveService:
+    def __init__(self, page_size=1000):
+        self.files_by_id = {}
+        self.log = []           # file ids in change order; token n = log[n:]
+        self.calls = 0
+        self.page_size = page_size
+        self.next_id = 0
+
+    # --- Test helpers ---
+
+    def add(self, name, mime_type='video/mp4', parents=(), file_id=None):
+        self.next_id += 1
+        file_id = file_id or f"fake{self.next_id:05d}"
+        self.files_by_id[file_id] = {"id": file_id, "name": name, "mimeType": mime_type,
+                                     "parents": list(parents), "trashed": False}
+        self.log.append(file_id)
+        return file_id
+
+    def add_folder(self, name):
+        return self.add(name, FOLDER_MIME)
+
+    def update(self, file_id, **fields):
+        self.files_by_id[file_id].update(fields)
+        self.log.append(file_id)
+
+    def delete(self, file_id):
+        del self.files_by_id[file_id]
+        self.log.append(file_id)
+
+    # --- Drive API surface ---
+
+    def files(self):
+        return self
+
+    def changes(self):
+        return FakeChanges(self)
+
+    def list(self, q="", pageSize=100, fields=None, pageToken=None):
+        matches = [f for f in self.files_by_id.values() if self.matches(f, q)]
+        size = min(pageSize, self.page_size)
+        start = int(pageToken or 0)
+
+        def result():
+            page = matches[start:start + size]
+            out = {"files": [dict(f) for f in page]}
+            if start + size < len(matches):
+                out["nextPageToken"] = str(start + size)
+            return out
+        return Request(self, result)
+
+    def matches(self, item, q):
+        # Just the clauses scan_google_drive.py sends, joined by "and"
+        for clause in re.split(r'\s+and\s+', q.strip()) if q.strip() else []:
+            m = re.fullmatch(r"(\w+) (=|contains) '([^']*)'", clause)
+            if m:
+                field, op, value = m.groups()
+                actual = item.get(field, "")
+                if (op == '=' and actual != value) or (op == 'contains' and value not in actual):
+                    return False
+                continue
+            m = re.fullmatch(r"'([^']*)' in parents", clause)
+            if m:
+                if m.group(1) not in item["parents"]:
+                    return False
+                continue
+            m = re.fullmatch(r"trashed = (true|false)", clause)
+            if m:
+                if item["trashed"] != (m.group(1) == 'true'):
+                    return False
+                continue
+            raise ValueError(f"Unsupported query clause: {clause}")
+        return True
+
+
+class FakeChanges:
+    def __init__(self, service):
+        self.service = service
+
+    def getStartPageToken(self):
+        return Request(self.service, lambda: {"startPageToken": str(len(self.service.log))})
+
+    def list(self, pageToken, pageSize=100, fields=None, **options):
+        service = self.service
+        start = int(pageToken)
+        size = min(pageSize, service.page_size)
+
+        def result():
+            ids = service.log[start:start + size]
+            changes = []
+            for file_id in ids:
+                item = service.files_by_id.get(file_id)
+                change = {"fileId": file_id, "removed": item is None}
+                if item is not None:
+                    change["file"] = dict(item)
+                changes.append(change)
+            out = {"changes": changes}
+            if start + size < len(service.log):
+                out["nextPageToken"] = str(start + size)
+            else:
+                out["newStartPageToken"] = str(len(service.log))
+            return out
+        return Request(service, result)
+
+
+def main():
+    import scan_google_drive as scanner
+
+    service = FakeDriveService(page_size=50)
+    folder = service.add_folder(scanner.TARGET_FOLDER_NAME)
+    other = service.add_folder("Elsewhere")
+    ids = [service.add(f"Exercise {i}.mp4", parents=[folder]) for i in range(120)]
+    service.add("notes.txt", mime_type='text/plain', parents=[folder])
+    stray = service.add("Stray.mp4", parents=[other])
+
+    failures = []
+    def check(label, condition):
+        print(f"  {'ok  ' if condition else 'FAIL'} {label}")
+        if not condition:
+            failures.append(label)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "videos.json")
+        state = os.path.join(tmp, "state.json")
+
+        service.calls = 0
+        videos = scanner.scan(service, output, state)
+        check("full scan finds every video in the folder", len(videos) == 120 and "Stray" not in videos)
+        check("full scan pages through the folder", service.calls == 1 + 1 + 3)
+
+        service.calls = 0
+        scanner.scan(service, output, state)
+        check("no changes -> one API call", service.calls == 1)
+
+        service.update(ids[0], name="Exercise 0 Renamed.mov")
+        service.update(ids[1], trashed=True)
+        service.delete(ids[2])
+        service.update(stray, parents=[folder])
+        service.update(ids[3], parents=[other])
+        new = service.add("Brand New.mp4", parents=[folder])
+        service.calls = 0
+        videos = scanner.scan(service, output, state)
+        check("delta fetched in one call", service.calls == 1)
+        check("rename applied", "Exercise 0 Renamed" in videos and "Exercise 0" not in videos)
+        check("trashed, deleted and moved-out files dropped",
+              not {"Exercise 1", "Exercise 2", "Exercise 3"} & set(videos))
+        check("moved-in and new files added", "Stray" in videos and videos["Brand New"] == scanner.preview_url(new))
+
+        full = scanner.scan(service, os.path.join(tmp, "full.json"), os.path.join(tmp, "full_state.json"))
+        check("incremental result matches a fresh full scan", videos == full)
+
+    print(f"\n{'All checks passed' if not failures else f'{len(failures)} check(s) failed'}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for the B2 / Drive hosts that validate_videos.py HEADs. Each
+# FakeVideoHost is an HTTP/1.1 server on its own 127.0.0.1 port (so aiohttp
+# treats it as its own host) that answers HEAD /<path> from a table:
+#
+#   200 (with ETag, 304 on a matching If-None-Match), 404, "flaky" (503 on
+#   the first request, 200 after) or "moved" (302 to /<path>.moved)
+#
+# Every request holds its connection for DELAY seconds, and the most requests
+# seen in flight at once are recorded per host and across all hosts, so the
+# connection limits can be checked.
+#
+#   python fake_video_host.py       -> runs the validate_videos.py scenario
+
+DELAY = 0.05
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class FakeVideoHost:
+    lock = threading.Lock()
+    total_in_flight = 0
+    total_peak = 0              # across every host
+
+    def __init__(self, statuses):
+        self.statuses = dict(statuses)     # {path: 200 | 404 | "flaky" | "moved"}
+        self.requests = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.server = Server(("127.0.0.1", 0), self.handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_port}/{path}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def answer(self, path, etag):
+        status = self.statuses.get(path, 404)
+        if status == "flaky":
+            self.statuses[path] = 200
+            return 503, {}
+        if status == "moved":
+            return 302, {"Location": f"/{path}.moved"}
+        if path.endswith(".moved"):
+            return 200, {}
+        if status == 200:
+            tag = f'"{path}"'
+            return (304 if etag == tag else 200), {"ETag": tag}
+        return status, {}
+
+    def handler(self):
+        host = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_HEAD(self):
+                cls = FakeVideoHost
+                with cls.lock:
+                    host.requests += 1
+                    host.in_flight += 1
+                    host.peak = max(host.peak, host.in_flight)
+                    cls.total_in_flight += 1
+                    cls.total_peak = max(cls.total_peak, cls.total_in_flight)
+                time.sleep(DELAY)
+                with cls.lock:
+                    host.in_flight -= 1
+                    cls.total_in_flight -= 1
+                    status, headers = host.answer(self.path.lstrip("/"), self.headers.get("If-None-Match"))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    import validate_videos as validator
+
+    validator.BACKOFF_BASE = 0.01
+    failures = []
+    def check(label, condition):
+        print(f"  {'ok  ' if condition else 'FAIL'} {label}")
+        if not condition:
+            failures.append(label)
+
+    per_host = validator.PER_HOST_LIMIT * 2
+    hosts = [FakeVideoHost({f"v{i}.mp4": 200 for i in range(per_host)}) for _ in range(3)]
+    for host in hosts:
+        host.__enter__()
+    try:
+        videos = {f"Exercise {n}-{i}": host.url(f"v{i}.mp4")
+                  for n, host in enumerate(hosts) for i in range(per_host)}
+        cache = {}
+        valid, broken, unknown, rechecked = validator.validate(videos, cache)
+        check("every video on three hosts checked once", rechecked == len(videos) == len(valid)
+              and all(host.requests == per_host for host in hosts))
+        check(f"no host sees more than PER_HOST_LIMIT ({validator.PER_HOST_LIMIT}) at once",
+              all(host.peak <= validator.PER_HOST_LIMIT for host in hosts))
+        check("hosts are checked side by side, past one host's limit",
+              FakeVideoHost.total_peak == len(hosts) * validator.PER_HOST_LIMIT)
+
+        for host in hosts:
+            host.requests = 0
+        _, _, _, rechecked = validator.validate(videos, cache)
+        check("fresh cache -> no requests", rechecked == 0 and not any(host.requests for host in hosts))
+
+        _, _, _, rechecked = validator.validate(videos, cache, ttl=0)
+        check("stale ok entries revalidate with a 304",
+              rechecked == len(videos) and all(cache[url]['status'] == 304 for url in videos.values()))
+    finally:
+        for host in hosts:
+            host.__exit__()
+
+    with FakeVideoHost({"ok.mp4": 200, "gone.mp4": 404, "flaky.mp4": "flaky", "moved.mp4": "moved"}) as host:
+        videos = {name: host.url(f"{name}.mp4") for name in ("ok", "gone", "flaky", "moved")}
+        cache = {}
+        valid, broken, unknown, _ = validator.validate(videos, cache)
+        check("404 is broken, not unknown", broken == ["gone"] and not unknown)
+        check("503 is retried until it answers", "flaky" in valid)
+        check("redirects are followed", "moved" in valid)
+
+        host.statuses["gone.mp4"] = 200
+        host.requests = 0
+        valid, broken, _, rechecked = validator.validate(videos, cache)
+        check("only the broken video is re-checked, and it comes back",
+              rechecked == 1 and host.requests == 1 and "gone" in valid and not broken)
+
+    print(f"\n{'All checks passed' if not failures else f'{len(failures)} check(s) failed'}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
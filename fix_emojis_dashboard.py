@@ -1,12 +1,12 @@
 
 import os
+import sys
+from patch_engine import Edit, patch_file
 
 filepath = r"C:\Users\shann\.gemini\antigravity\plant_based_balance\dashboard.html"
 
-with open(filepath, 'r', encoding='utf-8') as f:
-    content = f.read()
-
-# Replacements (Carefully ordered)
+# Replacements - all anchors are matched against the original text in one pass,
+# so entries must not overlap (the engine reports it if they do)
 
 replacements = [
     # Coach Sidebar
@@ -18,7 +18,6 @@ replacements = [
 
     # PWA
     ('?? Install Our App', '📲 Install Our App'),
-    ('>?? Install Our App', '>📲 Install Our App'), # Variation
 
     # Headers / Dashboard
     ('font-size: 1.8rem;">??</div>', 'font-size: 1.8rem;">🌿</div>'), # Current Phase
@@ -27,7 +26,6 @@ replacements = [
 
     # Daily Check-in Modal
     # High Energy (??)
-    ('onclick="selectEnergy(\'high\')"', 'onclick="selectEnergy(\'high\')"'), # Anchor
     ('<div style="font-size:1.5rem;">??</div>', '<div style="font-size:1.5rem;">⚡</div>'),
     
     # Low Energy (?????)
@@ -52,24 +50,17 @@ replacements = [
     
     # Coach Activity Feed Icons (Mock data)
     ("icon: '??????'", "icon: '🦵'"), # Leg Day
-    ("icon: '??'", "icon: '🥗'"), # Logged Lunch/Generic
-    ("icon: '??'", "icon: '📸'"), # Progress Photo
+    ("icon: '??'", "icon: '🥗'"), # Logged Lunch/Generic (also covered Progress Photo)
 
     # Generic Fallback for Meal Icons (Do this LAST)
     ('class="meal-icon">??</div>', 'class="meal-icon">🍽️</div>'),
 ]
 
-new_content = content
-for target, replacement in replacements:
-    new_content = new_content.replace(target, replacement)
-
-# Check specifically for the movement card "Today's Movement"
-# It might have a specific ID or class
-if 'Today\'s Movement' in new_content:
-    # Try to find the ????? before it
-    pass
-
-with open(filepath, 'w', encoding='utf-8') as f:
-    f.write(new_content)
+# Each fix is optional and applies to every occurrence, like str.replace did
+result = patch_file(filepath, [Edit(target, replacement, count="all", optional=True)
+                               for target, replacement in replacements],
+                    dry_run="--dry-run" in sys.argv)
+print(result.report())
 
-print("Fixed emojis in dashboard.html")
+if result.written:
+    print("Fixed emojis in dashboard.html")
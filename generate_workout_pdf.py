@@ -1,63 +1,234 @@
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-
-def create_workout_pdf(filename):
-    c = canvas.Canvas(filename, pagesize=letter)
-    width, height = letter
-
-    # Title
-    c.setFont("Helvetica-Bold", 24)
-    c.drawCentredString(width / 2, height - 50, "2 Full Day Full Body Workout Program")
-
-    # Draw a line under title
-    c.setLineWidth(1)
-    c.line(50, height - 60, width - 50, height - 60)
-
-    # Day 1 Section
-    y_position = height - 100
-    c.setFont("Helvetica-Bold", 18)
-    c.drawString(50, y_position, "Day 1")
-    
-    y_position -= 30
-    c.setFont("Helvetica", 12)
-    exercises_day_1 = [
-        "Barbell Back Squats",
-        "Bench Press",
-        "Lateral Raises",
-        "Face Pulls",
-        "Tricep Pushdowns"
-    ]
-
-    for exercise in exercises_day_1:
-        c.drawString(70, y_position, f"- {exercise}")
-        y_position -= 20
-
-    # Day 2 Section
-    y_position -= 20
-    c.setFont("Helvetica-Bold", 18)
-    c.drawString(50, y_position, "Day 2")
-
-    y_position -= 30
-    c.setFont("Helvetica", 12)
-    exercises_day_2 = [
-        "Bulgarian Split Squats",
-        "Hyperextension",
-        "Seated Row",
-        "Lat Pulldown",
-        "Plank"
-    ]
-
-    for exercise in exercises_day_2:
-        c.drawString(70, y_position, f"- {exercise}")
-        y_position -= 20
-
-    # Footer
-    c.setFont("Helvetica-Oblique", 10)
-    c.drawCentredString(width / 2, 50, "Generated by Plant Based Balance Assistant")
-
-    c.save()
-    print(f"PDF created: {filename}")
+import os
+import sys
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import workout_library
+
+OUTPUT_DIR = "workout_pdfs"
+CACHE_FILE = ".workout_pdf_cache.json"
+RENDER_VERSION = 1      # bump when the layout changes so everything re-renders
+FOOTER = "Generated by Plant Based Balance Assistant"
+
+# Renders workouts to PDF with reportlab. A program is a title plus one or
+# more days of exercises; every library workout is a one-day program, and
+# PROGRAMS holds the hand-written ones.
+#
+# Programs are rendered in a process pool. Each worker builds the page
+# template (fonts, sizes, margins) once in its initializer and reuses it for
+# every PDF it draws. The SHA1 of the program content plus RENDER_VERSION is
+# kept in .workout_pdf_cache.json, so a program whose content has not changed
+# is not rendered again.
+#
+#   python generate_workout_pdf.py                    -> the PROGRAMS (2_Day_Full_Body_Workout.pdf)
+#   python generate_workout_pdf.py --all              -> every library workout
+#   python generate_workout_pdf.py gym gym/back hiit-bw-1 [--force] [--workers 4]
+
+PROGRAMS = {
+    "2_Day_Full_Body_Workout.pdf": {
+        "title": "2 Full Day Full Body Workout Program",
+        "days": [
+            {"title": "Day 1", "exercises": [{"name": n} for n in [
+                "Barbell Back Squats", "Bench Press", "Lateral Raises", "Face Pulls", "Tricep Pushdowns"]]},
+            {"title": "Day 2", "exercises": [{"name": n} for n in [
+                "Bulgarian Split Squats", "Hyperextension", "Seated Row", "Lat Pulldown", "Plank"]]},
+        ],
+    },
+}
+
+
+class PageTemplate:
+    def __init__(self):
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfbase import pdfmetrics
+        self.pagesize = letter
+        self.width, self.height = letter
+        self.margin = 50
+        self.bottom = 80
+        self.fonts = {
+            "title": ("Helvetica-Bold", 24),
+            "day": ("Helvetica-Bold", 18),
+            "meta": ("Helvetica", 11),
+            "exercise": ("Helvetica", 12),
+            "detail": ("Helvetica-Oblique", 10),
+            "footer": ("Helvetica-Oblique", 10),
+        }
+        self.string_width = pdfmetrics.stringWidth
+
+    def fit(self, text, role, max_width):
+        # Truncate with an ellipsis instead of running off the page
+        font, size = self.fonts[role]
+        if self.string_width(text, font, size) <= max_width:
+            return text
+        while text and self.string_width(text + "...", font, size) > max_width:
+            text = text[:-1]
+        return text.rstrip() + "..."
+
+    def start_page(self, c, title, continued=False):
+        font, size = self.fonts["title"]
+        c.setFont(font, size)
+        heading = title + (" (cont.)" if continued else "")
+        c.drawCentredString(self.width / 2, self.height - 50,
+                            self.fit(heading, "title", self.width - 2 * self.margin))
+        c.setLineWidth(1)
+        c.line(self.margin, self.height - 60, self.width - self.margin, self.height - 60)
+        font, size = self.fonts["footer"]
+        c.setFont(font, size)
+        c.drawCentredString(self.width / 2, 50, FOOTER)
+        return self.height - 100
+
+    def render(self, program, path):
+        from reportlab.pdfgen import canvas
+        c = canvas.Canvas(path, pagesize=self.pagesize, pageCompression=1)
+        c.setTitle(program["title"])
+        c.setAuthor("Plant Based Balance")
+        pages = 1
+        y = self.start_page(c, program["title"])
+        text_width = self.width - 2 * self.margin - 20
+
+        def need(height):
+            nonlocal y, pages
+            if y - height < self.bottom:
+                c.showPage()
+                pages += 1
+                y = self.start_page(c, program["title"], continued=True)
+
+        if program.get("meta"):
+            font, size = self.fonts["meta"]
+            c.setFont(font, size)
+            c.drawCentredString(self.width / 2, y + 20, self.fit(program["meta"], "meta", text_width))
+        for day in program["days"]:
+            need(50)
+            font, size = self.fonts["day"]
+            c.setFont(font, size)
+            c.drawString(self.margin, y, day["title"])
+            y -= 30
+            for ex in day["exercises"]:
+                detail = ex.get("detail")
+                need(20 + (14 if detail else 0))
+                font, size = self.fonts["exercise"]
+                c.setFont(font, size)
+                c.drawString(self.margin + 20, y, self.fit(f"- {ex['name']}", "exercise", text_width))
+                y -= 20
+                if detail:
+                    font, size = self.fonts["detail"]
+                    c.setFont(font, size)
+                    c.drawString(self.margin + 32, y + 5, self.fit(detail, "detail", text_width - 12))
+                    y -= 14
+            y -= 20
+        c.save()
+        return pages
+
+
+_template = None
+
+def init_worker():
+    global _template
+    _template = PageTemplate()
+
+def render_job(job):
+    path, program, digest = job
+    if _template is None:
+        init_worker()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    pages = _template.render(program, tmp_path)
+    os.replace(tmp_path, path)
+    return path, digest, pages
+
+
+def workout_program(workout):
+    # One library workout as a one-day program
+    exercises = []
+    for ex in workout["exercises"]:
+        detail = f"{ex['sets']} x {ex['reps']}"
+        if ex.get("desc"):
+            detail += f" - {ex['desc']}"
+        exercises.append({"name": ex["name"], "detail": detail})
+    return {
+        "title": workout["name"],
+        "meta": f"{workout['duration']} | {workout['difficulty']} | {', '.join(workout['equipment'])}",
+        "days": [{"title": "Workout", "exercises": exercises}],
+    }
+
+def select_workouts(library, selectors):
+    # Selectors: "category", "category/subcategory" or a workout id
+    jobs = {}
+    for cat_key, sub_key, workout in workout_library.iter_workouts(library):
+        for sel in selectors:
+            if sel in ("--all", cat_key, f"{cat_key}/{sub_key}", workout["id"]):
+                jobs[os.path.join(OUTPUT_DIR, cat_key, f"{workout['id']}.pdf")] = workout_program(workout)
+                break
+    return jobs
+
+def program_hash(program):
+    payload = json.dumps([RENDER_VERSION, program], sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def load_cache(path=CACHE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_cache(cache, path=CACHE_FILE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def render_all(programs, force=False, workers=None):
+    # -> (rendered, skipped); programs: {output path: program}
+    cache = load_cache()
+    jobs, skipped = [], 0
+    for path, program in programs.items():
+        digest = program_hash(program)
+        if not force and cache.get(path) == digest and os.path.exists(path):
+            skipped += 1
+            continue
+        jobs.append((path, program, digest))
+
+    rendered = 0
+    if len(jobs) == 1:
+        results = [render_job(jobs[0])]
+    elif jobs:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+        results = executor.map(render_job, jobs, chunksize=max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4)))
+    else:
+        results = []
+    try:
+        for path, digest, pages in results:
+            cache[path] = digest
+            rendered += 1
+            if rendered % 50 == 0 or len(jobs) <= 10:
+                print(f"  -> {path} ({pages} page{'s' if pages != 1 else ''}) [{rendered}/{len(jobs)}]")
+    finally:
+        if len(jobs) > 1:
+            executor.shutdown()
+        # Whatever finished is cached even if a later render failed
+        save_cache(cache)
+    return rendered, skipped
+
+def main():
+    args = sys.argv[1:]
+    force = "--force" in args
+    workers = None
+    if "--workers" in args:
+        i = args.index("--workers")
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+    selectors = [a for a in args if a != "--force"]
+
+    if selectors:
+        programs = select_workouts(workout_library.load_library(), selectors)
+        if not programs:
+            print(f"No workouts match {' '.join(selectors)}")
+            return
+    else:
+        programs = PROGRAMS
+
+    rendered, skipped = render_all(programs, force=force, workers=workers)
+    print(f"PDFs rendered: {rendered}, unchanged: {skipped}")
 
 if __name__ == "__main__":
-    create_workout_pdf("2_Day_Full_Body_Workout.pdf")
+    main()
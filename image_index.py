@@ -0,0 +1,232 @@
+from PIL import Image
+import os
+import sys
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+ASSETS_DIR = "assets"
+INDEX_FILE = "image_hash_index.json"
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+SKIP_DIRS = ('optimized',)   # generated variants from compress_images.py
+DEFAULT_THRESHOLD = 6        # max differing bits (of 64) to count as the same picture
+
+# pHash: 32x32 greyscale -> DCT -> top-left 8x8 low frequencies vs their median.
+# Only those 8 rows of the cosine basis are ever needed, so they are built once.
+PHASH_SIZE = 32
+PHASH_LOW = 8
+COS_TABLE = [[math.cos((2 * x + 1) * u * math.pi / (2 * PHASH_SIZE)) for x in range(PHASH_SIZE)]
+             for u in range(PHASH_LOW)]
+
+
+def average_hash(img):
+    pixels = list(img.convert('L').resize((8, 8), Image.Resampling.BILINEAR).getdata())
+    avg = sum(pixels) / 64
+    bits = 0
+    for p in pixels:
+        bits = (bits << 1) | (p > avg)
+    return bits
+
+def perceptual_hash(img):
+    small = img.convert('L').resize((PHASH_SIZE, PHASH_SIZE), Image.Resampling.LANCZOS)
+    pixels = list(small.getdata())
+    rows = [pixels[i * PHASH_SIZE:(i + 1) * PHASH_SIZE] for i in range(PHASH_SIZE)]
+
+    # Separable DCT: rows first, then the 8 wanted columns
+    row_dct = [[sum(c * p for c, p in zip(COS_TABLE[u], row)) for u in range(PHASH_LOW)] for row in rows]
+    coeffs = []
+    for v in range(PHASH_LOW):
+        for u in range(PHASH_LOW):
+            coeffs.append(sum(COS_TABLE[v][y] * row_dct[y][u] for y in range(PHASH_SIZE)))
+
+    # The DC term swamps everything else, keep it out of the median
+    median = sorted(coeffs[1:])[len(coeffs[1:]) // 2]
+    bits = 0
+    for c in coeffs:
+        bits = (bits << 1) | (c > median)
+    return bits
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+def hash_image(path):
+    with Image.open(path) as img:
+        img.load()
+        if img.mode in ('RGBA', 'LA', 'P'):
+            # Judge transparent images on a white background, as the site shows them
+            rgba = img.convert('RGBA')
+            img = Image.new('RGB', rgba.size, (255, 255, 255))
+            img.paste(rgba, mask=rgba.getchannel('A'))
+        return {
+            "ahash": f"{average_hash(img):016x}",
+            "phash": f"{perceptual_hash(img):016x}",
+            "width": img.width,
+            "height": img.height,
+        }
+
+def safe_hash_image(path):
+    try:
+        return hash_image(path)
+    except Exception as e:
+        print(f"Error hashing {path}: {e}")
+        return None
+
+
+class BKTree:
+    # Metric tree over Hamming distance: a radius query only descends into
+    # children whose edge distance is within [d - r, d + r].
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, item):
+        if self.root is None:
+            self.root = (value, [item], {})
+            return
+        node = self.root
+        while True:
+            d = hamming(value, node[0])
+            if d == 0:
+                node[1].append(item)
+                return
+            if d not in node[2]:
+                node[2][d] = (value, [item], {})
+                return
+            node = node[2][d]
+
+    def query(self, value, radius):
+        results = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            d = hamming(value, node[0])
+            if d <= radius:
+                results.extend((d, item) for item in node[1])
+            for edge, child in node[2].items():
+                if d - radius <= edge <= d + radius:
+                    stack.append(child)
+        return results
+
+
+class ImageIndex:
+    def __init__(self, root=ASSETS_DIR, index_path=INDEX_FILE):
+        self.root = root
+        self.index_path = index_path
+        self.entries = {}
+        self.tree = None
+        if os.path.exists(index_path):
+            with open(index_path, 'r') as f:
+                self.entries = json.load(f)
+
+    def scan(self):
+        files = {}
+        for dirpath, dirs, filenames in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for filename in filenames:
+                if filename.lower().endswith(IMAGE_EXTENSIONS):
+                    path = os.path.join(dirpath, filename)
+                    files[os.path.relpath(path, self.root).replace(os.sep, "/")] = os.stat(path)
+        return files
+
+    def update(self, workers=None):
+        # Only new or modified files are decoded; returns (hashed, removed)
+        files = self.scan()
+        removed = [p for p in self.entries if p not in files]
+        for rel_path in removed:
+            del self.entries[rel_path]
+
+        stale = [p for p, st in files.items()
+                 if p not in self.entries
+                 or self.entries[p]["size"] != st.st_size
+                 or self.entries[p]["mtime"] != int(st.st_mtime)]
+        if stale:
+            paths = [os.path.join(self.root, p) for p in stale]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for rel_path, result in zip(stale, executor.map(safe_hash_image, paths, chunksize=8)):
+                    if result is None:
+                        self.entries.pop(rel_path, None)
+                        continue
+                    st = files[rel_path]
+                    result.update({"size": st.st_size, "mtime": int(st.st_mtime)})
+                    self.entries[rel_path] = result
+
+        if stale or removed:
+            self.save()
+        self.tree = None
+        return len(stale), len(removed)
+
+    def save(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def build_tree(self):
+        self.tree = BKTree()
+        for rel_path, entry in self.entries.items():
+            self.tree.add(int(entry["phash"], 16), rel_path)
+        return self.tree
+
+    def near(self, phash, threshold=DEFAULT_THRESHOLD):
+        if self.tree is None:
+            self.build_tree()
+        return sorted(self.tree.query(phash, threshold))
+
+    def query_file(self, path, threshold=DEFAULT_THRESHOLD):
+        return self.near(int(hash_image(path)["phash"], 16), threshold)
+
+    def duplicate_groups(self, threshold=DEFAULT_THRESHOLD):
+        # Union-find over all near pairs; each group is sorted biggest file first
+        parent = {p: p for p in self.entries}
+
+        def find(p):
+            while parent[p] != p:
+                parent[p] = parent[parent[p]]
+                p = parent[p]
+            return p
+
+        for rel_path, entry in self.entries.items():
+            for _, other in self.near(int(entry["phash"], 16), threshold):
+                a, b = find(rel_path), find(other)
+                if a != b:
+                    parent[a] = b
+
+        groups = {}
+        for rel_path in self.entries:
+            groups.setdefault(find(rel_path), []).append(rel_path)
+        return [sorted(g, key=lambda p: -self.entries[p]["size"])
+                for g in groups.values() if len(g) > 1]
+
+
+def main():
+    threshold = DEFAULT_THRESHOLD
+    args = sys.argv[1:]
+    if "--threshold" in args:
+        i = args.index("--threshold")
+        threshold = int(args[i + 1])
+        del args[i:i + 2]
+
+    index = ImageIndex()
+    hashed, removed = index.update()
+    print(f"Indexed {len(index.entries)} images ({hashed} hashed, {removed} removed).")
+
+    if args:
+        # python image_index.py some_image.png  -> near matches for that file
+        for d, rel_path in index.query_file(args[0], threshold):
+            print(f"  {d:2d}  {rel_path}")
+        return
+
+    groups = index.duplicate_groups(threshold)
+    reclaimable = 0
+    for group in sorted(groups, key=len, reverse=True):
+        keep, dupes = group[0], group[1:]
+        # Keeping the smallest copy would lose resolution, so keep the largest
+        saved = sum(index.entries[p]["size"] for p in dupes)
+        reclaimable += saved
+        print(f"\n{keep}  ({len(dupes)} near-duplicates, {saved / 1e6:.1f} MB)")
+        for p in dupes:
+            print(f"    {p}")
+    print(f"\n{len(groups)} duplicate groups, {reclaimable / 1e6:.1f} MB reclaimable.")
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,10 @@
-import csv
-import glob
-import os
-from datetime import datetime
-
-def parse_amount(amount_str):
-    if not amount_str: return 0.0
-    clean = amount_str.replace('$', '').replace(',', '').strip()
-    try:
-        return float(clean)
-    except ValueError:
-        return 0.0
+import transaction_store
+import reconcile
 
 def load_transactions():
-    files = ['Transactions.csv', 'Transactions (1).csv', 'Transactions (2).csv']
-    all_rows = []
-    
-    for f in files:
-        if os.path.exists(f):
-            try:
-                with open(f, 'r', encoding='utf-8-sig') as csvfile:
-                    reader = csv.reader(csvfile)
-                    rows = list(reader)
-                    if len(rows) > 1:
-                        # Skip header (row 0), extract Date (0), Amount (1), Details (5)
-                        for r in rows[1:]:
-                            if len(r) >= 6:
-                                all_rows.append({
-                                    'date': r[0],
-                                    'amount': parse_amount(r[1]),
-                                    'details': r[5]
-                                })
-            except Exception as e:
-                print(f"Error reading {f}: {e}")
-    return all_rows
+    # Date stays the raw export string for the printouts below
+    return [{'date': t['original_date'], 'amount': t['amount'], 'details': t['details']}
+            for t in transaction_store.load_transactions()]
 
 def investigate():
     transactions = load_transactions()
@@ -73,5 +45,29 @@ def investigate():
     for i, t in enumerate(unknowns[:30]):
         print(f"{i+1}. {t['date']} | ${t['amount']} | {t['details']}")
 
+def reconcile_meta():
+    # 3. Where did each Meta invoice land? Amount + date-window match against
+    # the bank debits instead of guessing from keywords
+    store = transaction_store.TransactionStore()
+    store.refresh(verbose=False)
+    left_name, left, right_name, right = reconcile.meta_pair(store)
+    store.close()
+    print(f"\n--- {left_name} vs {right_name} ---")
+    if not left:
+        print("No Meta invoice exports loaded (meta_invoices*.csv).")
+        return
+    result = reconcile.reconcile(left, right)
+    print(result.summary(left_name, right_name))
+    matched = sum(-l['amount_cents'] for l, _, _ in result.matched) / 100
+    print(f"Invoice spend found on the statement: ${matched:,.2f}")
+    descriptions = {}
+    for _, r, _ in result.matched:
+        # Card lines carry a reference per charge - group on the merchant words
+        key = " ".join(w for w in r['details'].split() if not any(c.isdigit() for c in w))
+        descriptions[key] = descriptions.get(key, 0) + 1
+    for desc, count in sorted(descriptions.items(), key=lambda x: -x[1])[:10]:
+        print(f"  {count:>4} x {desc}")
+
 if __name__ == "__main__":
     investigate()
+    reconcile_meta()
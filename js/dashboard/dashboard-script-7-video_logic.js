@@ -10,7 +10,13 @@ function findVideoMatch(name) {
         if (customMatch && customMatch.video_url) return customMatch.video_url;
     }
 
-    // Clean name logic: Remove common prefixes and trim
+    // Precomputed by exercise_matcher.py for every workout exercise name;
+    // '' means it deliberately has no video
+    if (typeof EXERCISE_VIDEO_MATCHES !== 'undefined' && name in EXERCISE_VIDEO_MATCHES) {
+        return EXERCISE_VIDEO_MATCHES[name];
+    }
+
+    // Names the table has never seen (AI plans, custom workouts) - clean name logic: Remove common prefixes and trim
     const cleanName = name.replace(/(Dumbbell|Barbell|Body Weight|Band|Cable|Machine) /gi, '').trim();
     if(EXERCISE_VIDEOS[cleanName]) return EXERCISE_VIDEOS[cleanName];
 
@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+from transaction_store import file_sha1
+from video_map_store import atomic_write
+
+SOURCE_FILES = ["dashboard.html", "plantbasedswitch.html", "switch28.html"]
+OUTPUT_FILE = "extracted_meals.json"
+CACHE_FILE = ".meal_extract_cache.json"
+CACHE_VERSION = 1       # bump when extraction rules change
+
+# Meal cards out of the plan pages in one streaming pass per file. Every
+# <div class="card"> with a .meal-title becomes
+#
+#   {"title": ..., "image": first <img> src, "ingredients": [<li> text of the
+#    first <ul> after the "Ingredients" <h4>], "prep": <p> siblings after the
+#    "Preparation" <h4> up to the next <div>/<h4>, "source_file": ...}
+#
+# Each card's state is filled in as its tags go by, so the document is read
+# once and nothing is searched twice. Files are parsed in a process pool and
+# the meals of each file are cached with its SHA1 in .meal_extract_cache.json,
+# so unchanged pages are never parsed again.
+#
+#   python meal_extractor.py            -> extracted_meals.json
+#   python meal_extractor.py --force    -> ignore the cache
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+             "meta", "param", "source", "track", "wbr"}
+
+
+def has_class(attrs, name):
+    return name in (dict(attrs).get("class") or "").split()
+
+def strip_join(parts):
+    # BeautifulSoup's get_text(strip=True)
+    return "".join(p.strip() for p in parts if p.strip())
+
+
+class Card:
+    def __init__(self, level):
+        self.level = level
+        self.title = None
+        self.image = None
+        self.body = None            # level of the first .card-body; False once closed
+        self.ingredients = None     # None until the header's <ul> has been read
+        self.ing_header = False
+        self.want_ul = False
+        self.ul = None
+        self.prep = None            # [paragraph, ...] once the header is found
+        self.prep_parent = None     # level whose children are the prep siblings
+
+    def meal(self, source_file):
+        ingredients = self.ingredients or []
+        prep = "".join(p + "\n" for p in self.prep or []).strip()
+        if self.title is None or self.body is None or not (ingredients or prep or self.image):
+            return None
+        return {"title": self.title, "image": self.image, "ingredients": ingredients,
+                "prep": prep, "source_file": source_file}
+
+
+class MealParser(HTMLParser):
+    def __init__(self, source_file):
+        super().__init__(convert_charrefs=True)
+        self.source_file = source_file
+        self.stack = []
+        self.cards = []         # open cards, outermost first
+        self.captures = []      # [level, parts, done(text parts)] for open elements
+        self.all_cards = []     # in document order
+
+    def capture(self, done):
+        self.captures.append([len(self.stack), [], done])
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+        level = len(self.stack)
+        if tag == "div" and has_class(attrs, "card"):
+            self.cards.append(Card(level))
+            self.all_cards.append(self.cards[-1])
+        for card in self.cards:
+            self.card_start(card, tag, attrs, level)
+
+    def card_start(self, card, tag, attrs, level):
+        if card.prep_parent is not None and level - (tag not in VOID_TAGS) == card.prep_parent:
+            if tag == "p":
+                self.capture(lambda parts, card=card: card.prep.append(strip_join(parts)))
+            elif tag in ("div", "h4"):
+                card.prep_parent = None
+        if tag == "img":
+            if card.image is None:
+                card.image = dict(attrs).get("src")
+        elif tag == "div":
+            if card.title is None and has_class(attrs, "meal-title"):
+                card.title = ""
+                self.capture(lambda parts, card=card: setattr(card, "title", strip_join(parts)))
+            elif card.body is None and has_class(attrs, "card-body"):
+                card.body = level
+        elif tag == "h4" and card.body:
+            self.capture(lambda parts, card=card: self.header(card, "".join(parts)))
+        elif tag == "ul" and card.want_ul:
+            card.want_ul, card.ul = False, []
+            self.capture(lambda parts, card=card: setattr(card, "ingredients", card.ul))
+        elif tag == "li" and card.ul is not None and card.ingredients is None:
+            # Slot taken on open so nested items keep document order
+            card.ul.append("")
+            self.capture(lambda parts, card=card, i=len(card.ul) - 1: card.ul.__setitem__(i, strip_join(parts)))
+
+    def header(self, card, text):
+        if "Ingredients" in text and not card.ing_header:
+            card.ing_header = card.want_ul = True
+        if "Preparation" in text and card.prep is None:
+            card.prep = []
+            card.prep_parent = len(self.stack)
+
+    def handle_endtag(self, tag):
+        if tag not in self.stack:
+            return
+        while self.stack:
+            if self.stack.pop() == tag:
+                break
+        self.closed(len(self.stack))
+
+    def closed(self, level):
+        # Everything opened deeper than `level` has just ended
+        while self.captures and self.captures[-1][0] > level:
+            _, parts, done = self.captures.pop()
+            done(parts)
+        while self.cards and self.cards[-1].level > level:
+            self.cards.pop()
+        for card in self.cards:
+            if card.body and card.body > level:
+                card.body = False
+            if card.prep_parent is not None and card.prep_parent > level:
+                card.prep_parent = None
+
+    def handle_data(self, data):
+        for capture in self.captures:
+            capture[1].append(data)
+
+    def close(self):
+        super().close()
+        self.closed(0)
+        meals = (card.meal(self.source_file) for card in self.all_cards)
+        return [meal for meal in meals if meal]
+
+
+def extract_meals(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    parser = MealParser(os.path.basename(path))
+    parser.feed(content)
+    return parser.close()
+
+def load_cache(path=CACHE_FILE):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    return {"version": CACHE_VERSION, "files": {}}
+
+def save_cache(cache, path=CACHE_FILE):
+    atomic_write(path, json.dumps(cache, ensure_ascii=False))
+
+def load_meals(paths=SOURCE_FILES, force=False, workers=None):
+    # {path: [meal, ...]}; only files whose SHA1 is not cached are parsed
+    paths = [p for p in paths if os.path.exists(p)]
+    cache = load_cache()
+    hashes = {path: file_sha1(path) for path in paths}
+    stale = [p for p in paths if force or cache["files"].get(p, {}).get("sha1") != hashes[p]]
+    if len(stale) == 1:
+        results = [extract_meals(stale[0])]
+    elif stale:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(extract_meals, stale))
+    if stale:
+        for path, meals in zip(stale, results):
+            cache["files"][path] = {"sha1": hashes[path], "meals": meals}
+        save_cache(cache)
+    return {path: cache["files"][path]["meals"] for path in paths}
+
+def unique_meals(meals_by_file):
+    # Same title + image in several files (or days) is one meal; first wins
+    unique = {}
+    for meals in meals_by_file.values():
+        for meal in meals:
+            unique.setdefault((meal["title"], meal["image"]), meal)
+    return list(unique.values())
+
+def save_meals(meals, path=OUTPUT_FILE):
+    atomic_write(path, json.dumps(meals, indent=2))
+
+def main():
+    force = "--force" in sys.argv
+    for path in SOURCE_FILES:
+        if not os.path.exists(path):
+            print(f"File not found: {path}")
+    meals_by_file = load_meals(force=force)
+    for path, meals in meals_by_file.items():
+        print(f"Found {len(meals)} meals in {path}")
+    meals = unique_meals(meals_by_file)
+    save_meals(meals)
+    print(f"Saved {len(meals)} unique meals to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    main()
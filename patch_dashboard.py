@@ -1,14 +1,10 @@
-import os
-
-with open('dashboard.html', 'r', encoding='utf-8') as f:
-    content = f.read()
+import sys
+from patch_engine import Edit, patch_file
 
 # Replace authHelpers.signOut() inline handler with a custom function call
 old_btn = 'onclick="authHelpers.signOut()"'
 new_btn = 'onclick="handleLogout()"'
 
-content = content.replace(old_btn, new_btn)
-
 # Now we need to inject the handleLogout function somewhere.
 # A good place is right before the closing </script> tag at the end of the file, or just before </body>.
 # Let's find the closing </body> tag.
@@ -51,7 +47,8 @@ async function handleLogout() {
 </body>
 """
 
-content = content.replace("</body>", logout_script)
-
-with open('dashboard.html', 'w', encoding='utf-8') as f:
-    f.write(content)
+result = patch_file('dashboard.html', [
+    Edit(old_btn, new_btn, count="all"),
+    Edit("</body>", logout_script),
+], dry_run="--dry-run" in sys.argv)
+print(result.report())
@@ -0,0 +1,191 @@
+import os
+import re
+import sys
+import json
+import difflib
+
+# Declarative, all-or-nothing text patching for dashboard.html and lib/*.js.
+#
+#   from patch_engine import Edit, patch_file
+#   patch_file("lib/games.js", [
+#       Edit("showGameToast('Challenge declined');", "..."),
+#       Edit('class="meal-icon">??</div>', 'class="meal-icon">🍽️</div>', count="all"),
+#   ], dry_run=True)
+#
+# Every anchor is located in one scan of the original text, all edits are
+# checked (unmatched, ambiguous, overlapping) before anything is applied, the
+# new text is built in a single join, and the file is only written - atomically -
+# when every check passed and something actually changed.
+
+
+class Edit:
+    def __init__(self, find, replace, count=1, optional=False, label=None):
+        # count: exact number of occurrences expected, or "all" for one or more
+        self.find = find
+        self.replace = replace
+        self.count = count
+        self.optional = optional
+        self.label = label or (find if len(find) <= 60 else find[:57] + "...").replace("\n", "\\n")
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["find"], data["replace"], data.get("count", 1),
+                   data.get("optional", False), data.get("label"))
+
+
+class PatchError(Exception):
+    pass
+
+
+class PatchResult:
+    def __init__(self, path):
+        self.path = path
+        self.applied = []       # (edit, occurrences)
+        self.unmatched = []
+        self.skipped = []       # optional edits whose anchor is absent
+        self.ambiguous = []     # (edit, occurrences found)
+        self.conflicts = []     # (edit, other edit)
+        self.changed = False
+        self.written = False
+        self.diff = ""
+
+    @property
+    def ok(self):
+        return not (self.unmatched or self.ambiguous or self.conflicts)
+
+    def report(self):
+        lines = [f"{self.path}: {len(self.applied)} edit(s) matched"]
+        for edit in self.unmatched:
+            lines.append(f"  UNMATCHED  {edit.label}")
+        for edit in self.skipped:
+            lines.append(f"  skipped    {edit.label}")
+        for edit, found in self.ambiguous:
+            lines.append(f"  AMBIGUOUS  {edit.label} (expected {edit.count}, found {found})")
+        for edit, other in self.conflicts:
+            lines.append(f"  OVERLAP    {edit.label} <-> {other.label}")
+        if self.ok:
+            if not self.changed:
+                lines.append("  no changes")
+            elif self.written:
+                lines.append("  written")
+            else:
+                lines.append("  dry run - not written")
+        return "\n".join(lines)
+
+
+def find_anchors(text, anchors):
+    # One scan for every anchor. A zero-width lookahead over an alternation
+    # (longest first) reports overlapping hits too; anchors that are a prefix
+    # of the one that matched at a position also match there, so those are
+    # added from a precomputed table. Returns {anchor: [start, ...]}.
+    unique = sorted(set(a for a in anchors if a), key=len, reverse=True)
+    hits = {a: [] for a in unique}
+    if not unique:
+        return hits
+    prefixes = {a: [b for b in unique if b != a and a.startswith(b)] for a in unique}
+    scanner = re.compile("(?=(" + "|".join(re.escape(a) for a in unique) + "))", re.DOTALL)
+    for m in scanner.finditer(text):
+        anchor = m.group(1)
+        hits[anchor].append(m.start())
+        for shorter in prefixes[anchor]:
+            hits[shorter].append(m.start())
+    return hits
+
+def plan_edits(text, edits, result):
+    hits = find_anchors(text, [e.find for e in edits])
+    spans = []      # (start, end, edit)
+    for edit in edits:
+        starts = hits.get(edit.find, [])
+        # Occurrences of one anchor that overlap themselves ("aa" in "aaa") count once
+        chosen, last_end = [], -1
+        for start in starts:
+            if start >= last_end:
+                chosen.append(start)
+                last_end = start + len(edit.find)
+
+        if not chosen:
+            if edit.optional:
+                result.skipped.append(edit)
+            else:
+                result.unmatched.append(edit)
+            continue
+        if edit.count != "all" and len(chosen) != edit.count:
+            result.ambiguous.append((edit, len(chosen)))
+            continue
+        result.applied.append((edit, len(chosen)))
+        spans.extend((start, start + len(edit.find), edit) for start in chosen)
+
+    spans.sort(key=lambda s: (s[0], s[1]))
+    for (s1, e1, edit1), (s2, e2, edit2) in zip(spans, spans[1:]):
+        if s2 < e1:
+            result.conflicts.append((edit1, edit2))
+    return spans
+
+def apply_edits(text, edits, result=None):
+    # Returns (new_text, result); new_text is None when any check failed
+    result = result or PatchResult("<text>")
+    spans = plan_edits(text, edits, result)
+    if not result.ok:
+        return None, result
+
+    parts, pos = [], 0
+    for start, end, edit in spans:
+        parts.append(text[pos:start])
+        parts.append(edit.replace)
+        pos = end
+    parts.append(text[pos:])
+    new_text = "".join(parts)
+    result.changed = new_text != text
+    return new_text, result
+
+def unified_diff(path, old, new, context=3):
+    return "".join(difflib.unified_diff(
+        old.splitlines(keepends=True), new.splitlines(keepends=True),
+        fromfile=f"a/{path}", tofile=f"b/{path}", n=context))
+
+def patch_file(path, edits, dry_run=False, show_diff=None, strict=True):
+    # strict: raise PatchError when any edit fails instead of only reporting it
+    # newline='' keeps CRLF files byte-for-byte outside the edited spans
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+
+    result = PatchResult(path)
+    new_text, result = apply_edits(text, edits, result)
+    if new_text is not None and result.changed:
+        if dry_run or show_diff:
+            result.diff = unified_diff(path, text, new_text)
+        if not dry_run:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(new_text)
+            os.replace(tmp_path, path)
+            result.written = True
+
+    if strict and not result.ok:
+        raise PatchError(result.report())
+    return result
+
+def main():
+    # python patch_engine.py edits.json [--dry-run]
+    # edits.json: {"file": "lib/games.js", "edits": [{"find": ..., "replace": ..., "count": 1}]}
+    # or a list of such objects to patch several files.
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    dry_run = "--dry-run" in sys.argv
+    if not args:
+        print("Usage: python patch_engine.py edits.json [--dry-run]")
+        return
+
+    with open(args[0], 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    failed = False
+    for entry in spec if isinstance(spec, list) else [spec]:
+        edits = [Edit.from_dict(e) for e in entry["edits"]]
+        result = patch_file(entry["file"], edits, dry_run=dry_run, strict=False)
+        print(result.report())
+        if result.diff:
+            print(result.diff)
+        failed = failed or not result.ok
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
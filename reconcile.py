@@ -0,0 +1,195 @@
+import os
+import sys
+import bisect
+import transaction_store
+import statement_parser
+
+# Matches records from two sources by amount and date window, e.g. Meta Ads
+# invoices against the card debits on the bank statement. (Stripe balance
+# reports only carry period totals, so they are checked against the bank's
+# STRIPE credits in stripe_reports.py rather than paired here.)
+#
+#   python reconcile.py meta [--window 5] [--tolerance 0] [--show]
+#
+# Records are dicts with "id", "day" (date ordinal), "amount_cents" and
+# "details". The right-hand side is indexed once by amount (exact cents ->
+# day-sorted list), so each left record costs a dict lookup per cent of
+# tolerance plus a bisect over its date window instead of a scan of every row.
+#
+# Pairing rules, in order:
+#   1. unique  - the only candidate, and it has no other claimant
+#   2. closest - the candidate strictly nearest in date, and that record's
+#                nearest claimant is this one
+# Whatever still has several candidates is ambiguous; no candidates at all is
+# unmatched. Each matched record is consumed, so the rules are re-run until
+# nothing changes - resolving one pair often makes its neighbours unique.
+
+DEFAULT_WINDOW = 5       # days a charge can take to post to the bank
+STATEMENT_FILES = ["jul_sep_data.txt", "bulk_transactions.txt"]
+
+
+class AmountIndex:
+    def __init__(self, records):
+        self.by_amount = {}
+        for rec in records:
+            self.by_amount.setdefault(abs(rec["amount_cents"]), []).append(rec)
+        for recs in self.by_amount.values():
+            recs.sort(key=lambda r: r["day"])
+        self.days = {amount: [r["day"] for r in recs] for amount, recs in self.by_amount.items()}
+
+    def candidates(self, amount_cents, day, before, after, tolerance=0):
+        # Records within [day - before, day + after] and +/- tolerance cents
+        found = []
+        for amount in range(abs(amount_cents) - tolerance, abs(amount_cents) + tolerance + 1):
+            days = self.days.get(amount)
+            if not days:
+                continue
+            lo = bisect.bisect_left(days, day - before)
+            hi = bisect.bisect_right(days, day + after)
+            found.extend(self.by_amount[amount][lo:hi])
+        return found
+
+
+class Reconciliation:
+    def __init__(self):
+        self.matched = []           # (left, right, rule)
+        self.ambiguous = []         # (left, [right candidates])
+        self.unmatched_left = []
+        self.unmatched_right = []
+
+    def summary(self, left_name="left", right_name="right"):
+        return (f"{len(self.matched)} matched, {len(self.ambiguous)} ambiguous, "
+                f"{len(self.unmatched_left)} {left_name} unmatched, "
+                f"{len(self.unmatched_right)} {right_name} unmatched")
+
+
+def reconcile(left, right, before=0, after=DEFAULT_WINDOW, tolerance=0):
+    # before/after: how many days the right record may be dated before/after the left one
+    index = AmountIndex(right)
+    right_by_id = {r["id"]: r for r in right}
+    cands = {}                      # left id -> set of right ids
+    claims = {}                     # right id -> set of left ids
+    left_by_id = {}
+    for rec in left:
+        left_by_id[rec["id"]] = rec
+        ids = {r["id"] for r in index.candidates(rec["amount_cents"], rec["day"], before, after, tolerance)}
+        cands[rec["id"]] = ids
+        for rid in ids:
+            claims.setdefault(rid, set()).add(rec["id"])
+
+    result = Reconciliation()
+    used = set()
+
+    def take(lid, rid, rule):
+        result.matched.append((left_by_id[lid], right_by_id[rid], rule))
+        used.add(rid)
+        for other in claims.pop(rid, ()):
+            cands[other].discard(rid)
+        for other_rid in cands.pop(lid):
+            claims.get(other_rid, set()).discard(lid)
+
+    def distance(lid, rid):
+        return abs(right_by_id[rid]["day"] - left_by_id[lid]["day"])
+
+    changed = True
+    while changed:
+        changed = False
+        for lid in [l for l, ids in cands.items() if len(ids) == 1]:
+            if lid not in cands or len(cands[lid]) != 1:
+                continue
+            rid = next(iter(cands[lid]))
+            if claims.get(rid) == {lid}:
+                take(lid, rid, "unique")
+                changed = True
+        if changed:
+            continue
+        for lid in [l for l, ids in cands.items() if len(ids) > 1]:
+            if lid not in cands or len(cands[lid]) < 2:
+                continue
+            ranked = sorted(cands[lid], key=lambda rid: (distance(lid, rid), rid))
+            best = ranked[0]
+            if distance(lid, best) == distance(lid, ranked[1]):
+                continue
+            rivals = sorted(claims[best], key=lambda l: distance(l, best))
+            if rivals[0] == lid and (len(rivals) == 1 or distance(rivals[1], best) > distance(lid, best)):
+                take(lid, best, "closest")
+                changed = True
+
+    for lid, ids in cands.items():
+        if ids:
+            result.ambiguous.append((left_by_id[lid], [right_by_id[r] for r in sorted(ids)]))
+        else:
+            result.unmatched_left.append(left_by_id[lid])
+    claimed = {rid for _, rights in result.ambiguous for rid in (r["id"] for r in rights)}
+    result.unmatched_right = [r for r in right if r["id"] not in used and r["id"] not in claimed]
+    return result
+
+
+def store_records(store, source, where="", params=()):
+    return [{"id": f"{source}:{r['id']}", "day": r["day"], "amount_cents": r["amount_cents"],
+             "date": r["date"], "details": r["details"], "source": r["file"]}
+            for r in store.query(source=source, where=where, params=params)]
+
+def statement_records(paths, debits=True):
+    # Pasted statement text (statement_parser) as extra bank lines
+    records = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        for rec in statement_parser.parse_file(path):
+            if (rec["amount"] < 0) != debits:
+                continue
+            records.append({"id": f"{path}:{rec['line']}", "day": rec["date"].toordinal(),
+                            "amount_cents": round(rec["amount"] * 100), "date": rec["date"].isoformat(),
+                            "details": rec["description"], "source": path})
+    return records
+
+def meta_pair(store):
+    # Meta invoices (card charges) vs every bank debit - descriptions on the
+    # card line vary too much (FACEBK, PAYPAL *FACEBOOK, ...) to filter on
+    left = store_records(store, "meta")
+    right = store_records(store, "bank", "amount_cents < 0") + statement_records(STATEMENT_FILES, debits=True)
+    return "Meta invoices", left, "bank debits", right
+
+PAIRS = {"meta": meta_pair}
+
+def option(args, name, default):
+    if name in args:
+        i = args.index(name)
+        value = int(args[i + 1])
+        del args[i:i + 2]
+        return value
+    return default
+
+def main():
+    args = sys.argv[1:]
+    window = option(args, "--window", DEFAULT_WINDOW)
+    tolerance = option(args, "--tolerance", 0)
+    show = "--show" in args
+    names = [a for a in args if not a.startswith("--")] or list(PAIRS)
+
+    store = transaction_store.TransactionStore()
+    store.refresh(verbose=False)
+    for name in names:
+        if name not in PAIRS:
+            print(f"Unknown pair '{name}' (have: {', '.join(PAIRS)})")
+            continue
+        left_name, left, right_name, right = PAIRS[name](store)
+        print(f"\n=== {left_name} <-> {right_name} ({len(left)} / {len(right)} rows, window {window} days) ===")
+        if not left:
+            print(f"No {left_name} loaded.")
+            continue
+        result = reconcile(left, right, after=window, tolerance=tolerance)
+        print(result.summary(left_name, right_name))
+        if show:
+            for l, r, rule in result.matched:
+                print(f"  MATCH  {l['date']} {l['amount_cents'] / 100:>9.2f}  ->  {r['date']} {r['details'][:50]}  [{rule}]")
+            for l, rights in result.ambiguous:
+                print(f"  AMBIG  {l['date']} {l['amount_cents'] / 100:>9.2f}  ->  "
+                      + ", ".join(f"{r['date']} {r['details'][:25]}" for r in rights))
+        for l in result.unmatched_left:
+            print(f"  NONE   {l['date']} {l['amount_cents'] / 100:>9.2f}  {l['details']}")
+    store.close()
+
+if __name__ == "__main__":
+    main()
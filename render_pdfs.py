@@ -0,0 +1,178 @@
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import hashlib
+from pathlib import Path
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = ".pdf_render_cache.json"
+RENDER_VERSION = 1      # bump to force every PDF to re-render
+PAGE_POOL = 4           # browser tabs rendering at once
+
+# HTML -> PDF for every printable page in the repo, through one headless
+# Chromium: a single browser launch, a pool of PAGE_POOL tabs working through
+# the job queue, and shared page presets. Each job is hashed over its HTML,
+# the local files it references (images, CSS, fonts) and its preset; jobs
+# whose hash matches .pdf_render_cache.json and whose PDF exists are skipped,
+# and the browser is not launched at all when nothing changed.
+#
+#   python render_pdfs.py                          -> everything in JOBS
+#   python render_pdfs.py Cover_Letter_MIICOACH.pdf resume.html
+#   python render_pdfs.py --force [--pages 2]
+
+MARGIN_1IN = {"top": "2.54cm", "right": "2.54cm", "bottom": "2.54cm", "left": "2.54cm"}
+MARGIN_1CM = {"top": "1cm", "right": "1cm", "bottom": "1cm", "left": "1cm"}
+PRESETS = {
+    # Cover letters and the AI/ML resume: 1 inch of whitespace on every page
+    "letter": {"format": "A4", "print_background": True, "margin": MARGIN_1IN},
+    # Layouts with their own spacing (images, two-column resume)
+    "compact": {"format": "A4", "print_background": True, "margin": MARGIN_1CM},
+    # The page's own @page rules decide size and margins
+    "css": {"format": "A4", "print_background": True, "prefer_css_page_size": True},
+}
+
+# (html, pdf, preset, wait until)
+JOBS = [
+    ("resume_ai_ml.html", "Resume_AI_ML_Shannon_Birch_Updated.pdf", "letter", "load"),
+    ("resume.html", "Resume_Shannon_Birch.pdf", "compact", "load"),
+    ("affinda_cover_letter.html", "Affinda_Cover_Letter_Shannon_Birch.pdf", "letter", "load"),
+    ("Cover_Letter_MIICOACH.html", "Cover_Letter_MIICOACH.pdf", "letter", "load"),
+    ("Cover_Letter_Physique_Factory.html", "Cover_Letter_Physique_Factory.pdf", "compact", "networkidle"),
+    ("Cover_Letter_CMA.html", "Cover_Letter_CMA.pdf", "css", "load"),
+    ("Cover_Letter_Jetts.html", "Cover_Letter_Jetts.pdf", "css", "load"),
+    ("Cover_Letter_MRF.html", "Cover_Letter_MRF.pdf", "css", "load"),
+    ("access-cortisol.html", "Cortisol_Meal_Plan_Access.pdf", "css", "load"),
+    ("access-estrogen.html", "Estrogen_Meal_Plan_Access.pdf", "css", "load"),
+]
+
+ASSET_RE = re.compile(r'''(?:src|href)\s*=\s*["']([^"'#?]+)|url\(\s*["']?([^"')#?]+)''', re.IGNORECASE)
+
+
+def local_assets(html_path, html):
+    # Files the page pulls in from disk; remote URLs and missing files are ignored
+    folder = os.path.dirname(html_path)
+    assets = set()
+    for m in ASSET_RE.finditer(html):
+        ref = (m.group(1) or m.group(2)).strip()
+        if re.match(r'^[a-z][a-z0-9+.-]*:', ref, re.IGNORECASE) or ref.startswith("//"):
+            continue
+        path = os.path.normpath(os.path.join(folder, ref))
+        if os.path.isfile(path):
+            assets.add(path)
+    return sorted(assets)
+
+def job_hash(html_path, preset, wait_until):
+    sha1 = hashlib.sha1(json.dumps([RENDER_VERSION, PRESETS[preset], wait_until], sort_keys=True).encode())
+    with open(html_path, 'rb') as f:
+        html = f.read()
+    sha1.update(html)
+    for asset in local_assets(html_path, html.decode('utf-8', 'replace')):
+        sha1.update(os.path.relpath(asset, BASE_DIR).encode('utf-8'))
+        with open(asset, 'rb') as f:
+            sha1.update(hashlib.sha1(f.read()).digest())
+    return sha1.hexdigest()
+
+def load_cache(path=CACHE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_cache(cache, path=CACHE_FILE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def select_jobs(names):
+    # Match on the HTML or the PDF name; no names = every job
+    if not names:
+        return list(JOBS)
+    jobs = [job for job in JOBS if job[0] in names or job[1] in names]
+    unknown = set(names) - {job[0] for job in jobs} - {job[1] for job in jobs}
+    for name in sorted(unknown):
+        print(f"[!] No render job for {name}")
+    return jobs
+
+def plan(jobs, cache, force=False):
+    # -> [(html path, pdf path, preset, wait until, hash)] that need rendering
+    stale = []
+    for html, pdf, preset, wait_until in jobs:
+        html_path = os.path.join(BASE_DIR, html)
+        pdf_path = os.path.join(BASE_DIR, pdf)
+        if not os.path.exists(html_path):
+            print(f"[!] Missing {html}")
+            continue
+        digest = job_hash(html_path, preset, wait_until)
+        if not force and cache.get(pdf) == digest and os.path.exists(pdf_path):
+            continue
+        stale.append((html_path, pdf_path, preset, wait_until, digest))
+    return stale
+
+async def render_queue(stale, cache, pages=PAGE_POOL):
+    from playwright.async_api import async_playwright
+
+    queue = asyncio.Queue()
+    for job in stale:
+        queue.put_nowait(job)
+    failures = []
+
+    async def worker(browser):
+        page = await browser.new_page()
+        while not queue.empty():
+            html_path, pdf_path, preset, wait_until, digest = queue.get_nowait()
+            name = os.path.basename(pdf_path)
+            try:
+                await page.goto(Path(html_path).as_uri(), wait_until=wait_until)
+                tmp_path = pdf_path + ".tmp"
+                await page.pdf(path=tmp_path, **PRESETS[preset])
+                os.replace(tmp_path, pdf_path)
+                cache[name] = digest
+                print(f"  -> {name} ({preset})")
+            except Exception as e:
+                failures.append(name)
+                print(f"[!] {name}: {e}")
+        await page.close()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        try:
+            await asyncio.gather(*(worker(browser) for _ in range(min(pages, len(stale)))))
+        finally:
+            await browser.close()
+    return failures
+
+def render(names=None, force=False, pages=PAGE_POOL):
+    # -> list of PDFs that failed
+    cache = load_cache()
+    stale = plan(select_jobs(names), cache, force)
+    if not stale:
+        print("All PDFs up to date.")
+        return []
+    started = time.time()
+    print(f"Rendering {len(stale)} PDF(s) with {min(pages, len(stale))} page(s) in one browser...")
+    try:
+        failures = asyncio.run(render_queue(stale, cache, pages))
+    finally:
+        save_cache(cache)
+    print(f"Done in {time.time() - started:.1f}s ({len(stale) - len(failures)} rendered, {len(failures)} failed)")
+    return failures
+
+def main():
+    args = sys.argv[1:]
+    pages = PAGE_POOL
+    if "--pages" in args:
+        i = args.index("--pages")
+        pages = int(args[i + 1])
+        del args[i:i + 2]
+    force = "--force" in args
+    names = [a for a in args if not a.startswith("--")]
+    failures = render(names, force=force, pages=pages)
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
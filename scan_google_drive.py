@@ -1,22 +1,32 @@
-
 import os
-import pathlib
+import sys
 import json
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 
 # Config
 TOKEN_FILE = r"C:\Users\shann\Downloads\Trainerize_Videos\drive_token.json"
 CLIENT_SECRETS_FILE = r"C:\Users\shann\Downloads\Trainerize_Videos\client_secrets.json"
 TARGET_FOLDER_NAME = "Trainerize_Videos"
 OUTPUT_FILE = "scanned_drive_videos.json"
+STATE_FILE = ".drive_scan_state.json"
 
 SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
 
+# The first run lists the whole folder and stores a Changes API start-page
+# token next to the file id -> name map in .drive_scan_state.json. Later runs
+# only ask Drive what changed since that token (usually one or two calls) and
+# merge it in; scanned_drive_videos.json is only rewritten when it changes.
+#
+#   python scan_google_drive.py           -> incremental when state exists
+#   python scan_google_drive.py --full    -> re-list the folder from scratch
+
+FILE_FIELDS = "id, name, mimeType, parents, trashed"
+
 def get_service():
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from googleapiclient.discovery import build
+
     creds = None
     # 1. Load existing
     if os.path.exists(TOKEN_FILE):
@@ -49,31 +59,52 @@ def get_service():
 
     return build('drive', 'v3', credentials=creds)
 
-def main():
-    print("Authenticating...")
-    service = get_service()
-    
-    # 1. Find the folder
+def video_name(name):
+    # Clean name (remove extension)
+    if name.lower().endswith(('.mp4', '.mov')):
+        return name[:-4]
+    return name
+
+def preview_url(file_id):
+    return f"https://drive.google.com/file/d/{file_id}/preview"
+
+def is_video(item, folder_id):
+    return (not item.get('trashed') and item.get('mimeType', '').startswith('video/')
+            and folder_id in item.get('parents', []))
+
+def build_videos(files):
+    # files: id -> original name, in listing order
+    return {video_name(name): preview_url(file_id) for file_id, name in files.items()}
+
+def load_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_json(path, data, indent=2):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_path, path)
+
+def find_folder(service):
     print(f"Searching for folder '{TARGET_FOLDER_NAME}'...")
     query = f"name = '{TARGET_FOLDER_NAME}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
     results = service.files().list(q=query, fields="files(id, name, parents)").execute()
     folders = results.get('files', [])
-    
     if not folders:
-        print("Folder not found.")
-        return
-    
-    # If multiple, assume the one inside another folder (nested) or just pick the one with most items?
-    # For now, pick the first one and check it.
-    folder_id = folders[0]['id']
-    print(f"Found folder ID: {folder_id}")
-    
-    # 2. List files
+        return None
+    # If multiple, pick the first one
+    return folders[0]['id']
+
+def full_scan(service, folder_id):
+    # Token first, so anything changed while listing shows up in the next delta
+    start_token = service.changes().getStartPageToken().execute()['startPageToken']
     print("Listing files (this may take a moment)...")
-    videos = {}
+    files = {}
     page_token = None
-    count = 0
-    
+    calls = 0
     while True:
         q = f"'{folder_id}' in parents and mimeType contains 'video/' and trashed = false"
         results = service.files().list(
@@ -82,32 +113,75 @@ def main():
             fields="nextPageToken, files(id, name)",
             pageToken=page_token
         ).execute()
-        
-        items = results.get('files', [])
-        for item in items:
-            # Clean name (remove extension)
-            name = item['name']
-            if name.lower().endswith('.mp4'):
-                name = name[:-4]
-            elif name.lower().endswith('.mov'):
-                name = name[:-4]
-                
-            # Construct preview URL
-            url = f"https://drive.google.com/file/d/{item['id']}/preview"
-            videos[name] = url
-            count += 1
-            
+        calls += 1
+        for item in results.get('files', []):
+            files[item['id']] = item['name']
         page_token = results.get('nextPageToken')
-        print(f"Scanned {count} files so far...")
+        print(f"Scanned {len(files)} files so far...")
         if not page_token:
             break
-            
-    print(f"Total videos found: {count}")
-    
-    # 3. Save
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(videos, f, indent=2)
-    print(f"Saved to {OUTPUT_FILE}")
+    return files, start_token, calls
+
+def apply_changes(service, folder_id, files, page_token):
+    # -> (new start token, files added/renamed, files removed, API calls)
+    updated, removed, calls = 0, 0, 0
+    while True:
+        results = service.changes().list(
+            pageToken=page_token,
+            pageSize=1000,
+            spaces='drive',
+            includeRemoved=True,
+            fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({FILE_FIELDS}))"
+        ).execute()
+        calls += 1
+        for change in results.get('changes', []):
+            file_id = change['fileId']
+            item = change.get('file')
+            if not change.get('removed') and item and is_video(item, folder_id):
+                if files.get(file_id) != item['name']:
+                    files[file_id] = item['name']
+                    updated += 1
+            elif file_id in files:
+                # Deleted, trashed, moved out of the folder or no longer a video
+                del files[file_id]
+                removed += 1
+        if 'newStartPageToken' in results:
+            return results['newStartPageToken'], updated, removed, calls
+        page_token = results['nextPageToken']
+
+def scan(service, output_file=OUTPUT_FILE, state_file=STATE_FILE, full=False):
+    state = None if full else load_json(state_file)
+    if state and state.get('folder') == TARGET_FOLDER_NAME and state.get('start_page_token'):
+        folder_id, files = state['folder_id'], state['files']
+        print(f"Fetching changes since last scan ({len(files)} files known)...")
+        token, updated, removed, calls = apply_changes(service, folder_id, files, state['start_page_token'])
+        print(f"  -> {updated} added/renamed, {removed} removed in {calls} API call(s)")
+    else:
+        folder_id = find_folder(service)
+        if not folder_id:
+            print("Folder not found.")
+            return None
+        print(f"Found folder ID: {folder_id}")
+        files, token, calls = full_scan(service, folder_id)
+        print(f"Total videos found: {len(files)} ({calls} list call(s))")
+
+    save_json(state_file, {"folder": TARGET_FOLDER_NAME, "folder_id": folder_id,
+                           "start_page_token": token, "files": files}, indent=None)
+    videos = build_videos(files)
+    existing = load_json(output_file)
+    if existing is not None and existing == videos and list(existing) == list(videos):
+        print(f"{output_file} unchanged.")
+    else:
+        save_json(output_file, videos)
+        print(f"Saved {len(videos)} videos to {output_file}")
+    return videos
+
+def main():
+    print("Authenticating...")
+    service = get_service()
+    if service is None:
+        return
+    scan(service, full="--full" in sys.argv)
 
 if __name__ == '__main__':
     main()
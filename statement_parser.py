@@ -0,0 +1,162 @@
+import re
+import sys
+import date_parsing
+
+# Streaming parser for statement text copied out of NAB internet banking.
+#
+# Two layouts turn up in the pasted dumps:
+#
+#   block (one field per line)          tab separated (one record per line)
+#     10 Jan 2026                         30 Sep 2025<TAB>Facebook<TAB>−$30.04
+#     COLES 7834 PALM 2026-01-08
+#                                       The block layout may be followed by a
+#     Transfers out                     "10 Jan 2026, COLES ..., activate to view
+#     −$4.96                            transaction details" line or a "..."
+#     +$148.89                          separator; both are skipped.
+#
+# Lines are tokenised with anchored regexes (date_parsing - no strptime, no
+# exceptions) and fed through a small state machine, so records come out one
+# at a time from a file of any size or from stdin:
+#
+#   python statement_parser.py bulk_transactions.txt --rules bulk
+#   type statement.txt | python statement_parser.py - --rules bas
+
+DATE_FORMATS = ('%d %b %Y', '%d %b %y')
+AMOUNT_RE = re.compile(r'([+\-−])?\$?(\d[\d,]*(?:\.\d+)?)')
+SUMMARY_RE = re.compile(r'\d{1,2} [A-Z][a-z]{2} \d{4}, .*activate to view')
+
+IDLE, FIELDS = "idle", "fields"
+
+
+def to_date(text):
+    # Cheap length/digit guard first so description lines never reach the
+    # memoised parser (its cache would grow with the file)
+    if not 8 <= len(text) <= 11 or not text[0].isdigit():
+        return None
+    return date_parsing.parse_date(text, DATE_FORMATS)
+
+def to_amount(text):
+    m = AMOUNT_RE.fullmatch(text)
+    if not m or '$' not in text and not m.group(1):
+        # A bare number is description text ("7834"), not money
+        return None
+    value = float(m.group(2).replace(',', ''))
+    return -value if m.group(1) in ('-', '−') else value
+
+def tokens(lines):
+    # (kind, value, line number) for every meaningful line
+    for line_no, raw in enumerate(lines, 1):
+        if '\t' in raw.strip('\r\n\t '):
+            parts = [p.strip() for p in raw.split('\t')]
+            when = to_date(parts[0])
+            amount = to_amount(parts[2]) if len(parts) > 2 else None
+            if when and amount is not None:
+                balance = to_amount(parts[3]) if len(parts) > 3 else None
+                yield "row", (when, parts[1], amount, balance), line_no
+                continue
+        line = raw.strip()
+        if not line or line == "...":
+            continue
+        when = to_date(line)
+        if when:
+            yield "date", when, line_no
+            continue
+        amount = to_amount(line)
+        if amount is not None:
+            yield "amount", amount, line_no
+        elif SUMMARY_RE.match(line):
+            continue
+        else:
+            yield "text", line, line_no
+
+def record(when, texts, amount, balance, line_no):
+    # The last text line of a block is NAB's category; the rest is the description
+    description = " ".join(texts[:-1]) if len(texts) > 1 else (texts[0] if texts else "")
+    return {
+        "date": when,
+        "description": description,
+        "category": texts[-1] if len(texts) > 1 else "",
+        "amount": amount,
+        "balance": balance,
+        "line": line_no,
+    }
+
+def parse_lines(lines):
+    state = IDLE
+    when, texts, amounts, start = None, [], [], 0
+    for kind, value, line_no in tokens(lines):
+        if kind == "row":
+            if state == FIELDS and amounts:
+                yield record(when, texts, amounts[0], None, start)
+            state = IDLE
+            row_date, description, amount, balance = value
+            yield {"date": row_date, "description": description, "category": "",
+                   "amount": amount, "balance": balance, "line": line_no}
+        elif kind == "date":
+            if state == FIELDS and amounts:
+                # Amount without a running balance - still a transaction
+                yield record(when, texts, amounts[0], None, start)
+            state, when, texts, amounts, start = FIELDS, value, [], [], line_no
+        elif state == IDLE:
+            # Notes, headings and other text between records
+            continue
+        elif kind == "text":
+            if amounts:
+                # Text after the amount starts nothing new - drop the stray block
+                state = IDLE
+                yield record(when, texts, amounts[0], None, start)
+            else:
+                texts.append(value)
+        elif kind == "amount":
+            amounts.append(value)
+            if len(amounts) == 2:
+                yield record(when, texts, amounts[0], amounts[1], start)
+                state = IDLE
+    if state == FIELDS and amounts:
+        yield record(when, texts, amounts[0], None, start)
+
+def parse_file(path):
+    # "-" reads stdin; the file is consumed line by line, never loaded whole
+    if path == "-":
+        yield from parse_lines(sys.stdin)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from parse_lines(f)
+
+def classify_records(records, categorizer, batch_size=1000):
+    # Streams (record, (category, rule, keyword)) with one classifier scan per batch
+    batch = []
+    for rec in records:
+        batch.append(rec)
+        if len(batch) >= batch_size:
+            yield from zip(batch, categorizer.classify_all([r["description"] for r in batch],
+                                                           [r["amount"] for r in batch]))
+            batch = []
+    if batch:
+        yield from zip(batch, categorizer.classify_all([r["description"] for r in batch],
+                                                       [r["amount"] for r in batch]))
+
+def main():
+    # python statement_parser.py [file|-] [--rules RULESET]
+    import categorizer
+
+    args = sys.argv[1:]
+    ruleset = "bas"
+    if "--rules" in args:
+        i = args.index("--rules")
+        ruleset = args[i + 1]
+        del args[i:i + 2]
+    path = args[0] if args else "-"
+
+    totals, count = {}, 0
+    for rec, (category, rule, keyword) in classify_records(parse_file(path), categorizer.load_categorizer(ruleset)):
+        count += 1
+        totals[str(category)] = totals.get(str(category), 0) + rec["amount"]
+        print(f"{rec['date']}  {rec['amount']:>10.2f}  {str(category):<12} {rule or '-':<18} {rec['description']}")
+
+    print(f"\n--- {count} records ({ruleset} rules) ---")
+    for category, total in sorted(totals.items(), key=lambda x: x[1]):
+        print(f"{category:<35} : ${total:,.2f}")
+
+if __name__ == "__main__":
+    main()
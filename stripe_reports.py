@@ -0,0 +1,217 @@
+import os
+import re
+import sys
+import glob
+import json
+from concurrent.futures import ProcessPoolExecutor
+import date_parsing
+from transaction_store import file_sha1
+
+# Stripe "Balance" report PDFs (Dashboard -> Reports -> Balance -> Download PDF)
+# turned into typed rows:
+#
+#   {"period_start": "2024-07-01", "period_end": "2025-06-30", "type": "charge",
+#    "count": 1086, "gross": 71463.34, "fee": -1570.1, "tax": 0.0, "net": 69893.24}
+#
+# plus the balance summary (starting/ending balance, fees, payouts). Pages are
+# extracted in a process pool and joined once; parsed reports are cached per
+# PDF SHA1 in .stripe_reports.json, so later runs never open the PDFs.
+#
+#   python stripe_reports.py            -> every "Balance*Stripe*.pdf"
+#   python stripe_reports.py --text     -> raw page text too
+
+REPORT_FILES = "Balance*Stripe*.pdf"
+CACHE_FILE = ".stripe_reports.json"
+CACHE_VERSION = 1
+
+TYPE_NAMES = {
+    "charges": "charge",
+    "refunds": "refund",
+    "disputes": "dispute",
+    "additional stripe fees": "stripe_fee",
+    "other adjustments": "adjustment",
+    "payouts": "payout",
+}
+SUMMARY_FIELDS = {
+    "starting_balance": r'Starting balance – .*? UTC (-?\$[\d,.]+)',
+    "activity_before_fees": r'Account activity before fees (-?\$[\d,.]+)',
+    "fees": r'Less fees (-?\$[\d,.]+)',
+    "net_activity": r'Net balance change from activity (-?\$[\d,.]+)',
+    "payouts": r'Total payouts (-?\$[\d,.]+)',
+    "ending_balance": r'Ending balance – .*? UTC (-?\$[\d,.]+)',
+}
+PERIOD_RE = re.compile(r'from (\d{1,2} \w+ \d{4})\s*[–-]\s*(\d{1,2} \w+ \d{4})')
+COUNT_RE = re.compile(r'^(.+?) Count ([\d,]+)$')
+METRIC_RE = re.compile(r'^(Gross amount|Fees|Tax) (-?\$[\d,.]+)$')
+# Browser print footer on every page
+FOOTER_RE = re.compile(r'^(\d{1,2}/\d{1,2}/\d{2}, .*(AM|PM) .*|https://dashboard\.stripe\.com/.*)$')
+LONG_DATE_FORMATS = ['%d %B %Y', '%d %b %Y']
+
+_readers = {}
+
+
+def pdf_reader(path):
+    # One reader per PDF per worker process
+    if path not in _readers:
+        try:
+            from pypdf import PdfReader
+        except ImportError:
+            from PyPDF2 import PdfReader
+        _readers[path] = PdfReader(path)
+    return _readers[path]
+
+def page_count(path):
+    return len(pdf_reader(path).pages)
+
+def page_text(args):
+    path, page_no = args
+    return pdf_reader(path).pages[page_no].extract_text() or ""
+
+def extract_pages(paths, workers=None):
+    # {path: [page text, ...]} with every page of every PDF in one pool
+    jobs = [(path, i) for path in paths for i in range(page_count(path))]
+    texts = {path: [] for path in paths}
+    if len(jobs) <= 1:
+        results = map(page_text, jobs)
+        for (path, _), text in zip(jobs, results):
+            texts[path].append(text)
+        return texts
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for (path, _), text in zip(jobs, executor.map(page_text, jobs)):
+            texts[path].append(text)
+    return texts
+
+def money(text):
+    return float(text.replace('$', '').replace(',', ''))
+
+def clean_lines(pages):
+    lines = []
+    for page in pages:
+        lines.extend(l.strip() for l in page.splitlines() if l.strip() and not FOOTER_RE.match(l.strip()))
+    text = "\n".join(lines)
+    # The PDF wraps long amounts mid-number: "-$67,723.9\n4"
+    return re.sub(r'(\$[\d,]+\.\d)\n(\d)\b', r'\1\2', text)
+
+def parse_report(pages):
+    text = clean_lines(pages)
+    report = {"period_start": None, "period_end": None, "summary": {}, "rows": []}
+
+    m = PERIOD_RE.search(text)
+    if m:
+        start = date_parsing.parse_date(m.group(1), LONG_DATE_FORMATS)
+        end = date_parsing.parse_date(m.group(2), LONG_DATE_FORMATS)
+        report["period_start"] = start.isoformat() if start else None
+        report["period_end"] = end.isoformat() if end else None
+    for field, pattern in SUMMARY_FIELDS.items():
+        m = re.search(pattern, text)
+        if m:
+            report["summary"][field] = money(m.group(1))
+
+    lines = text.split("\n")
+    current = None
+    for i, line in enumerate(lines):
+        m = COUNT_RE.match(line)
+        if m:
+            name = m.group(1)
+            if name[0].islower() and i > 0:
+                # "Additional Stripe" / "fees Count 772"
+                name = f"{lines[i - 1]} {name}"
+            current = {
+                "period_start": report["period_start"],
+                "period_end": report["period_end"],
+                "type": TYPE_NAMES.get(name.lower(), re.sub(r'\W+', '_', name.lower()).strip('_')),
+                "count": int(m.group(2).replace(',', '')),
+                "gross": 0.0, "fee": 0.0, "tax": 0.0,
+            }
+            report["rows"].append(current)
+            continue
+        m = METRIC_RE.match(line)
+        if m and current is not None:
+            field = {"Gross amount": "gross", "Fees": "fee", "Tax": "tax"}[m.group(1)]
+            current[field] = money(m.group(2))
+        elif current is not None:
+            current = None
+    for row in report["rows"]:
+        row["net"] = round(row["gross"] + row["fee"] + row["tax"], 2)
+    return report
+
+
+def load_cache(path=CACHE_FILE):
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    return {"version": CACHE_VERSION, "reports": {}}
+
+def save_cache(cache, path=CACHE_FILE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=1)
+    os.replace(tmp_path, path)
+
+def load_reports(paths=None, workers=None, keep_text=False):
+    # {pdf name: report}; only PDFs whose SHA1 is not cached are opened
+    every = paths is None
+    paths = sorted(glob.glob(REPORT_FILES)) if every else paths
+    cache = load_cache()
+    hashes = {path: file_sha1(path) for path in paths}
+    stale = [p for p in paths if hashes[p] not in cache["reports"]
+             or (keep_text and "pages" not in cache["reports"][hashes[p]])]
+    if stale:
+        for path, pages in extract_pages(stale, workers).items():
+            report = parse_report(pages)
+            if keep_text:
+                report["pages"] = pages
+            cache["reports"][hashes[path]] = report
+    # Forget PDFs that are gone or changed; an explicit subset says nothing about the rest
+    gone = set(cache["reports"]) - set(hashes.values()) if every else set()
+    for h in gone:
+        del cache["reports"][h]
+    if stale or gone:
+        save_cache(cache)
+    return {os.path.basename(p): cache["reports"][hashes[p]] for p in paths}
+
+def bank_stripe_credits(start, end):
+    # Cross-check: what actually arrived in the bank from Stripe in the period
+    import transaction_store
+    store = transaction_store.TransactionStore()
+    store.refresh(verbose=False)
+    rows = store.query(start, end, where="amount_cents > 0 AND UPPER(details) LIKE '%STRIPE%'")
+    first, last, _ = store.date_range()
+    store.close()
+    covered = bool(first) and first <= start and end <= last
+    return sum(r["amount_cents"] for r in rows) / 100, len(rows), covered
+
+def main():
+    show_text = "--text" in sys.argv
+    paths = [a for a in sys.argv[1:] if not a.startswith("--")] or None
+    reports = load_reports(paths, keep_text=show_text)
+    if not reports:
+        print(f"No Stripe balance reports found ({REPORT_FILES}).")
+        return
+
+    for name, report in reports.items():
+        print(f"\n=== {name} ===")
+        print(f"Period: {report['period_start']} to {report['period_end']}")
+        if show_text:
+            print("\n".join(report.get("pages", [])))
+        print(f"{'Type':<14} {'Count':>6} {'Gross':>12} {'Fee':>10} {'Tax':>8} {'Net':>12}")
+        for row in report["rows"]:
+            print(f"{row['type']:<14} {row['count']:>6} {row['gross']:>12,.2f} {row['fee']:>10,.2f} "
+                  f"{row['tax']:>8,.2f} {row['net']:>12,.2f}")
+
+        summary = report["summary"]
+        activity = round(sum(r["net"] for r in report["rows"] if r["type"] != "payout"), 2)
+        if "net_activity" in summary and abs(activity - summary["net_activity"]) > 0.005:
+            print(f"[!] Rows add up to ${activity:,.2f}, summary says ${summary['net_activity']:,.2f}")
+        for field, value in summary.items():
+            print(f"  {field:<22} ${value:,.2f}")
+
+        if report["period_start"] and report["period_end"]:
+            total, count, covered = bank_stripe_credits(report["period_start"], report["period_end"])
+            note = "" if covered else " (bank exports only cover part of this period)"
+            print(f"  {'bank STRIPE credits':<22} ${total:,.2f} in {count} lines{note}")
+
+if __name__ == "__main__":
+    main()
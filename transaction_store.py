@@ -0,0 +1,317 @@
+import os
+import re
+import csv
+import glob
+import sqlite3
+import hashlib
+from datetime import datetime, date
+import date_parsing
+
+DB_FILE = ".transactions.sqlite"
+BANK_FILES = "Transactions*.csv"
+META_INVOICE_FILES = "meta_invoices*.csv"
+META_CAMPAIGN_FILES = "*-Campaigns-*.csv"
+SCHEMA_VERSION = 2
+
+# One SQLite cache for every finance script. Each export is parsed once; the
+# `sources` table remembers the SHA1 of every file that fed a table, and a
+# table is only rebuilt when that set of hashes changes. Amounts are stored as
+# integer cents and dates as ISO text plus a day ordinal, so period reports are
+# plain indexed SQL instead of re-parsing CSVs.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    sha1 TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    loaded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,            -- 'bank' / 'meta'
+    file TEXT NOT NULL,
+    account TEXT,
+    date TEXT NOT NULL,              -- YYYY-MM-DD
+    day INTEGER NOT NULL,            -- date.toordinal(), for range scans
+    amount_cents INTEGER NOT NULL,   -- negative = money out
+    txn_type TEXT,
+    details TEXT,
+    balance_cents INTEGER,
+    category TEXT,
+    merchant TEXT,
+    raw_date TEXT,
+    txn_key TEXT NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS transactions_day ON transactions (source, day);
+CREATE TABLE IF NOT EXISTS campaigns (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,            -- 'meta_campaigns'
+    file TEXT NOT NULL,
+    start_day INTEGER NOT NULL,      -- reporting window, date.toordinal()
+    end_day INTEGER NOT NULL,
+    campaign TEXT NOT NULL,
+    delivery TEXT,
+    spend_cents INTEGER NOT NULL,
+    results INTEGER,
+    reach INTEGER,
+    impressions INTEGER,
+    link_clicks INTEGER,
+    txn_key TEXT NOT NULL UNIQUE
+);
+CREATE INDEX IF NOT EXISTS campaigns_day ON campaigns (start_day, end_day);
+"""
+
+
+def file_sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def parse_cents(amount_str):
+    if not amount_str or not amount_str.strip():
+        return None
+    clean = amount_str.replace('$', '').replace(',', '').strip()
+    try:
+        return round(float(clean) * 100)
+    except ValueError:
+        return None
+
+def to_day(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.toordinal()
+    return date_parsing.parse_date(value).toordinal()
+
+def read_bank_csv(path):
+    # NAB export: Date,Amount,Account Number,,Transaction Type,Transaction Details,Balance,Category,Merchant Name
+    # -> (rows, problems); problems are (line number, message) for rows that were dropped
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        raw = [row for row in reader if row]
+    if not header:
+        return [], []
+
+    rows, problems = [], []
+    # The date column is parsed in one go with a format inferred from a sample
+    days, bad_dates, _ = date_parsing.parse_column([row[0] for row in raw])
+    bad_lines = {i for i, _ in bad_dates}
+    for i, (row, day) in enumerate(zip(raw, days)):
+        line_no = i + 2
+        if len(row) < 6:
+            problems.append((line_no, f"only {len(row)} columns"))
+            continue
+        if i in bad_lines:
+            problems.append((line_no, f"unparseable date {row[0]!r}"))
+            continue
+        cents = parse_cents(row[1])
+        if day is None or cents is None:
+            problems.append((line_no, f"missing date or amount {row[:2]!r}"))
+            continue
+        balance = parse_cents(row[6]) if len(row) > 6 else None
+        account = row[2].strip()
+        details = row[5].strip()
+        key = f"bank|{account}|{day.isoformat()}|{cents}|{balance}|{details}"
+        rows.append({
+            "source": "bank",
+            "file": os.path.basename(path),
+            "account": account,
+            "date": day.isoformat(),
+            "day": day.toordinal(),
+            "amount_cents": cents,
+            "txn_type": row[4].strip(),
+            "details": details,
+            "balance_cents": balance,
+            "category": row[7].strip() if len(row) > 7 else "",
+            "merchant": row[8].strip() if len(row) > 8 else "",
+            "raw_date": row[0].strip(),
+            "txn_key": key,
+        })
+    return rows, problems
+
+def parse_int(value):
+    value = (value or "").replace(',', '').strip()
+    return int(float(value)) if re.fullmatch(r'-?\d+(\.\d+)?', value) else None
+
+def read_meta_invoices_csv(path):
+    # Meta billing export: Date,Transaction ID,Payment method,Amount,Currency
+    # Stored as money out on the card; Transaction ID is the dedup key, so
+    # overlapping monthly downloads can all sit in the folder.
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        raw = list(csv.DictReader(f))
+    days, bad_dates, _ = date_parsing.parse_column([r.get('Date') or "" for r in raw], "%d/%m/%Y")
+    bad = {i for i, _ in bad_dates}
+
+    rows, problems = [], []
+    for i, (r, day) in enumerate(zip(raw, days)):
+        line_no = i + 2
+        cents = parse_cents(r.get('Amount'))
+        txn_id = (r.get('Transaction ID') or "").strip()
+        if i in bad or day is None or cents is None or not txn_id:
+            problems.append((line_no, f"unusable invoice row {list(r.values())[:4]!r}"))
+            continue
+        rows.append({
+            "source": "meta",
+            "file": os.path.basename(path),
+            "account": (r.get('Payment method') or "").strip(),
+            "date": day.isoformat(),
+            "day": day.toordinal(),
+            "amount_cents": -cents,
+            "txn_type": f"Meta Ads invoice {(r.get('Currency') or '').strip()}".strip(),
+            "details": txn_id,
+            "balance_cents": None,
+            "category": "Advertising",
+            "merchant": "Meta",
+            "raw_date": r['Date'].strip(),
+            "txn_key": f"meta|{txn_id}",
+        })
+    return rows, problems
+
+def read_meta_campaigns_csv(path):
+    # Ads Manager campaign export: one row per campaign for a reporting window
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        raw = list(csv.DictReader(f))
+    if not raw:
+        return [], []
+    spend_col = next((k for k in raw[0] if k.startswith('Amount spent')), None)
+    starts, bad_starts, _ = date_parsing.parse_column([r.get('Reporting starts') or "" for r in raw], "%Y-%m-%d")
+    ends, bad_ends, _ = date_parsing.parse_column([r.get('Reporting ends') or "" for r in raw], "%Y-%m-%d")
+
+    rows, problems = [], []
+    for i, (r, start, end) in enumerate(zip(raw, starts, ends)):
+        line_no = i + 2
+        cents = parse_cents(r.get(spend_col)) if spend_col else None
+        campaign = (r.get('Campaign name') or "").strip()
+        if start is None or end is None or cents is None or not campaign:
+            problems.append((line_no, f"unusable campaign row {campaign!r}"))
+            continue
+        rows.append({
+            "source": "meta_campaigns",
+            "file": os.path.basename(path),
+            "start_day": start.toordinal(),
+            "end_day": end.toordinal(),
+            "campaign": campaign,
+            "delivery": (r.get('Campaign delivery') or "").strip(),
+            "spend_cents": cents,
+            "results": parse_int(r.get('Results')),
+            "reach": parse_int(r.get('Reach')),
+            "impressions": parse_int(r.get('Impressions')),
+            "link_clicks": parse_int(r.get('Link clicks')),
+            "txn_key": f"campaign|{start.isoformat()}|{end.isoformat()}|{campaign}",
+        })
+    return rows, problems
+
+class TransactionStore:
+    # kind -> (glob pattern, reader, table). Readers return (rows, problems).
+    SOURCES = {
+        "bank": (BANK_FILES, read_bank_csv, "transactions"),
+        "meta": (META_INVOICE_FILES, read_meta_invoices_csv, "transactions"),
+        "meta_campaigns": (META_CAMPAIGN_FILES, read_meta_campaigns_csv, "campaigns"),
+    }
+
+    def __init__(self, db_path=DB_FILE, root="."):
+        self.db_path = db_path
+        self.root = root
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        version = self.conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        if version is None or int(version[0]) != SCHEMA_VERSION:
+            self.conn.executescript("DELETE FROM sources; DELETE FROM transactions; DELETE FROM campaigns;")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+            self.conn.commit()
+
+    def source_files(self, kind):
+        pattern = self.SOURCES[kind][0]
+        return sorted(glob.glob(os.path.join(self.root, pattern)))
+
+    def refresh(self, kinds=None, verbose=True):
+        # Rebuild a kind only when its set of file hashes changed. Rebuilding
+        # the whole kind (not one file) keeps cross-file dedup correct.
+        rebuilt = []
+        for kind in kinds or self.SOURCES:
+            files = self.source_files(kind)
+            current = {os.path.basename(p): file_sha1(p) for p in files}
+            cached = {r["path"]: r["sha1"] for r in
+                      self.conn.execute("SELECT path, sha1 FROM sources WHERE kind = ?", (kind,))}
+            if current == cached:
+                continue
+            self.rebuild(kind, files, current, verbose)
+            rebuilt.append(kind)
+        return rebuilt
+
+    def rebuild(self, kind, files, hashes, verbose=True):
+        _, reader, table = self.SOURCES[kind]
+        with self.conn:
+            self.conn.execute(f"DELETE FROM {table} WHERE source = ?", (kind,))
+            self.conn.execute("DELETE FROM sources WHERE kind = ?", (kind,))
+            for path in files:
+                rows, problems = reader(path)
+                before = self.conn.total_changes
+                if rows:
+                    columns = list(rows[0])
+                    self.conn.executemany(
+                        f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) "
+                        f"VALUES ({', '.join(':' + c for c in columns)})", rows)
+                added = self.conn.total_changes - before
+                name = os.path.basename(path)
+                self.conn.execute("INSERT INTO sources VALUES (?, ?, ?, ?, ?)",
+                                  (name, kind, hashes[name], added, datetime.now().isoformat()))
+                if verbose:
+                    print(f"  -> Loaded {name}: {len(rows)} rows, {added} new after dedup")
+                # Dropped rows are always reported - a silent gap would skew every total
+                for line_no, message in problems:
+                    print(f"  [!] {name} line {line_no}: {message}")
+
+    def query(self, start=None, end=None, source="bank", where="", params=(), order="day, id"):
+        # Rows in [start, end] (dates, datetimes or strings), oldest first;
+        # order="id" gives export file / line order instead
+        sql = "SELECT * FROM transactions WHERE source = ?"
+        args = [source]
+        if start is not None:
+            sql += " AND day >= ?"
+            args.append(to_day(start))
+        if end is not None:
+            sql += " AND day <= ?"
+            args.append(to_day(end))
+        if where:
+            sql += " AND " + where
+            args.extend(params)
+        sql += " ORDER BY " + order
+        return self.conn.execute(sql, args).fetchall()
+
+    def date_range(self, source="bank"):
+        row = self.conn.execute("SELECT MIN(date), MAX(date), COUNT(*) FROM transactions WHERE source = ?",
+                                (source,)).fetchone()
+        return row[0], row[1], row[2]
+
+    def close(self):
+        self.conn.close()
+
+def load_transactions(start=None, end=None, source="bank", order="day, id"):
+    # Drop-in for the per-script loaders: list of dicts with datetime dates and float amounts
+    store = TransactionStore()
+    store.refresh()
+    rows = store.query(start, end, source, order=order)
+    store.close()
+    return [{
+        "date": datetime.fromisoformat(r["date"]),
+        "amount": r["amount_cents"] / 100,
+        "details": r["details"],
+        "original_date": r["raw_date"],
+        "balance": r["balance_cents"] / 100 if r["balance_cents"] is not None else None,
+        "merchant": r["merchant"],
+        "category": r["category"],
+        "txn_type": r["txn_type"],
+        "account": r["account"],
+    } for r in rows]
+
+if __name__ == "__main__":
+    store = TransactionStore()
+    rebuilt = store.refresh()
+    first, last, count = store.date_range()
+    print(f"{count} bank transactions from {first} to {last}" + (f" (rebuilt: {', '.join(rebuilt)})" if rebuilt else ""))
+    first, last, count = store.date_range("meta")
+    print(f"{count} Meta Ads invoices from {first} to {last}")
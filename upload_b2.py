@@ -2,7 +2,13 @@ import os
 import sys
 import json
 import time
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from b2sdk.v2 import *
+import video_manifest
+from video_catalog import VideoCatalog, SourceWriter
+from video_manifest import file_sha1
 
 KEY_ID = "0055c4034c6a45e0000000001"
 APP_KEY = "K005rPzmGgPJnFwNycp12DCxs24Eer4"
@@ -10,41 +16,239 @@ BUCKET_NAME = "shannonsvideos"
 LOCAL_FOLDER = r"C:\Users\shann\Downloads\Trainerize_Videos"
 OUTPUT_JS = "exercise_videos.js"
 LOG_FILE = "upload_log.txt"
+JOURNAL_FILE = "upload_journal.jsonl"
+
+# Concurrency settings
+UPLOAD_WORKERS = 8          # files uploaded at once
+PART_WORKERS = 4            # parallel parts per large file (b2sdk thread pool)
+LARGE_FILE_THRESHOLD = 100 * 1024 * 1024   # stream anything bigger as multipart
+PART_SIZE = 25 * 1024 * 1024
+
+log_lock = threading.Lock()
 
 
 def log(msg):
-    try:
-        print(msg)
-    except UnicodeEncodeError:
-        print(msg.encode('ascii', 'replace').decode('ascii'))
-    
-    with open(LOG_FILE, 'a', encoding='utf-8') as f:
-        f.write(msg + "\n")
-
-def load_existing_map():
-    if not os.path.exists(OUTPUT_JS):
-        return {}
-    try:
-        with open(OUTPUT_JS, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # extract JSON part
-            if "const EXERCISE_VIDEOS = " in content:
-                json_str = content.replace("const EXERCISE_VIDEOS = ", "").rstrip(";")
-                return json.loads(json_str)
-    except Exception as e:
-        log(f"Error loading existing JS: {e}")
-    return {}
+    with log_lock:
+        try:
+            print(msg)
+        except UnicodeEncodeError:
+            print(msg.encode('ascii', 'replace').decode('ascii'))
+
+        with open(LOG_FILE, 'a', encoding='utf-8') as f:
+            f.write(msg + "\n")
+
+
+class UploadJournal:
+    # Append-only record of finished uploads: one JSON object per line.
+    # A file counts as done when its name, size and mtime match the journal,
+    # so restarts never need to re-list the bucket.
+
+    def __init__(self, path=JOURNAL_FILE):
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn last line from a crash - ignore it, the file re-uploads
+                    continue
+                self.entries[entry['name']] = entry
+
+    def is_done(self, name, size, mtime):
+        entry = self.entries.get(name)
+        return entry is not None and entry['size'] == size and entry['mtime'] == mtime
+
+    def record(self, name, size, mtime, sha1, url):
+        entry = {"name": name, "size": size, "mtime": mtime, "sha1": sha1, "url": url}
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self.entries[name] = entry
+
+
+class Progress:
+    def __init__(self, total_files, total_bytes):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.done_files = 0
+        self.done_bytes = 0
+        self.failed = 0
+        self.started = time.time()
+        self.lock = threading.Lock()
+
+    def update(self, size, ok=True):
+        with self.lock:
+            self.done_files += 1
+            if ok:
+                self.done_bytes += size
+            else:
+                self.failed += 1
+            return self.report()
+
+    def report(self):
+        elapsed = max(time.time() - self.started, 0.001)
+        rate = self.done_bytes / elapsed
+        remaining = self.total_bytes - self.done_bytes
+        eta = remaining / rate if rate > 0 else 0
+        return (f"Progress: {self.done_files}/{self.total_files} files, "
+                f"{self.done_bytes / 1e6:.1f}/{self.total_bytes / 1e6:.1f} MB, "
+                f"{rate / 1e6:.2f} MB/s, ETA {int(eta // 60)}m{int(eta % 60):02d}s, "
+                f"{self.failed} failed")
+
+
+def public_url_for(download_url, filename):
+    # B2 friendly URL
+    return f"{download_url}/file/{BUCKET_NAME}/{urllib.parse.quote(filename)}"
+
+def upload_one(bucket, local_path, filename, size, sha1=None):
+    sha1 = sha1 or file_sha1(local_path)
+    if size > LARGE_FILE_THRESHOLD:
+        # b2sdk splits this into parts and streams them with PART_WORKERS threads
+        file_version = bucket.upload_local_file(local_path, filename, sha1_sum=sha1, min_part_size=PART_SIZE)
+    else:
+        file_version = bucket.upload_local_file(local_path, filename, sha1_sum=sha1)
+    return sha1, file_version.id_
+
+def seed_journal_from_bucket(bucket, journal, local_stats, download_url):
+    # One-off migration: trust files already in B2 from before the journal existed
+    log("Listing existing B2 files to seed journal...")
+    count = 0
+    for file_version, _ in bucket.ls():
+        count += 1
+        name = file_version.file_name
+        stat = local_stats.get(name)
+        if stat and not journal.is_done(name, stat.st_size, int(stat.st_mtime)):
+            if file_version.size == stat.st_size:
+                journal.record(name, stat.st_size, int(stat.st_mtime),
+                               file_version.content_sha1, public_url_for(download_url, name))
+        if count % 500 == 0:
+            log(f"Listed {count} files...")
+    log(f"Seeded journal from {count} bucket files.")
+
+def remote_sha1(file_version):
+    # Large files have content_sha1 "none"; b2sdk stores the real hash in file info
+    sha1 = file_version.content_sha1
+    if not sha1 or sha1 == "none":
+        sha1 = (file_version.file_info or {}).get('large_file_sha1', '')
+    return sha1.replace("unverified:", "")
+
+def build_remote_manifest(bucket):
+    log("Listing B2 files for remote manifest...")
+    manifest = {}
+    for file_version, _ in bucket.ls():
+        manifest[file_version.file_name] = {
+            "size": file_version.size,
+            "sha1": remote_sha1(file_version),
+            "file_id": file_version.id_,
+        }
+        if len(manifest) % 500 == 0:
+            log(f"Listed {len(manifest)} files...")
+    return manifest
+
+def sync(bucket, download_url, video_map, relist=False, prune=False):
+    # Incremental sync: diff the local folder against the last-synced remote
+    # manifest and only transfer the delta. bucket.ls() is only needed when
+    # there is no cached manifest yet (or --relist).
+    cached_local = video_manifest.load_manifest(video_manifest.LOCAL_MANIFEST_FILE)
+    local, hashed = video_manifest.build_local_manifest(LOCAL_FOLDER, cached_local)
+    video_manifest.save_manifest(video_manifest.LOCAL_MANIFEST_FILE, local)
+    log(f"Local manifest: {len(local)} files ({hashed} re-hashed).")
+
+    remote = None if relist else video_manifest.load_manifest(video_manifest.REMOTE_MANIFEST_FILE)
+    if remote is None:
+        remote = build_remote_manifest(bucket)
+        video_manifest.save_manifest(video_manifest.REMOTE_MANIFEST_FILE, remote)
+    log(f"Remote manifest: {len(remote)} files.")
 
-def save_map(video_map):
-    js_content = "const EXERCISE_VIDEOS = " + json.dumps(video_map, indent=2) + ";"
-    with open(OUTPUT_JS, 'w', encoding='utf-8') as f:
-        f.write(js_content)
+    diff = video_manifest.diff_manifests(local, remote)
+    log(f"Diff: {video_manifest.summarize(diff)}")
+
+    def point_map(filename, remote_name):
+        video_map.set(os.path.splitext(filename)[0], public_url_for(download_url, remote_name))
+
+    def unpoint_map(remote_name):
+        # Only while the key still points at this object; any local file that
+        # shares the key points it somewhere else again below
+        key = os.path.splitext(remote_name)[0]
+        if video_map.get(key) == public_url_for(download_url, remote_name):
+            video_map.delete(key)
+
+    # Renames are server-side copies, no bytes leave this machine
+    for old_name, new_name in diff["renamed"]:
+        try:
+            old = remote[old_name]
+            copied = bucket.copy(old['file_id'], new_name)
+            remote[new_name] = {"size": old['size'], "sha1": old['sha1'], "file_id": copied.id_}
+            unpoint_map(old_name)
+            point_map(new_name, new_name)
+            diff["deleted"].append(old_name)
+            log(f"Renamed {old_name} -> {new_name}")
+        except Exception as e:
+            log(f"Failed to rename {old_name} -> {new_name}: {e}")
+
+    # Duplicate content just points at the object already stored
+    for name, existing in diff["dedup"]:
+        point_map(name, existing)
+
+    for name in diff["unchanged"]:
+        point_map(name, name)
+
+    pending = diff["new"] + diff["changed"]
+    progress = Progress(len(pending), sum(local[name]['size'] for name in pending))
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        futures = {}
+        for name in pending:
+            entry = local[name]
+            local_path = os.path.join(LOCAL_FOLDER, name)
+            futures[executor.submit(upload_one, bucket, local_path, name, entry['size'], entry['sha1'])] = name
+
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                _, file_id = future.result()
+            except Exception as e:
+                log(f"Failed to upload {name}: {e}")
+                log(progress.update(local[name]['size'], ok=False))
+                continue
+            remote[name] = {"size": local[name]['size'], "sha1": local[name]['sha1'], "file_id": file_id}
+            point_map(name, name)
+            log(progress.update(local[name]['size']))
+
+    if prune:
+        for name in diff["deleted"]:
+            try:
+                bucket.hide_file(name)
+                remote.pop(name, None)
+                unpoint_map(name)
+                log(f"Hid {name}")
+            except Exception as e:
+                log(f"Failed to hide {name}: {e}")
+    elif diff["deleted"]:
+        log(f"{len(diff['deleted'])} remote files have no local copy (run with --prune to hide them).")
+
+    video_manifest.save_manifest(video_manifest.REMOTE_MANIFEST_FILE, remote)
+    video_map.close()
+    log("Incremental sync complete.")
 
 def main():
+    relist = "--relist" in sys.argv
+
     log("Initializing B2 Upload Process...")
     info = InMemoryAccountInfo()
-    b2_api = B2Api(info)
-    
+    b2_api = B2Api(info, max_upload_workers=UPLOAD_WORKERS * PART_WORKERS)
+
     log("Authenticating...")
     try:
         b2_api.authorize_account("production", KEY_ID, APP_KEY)
@@ -54,71 +258,83 @@ def main():
         log(f"Auth Failed: {e}")
         return
 
-    # Load current map to preserve data
-    video_map = load_existing_map()
-    log(f"Loaded {len(video_map)} existing entries in JS map.")
+    # B2 URLs go into the catalog's "b2" source; the JS file is regenerated
+    # from the catalog at the end, so Drive entries are never overwritten
+    video_map = SourceWriter(VideoCatalog(), "b2", OUTPUT_JS)
+    log(f"Loaded {len(video_map.videos)} existing B2 entries from the catalog.")
 
-    # 1. List B2 Files (to skip uploads)
-    log("Listing existing B2 files...")
-    b2_files = set()
     download_url = b2_api.account_info.get_download_url()
-    
-    # We might have thousands, B2 ls yields generators
-    count = 0
-    for file_version, _ in bucket.ls():
-        b2_files.add(file_version.file_name)
-        count += 1
-        if count % 500 == 0:
-            log(f"Listed {count} files...")
-    
-    log(f"Found {len(b2_files)} existing files in bucket.")
+    if "--sync" in sys.argv:
+        if not os.path.exists(LOCAL_FOLDER):
+            log(f"Error: Local {LOCAL_FOLDER} not found.")
+            return
+        sync(bucket, download_url, video_map, relist=relist, prune="--prune" in sys.argv)
+        return
 
-    # 2. List Local Files
+    journal = UploadJournal()
+    log(f"Loaded {len(journal.entries)} completed uploads from {JOURNAL_FILE}.")
+
+    # 1. List Local Files
     if not os.path.exists(LOCAL_FOLDER):
         log(f"Error: Local {LOCAL_FOLDER} not found.")
         return
-        
-    local_files = [f for f in os.listdir(LOCAL_FOLDER) if f.lower().endswith(('.mp4', '.mov'))]
-    log(f"Found {len(local_files)} local videos to process.")
 
-    # 3. Process
+    local_stats = {}
+    for entry in os.scandir(LOCAL_FOLDER):
+        if entry.is_file() and entry.name.lower().endswith(('.mp4', '.mov')):
+            local_stats[entry.name] = entry.stat()
+    log(f"Found {len(local_stats)} local videos to process.")
+
+    # 2. Only hit the bucket listing on first run or when asked to
+    if relist or not journal.entries:
+        seed_journal_from_bucket(bucket, journal, local_stats, download_url)
+
+    # 3. Work out what is left
     updates = 0
-    for i, filename in enumerate(local_files):
+    pending = []
+    for filename, stat in sorted(local_stats.items()):
         key_name = os.path.splitext(filename)[0]
-        
-        # B2 friendly URL
-        import urllib.parse
-        safe_filename = urllib.parse.quote(filename)
-        public_url = f"{download_url}/file/{BUCKET_NAME}/{safe_filename}"
-        
-        # If already in B2
-        if filename in b2_files:
-            # Update map if needed
-            if video_map.get(key_name) != public_url:
-                video_map[key_name] = public_url
+        if journal.is_done(filename, stat.st_size, int(stat.st_mtime)):
+            url = journal.entries[filename]['url']
+            if video_map.get(key_name) != url:
+                video_map.set(key_name, url)
                 updates += 1
         else:
-            # Upload
-            log(f"Uploading {i+1}/{len(local_files)}: {filename}...")
+            pending.append((filename, stat))
+
+    if updates:
+        log(f"Restored {updates} map entries from journal.")
+
+    progress = Progress(len(pending), sum(stat.st_size for _, stat in pending))
+    log(f"{len(pending)} videos to upload ({progress.total_bytes / 1e6:.1f} MB) "
+        f"with {UPLOAD_WORKERS} workers.")
+
+    # 4. Upload with a bounded worker pool
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        futures = {}
+        for filename, stat in pending:
+            local_path = os.path.join(LOCAL_FOLDER, filename)
+            future = executor.submit(upload_one, bucket, local_path, filename, stat.st_size)
+            futures[future] = (filename, stat)
+
+        for future in as_completed(futures):
+            filename, stat = futures[future]
+            key_name = os.path.splitext(filename)[0]
             try:
-                local_path = os.path.join(LOCAL_FOLDER, filename)
-                bucket.upload_local_file(local_path, filename)
-                
-                # Update map
-                video_map[key_name] = public_url
-                updates += 1
-                b2_files.add(filename) # Mark as done
-                
-                # Save periodically
-                if updates % 5 == 0:
-                    save_map(video_map)
-                    log(f"Saved progress ({updates} updates)")
-                    
+                sha1, _ = future.result()
             except Exception as e:
                 log(f"Failed to upload {filename}: {e}")
+                log(progress.update(stat.st_size, ok=False))
+                continue
+
+            url = public_url_for(download_url, filename)
+            journal.record(filename, stat.st_size, int(stat.st_mtime), sha1, url)
+            video_map.set(key_name, url)
+            log(f"Uploaded {filename}")
+            log(progress.update(stat.st_size))
 
     # Final save
-    save_map(video_map)
+    video_map.close()
     log("Sync Complete. JS file updated.")
 
 if __name__ == "__main__":
@@ -1,78 +1,185 @@
 import json
-import requests
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+import random
+import asyncio
+import aiohttp
+from video_map_store import VideoMapStore
+from video_catalog import VideoCatalog
 
-INPUT_FILE = "exercise_videos.js"
-OUTPUT_FILE = "exercise_videos.js"
+VIDEOS_FILE = "exercise_videos.js"
+CACHE_FILE = "video_check_cache.json"
 
-def load_videos():
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        content = f.read()
-        if "const EXERCISE_VIDEOS = " in content:
-            json_str = content.replace("const EXERCISE_VIDEOS = ", "").rstrip(";")
-            return json.loads(json_str)
-    return {}
+CACHE_TTL = 24 * 60 * 60     # seconds before a cached result is re-checked
+MAX_CONNECTIONS = 64         # total open keep-alive connections
+PER_HOST_LIMIT = 16          # B2 / Drive throttle hard above this
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5           # seconds, doubled each retry
+CONNECT_TIMEOUT = 10         # per socket connect / read, not time queued for a connection
+READ_TIMEOUT = 10
 
-def check_url(item):
-    name, url = item
+# Statuses worth retrying - anything else is a definite answer
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+def load_cache(path=CACHE_FILE):
+    if not os.path.exists(path):
+        return {}
     try:
-        # Just check headers, don't download the whole video
-        response = requests.head(url, timeout=10, allow_redirects=True)
-        if response.status_code == 200:
-            return (name, url, True)
-        else:
-            print(f"❌ BROKEN ({response.status_code}): {name}")
-            return (name, url, False)
-    except Exception as e:
-        print(f"❌ ERROR: {name} - {e}")
-        return (name, url, False)
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except ValueError:
+        print(f"Ignoring unreadable cache {path}")
+        return {}
+
+def save_cache(cache, path=CACHE_FILE):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def is_fresh(entry, now, ttl):
+    # Only good results are cached; broken and unknown (timeouts, connection
+    # errors) are re-checked every run, so a video that comes back is seen
+    return entry is not None and entry.get('ok') and now - entry.get('checked_at', 0) < ttl
+
+async def check_url(session, name, url, cached=None):
+    # Conditional HEAD: a 304 means the object is still there and unchanged
+    headers = {}
+    if cached and cached.get('ok'):
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    entry = {"ok": False, "status": None, "error": None}
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with session.head(url, headers=headers, allow_redirects=True) as response:
+                entry['status'] = response.status
+                entry['error'] = None
+                if response.status == 304:
+                    entry['ok'] = True
+                    entry['etag'] = cached.get('etag')
+                    entry['last_modified'] = cached.get('last_modified')
+                    break
+                if response.status == 200:
+                    entry['ok'] = True
+                    entry['etag'] = response.headers.get('ETag')
+                    entry['last_modified'] = response.headers.get('Last-Modified')
+                    break
+                if response.status not in RETRY_STATUSES:
+                    break
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            entry['error'] = str(e) or type(e).__name__
+
+        if attempt < MAX_RETRIES:
+            await asyncio.sleep(BACKOFF_BASE * (2 ** attempt) + random.uniform(0, BACKOFF_BASE))
+
+    entry['checked_at'] = time.time()
+    # Only a definite HTTP answer makes a video broken; a timeout, connection
+    # error or a still-throttled status says nothing about the object
+    entry['unknown'] = not entry['ok'] and (entry['error'] is not None or entry['status'] in RETRY_STATUSES)
+    if entry['unknown']:
+        print(f"⚠️  UNKNOWN: {name} - {entry['error'] or entry['status']}")
+    elif not entry['ok']:
+        print(f"❌ BROKEN ({entry['status']}): {name}")
+    return name, url, entry
+
+async def check_all(items, cache):
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=PER_HOST_LIMIT)
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+    queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+    results = []
+
+    async def worker(session):
+        # One worker per connection the connector allows; its limit_per_host
+        # holds each host to PER_HOST_LIMIT while the rest go to other hosts
+        while not queue.empty():
+            name, url = queue.get_nowait()
+            results.append(await check_url(session, name, url, cache.get(url)))
+            if len(results) % 100 == 0:
+                broken = sum(1 for _, _, entry in results if not entry['ok'] and not entry['unknown'])
+                print(f"Progress: {len(results)}/{len(items)} checked, {broken} broken so far...")
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(*(worker(session) for _ in range(min(MAX_CONNECTIONS, len(items)))))
+    return results
+
+def validate(videos, cache, ttl=CACHE_TTL, now=None):
+    # Returns (valid, broken_names, unknown_names, rechecked). Only stale or
+    # missing cache entries hit the network; the cache dict is updated in place.
+    now = time.time() if now is None else now
+    stale = [(name, url) for name, url in videos.items() if not is_fresh(cache.get(url), now, ttl)]
+    if stale:
+        for name, url, entry in asyncio.run(check_all(stale, cache)):
+            cache[url] = entry
+
+    # Keep the original key order so the rewritten file diffs cleanly
+    valid = {name: url for name, url in videos.items() if cache[url]['ok']}
+    unknown = [name for name, url in videos.items() if cache[url].get('unknown')]
+    broken = [name for name, url in videos.items() if not cache[url]['ok'] and not cache[url].get('unknown')]
+    return valid, broken, unknown, len(stale)
+
+def marked_broken(catalog):
+    # URLs an earlier run marked broken are no longer in the JS file;
+    # {"<key> [<source>]": url} so they can be checked again
+    return {f"{key} [{source}]": url for key, urls in catalog.entries.items()
+            for source, url in urls.items() if url in catalog.broken}
 
 def main():
     print("Loading video map...")
-    videos = load_videos()
-    print(f"Found {len(videos)} videos to check.\n")
-    
-    valid_videos = {}
-    broken_videos = []
-    
-    # Use thread pool for faster checking
-    print("Checking URLs (this may take a few minutes)...")
-    with ThreadPoolExecutor(max_workers=20) as executor:
-        futures = {executor.submit(check_url, item): item for item in videos.items()}
-        
-        checked = 0
-        for future in as_completed(futures):
-            name, url, is_valid = future.result()
-            checked += 1
-            
-            if is_valid:
-                valid_videos[name] = url
-            else:
-                broken_videos.append(name)
-            
-            if checked % 100 == 0:
-                print(f"Progress: {checked}/{len(videos)} checked, {len(broken_videos)} broken so far...")
-    
+    store = VideoMapStore(VIDEOS_FILE)
+    videos = dict(store.videos)
+    catalog = VideoCatalog()
+    retry = marked_broken(catalog)
+    print(f"Found {len(videos)} videos to check, plus {len(retry)} marked broken earlier.\n")
+
+    cache = load_cache()
+    print("Checking URLs...")
+    valid_videos, broken_videos, unknown_videos, rechecked = validate(videos, cache)
+    recovered, _, _, _ = validate(retry, cache)
+    save_cache(cache)
+
     print(f"\n{'='*50}")
     print(f"RESULTS:")
     print(f"  Total videos: {len(videos)}")
+    print(f"  Checked over network: {rechecked} ({len(videos) - rechecked} from cache)")
     print(f"  Valid videos: {len(valid_videos)}")
     print(f"  Broken videos: {len(broken_videos)}")
+    print(f"  Unknown (timed out, kept): {len(unknown_videos)}")
+    print(f"  Recovered (were broken): {len(recovered)}")
     print(f"{'='*50}\n")
-    
+
+    if recovered:
+        print("RECOVERED - back in the video map:")
+        for name in sorted(recovered):
+            print(f"  - {name}")
+        print()
+        catalog.mark_broken(recovered.values(), broken=False)
+
+    if unknown_videos:
+        print("UNKNOWN - not removed, re-checked next run:")
+        for name in sorted(unknown_videos):
+            print(f"  - {name}")
+        print()
+
     if broken_videos:
-        print("BROKEN VIDEOS REMOVED:")
+        print("BROKEN VIDEOS:")
         for name in sorted(broken_videos):
             print(f"  - {name}")
-        
-        # Save clean version
-        js_content = "const EXERCISE_VIDEOS = " + json.dumps(valid_videos, indent=2) + ";"
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            f.write(js_content)
-        print(f"\n✅ Cleaned file saved with {len(valid_videos)} valid videos.")
+
+        # Broken URLs are marked in the catalog, so an exercise falls back to
+        # its other source (B2 -> Drive) or drops out if it has none
+        catalog.mark_broken(videos[name] for name in broken_videos)
+
+    if broken_videos or recovered:
+        catalog.write_js(VIDEOS_FILE)
+        print(f"\n✅ Video map saved with {len(catalog.resolve())} videos.")
     else:
-        print("✅ All videos are valid! No changes needed.")
+        print("✅ No broken videos. No changes needed.")
 
 if __name__ == "__main__":
     main()
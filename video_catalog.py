@@ -0,0 +1,192 @@
+import os
+import sys
+import json
+from video_map_store import VideoMapStore, parse_js
+
+CATALOG_FILE = "video_catalog.json"
+JS_FILE = "exercise_videos.js"
+DRIVE_FILE = "scanned_drive_videos.json"
+
+# Preferred source first: B2 is the CDN, Drive previews are the fallback
+POLICY = ["b2", "drive", "manual"]
+
+# Every exercise key with the URL each source has for it:
+#
+#   {"Ring Dips": {"b2": "https://f005.backblazeb2.com/...", "drive": "https://drive.google.com/..."}}
+#
+# Tools only ever replace their own source - convert_json_to_js.py owns
+# "drive", upload_b2.py owns "b2" - and exercise_videos.js is regenerated from
+# the catalog in one pass by picking, per key, the first source in POLICY whose
+# URL is not marked broken (validate_videos.py, which also re-checks marked
+# URLs and clears the ones that are back; a source writing a URL clears its
+# mark too). Entries that were in the JS file from elsewhere are kept as
+# "manual".
+#
+#   python video_catalog.py                  -> rebuild exercise_videos.js
+#   python video_catalog.py --prefer drive   -> Drive first for this build
+#   python video_catalog.py --stats
+
+
+def source_of(url):
+    if "backblazeb2.com" in url:
+        return "b2"
+    if "drive.google.com" in url:
+        return "drive"
+    return "manual"
+
+
+class VideoCatalog:
+    def __init__(self, path=CATALOG_FILE, policy=POLICY):
+        self.path = path
+        self.policy = list(policy)
+        self.entries = {}
+        self.broken = set()
+        self.changed = False
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.entries = data.get("entries", {})
+            self.broken = set(data.get("broken", []))
+        else:
+            self.bootstrap()
+
+    def bootstrap(self, js_path=JS_FILE, drive_path=DRIVE_FILE):
+        # First run: adopt whatever the JS file and the last Drive scan hold,
+        # so no existing mapping is lost
+        if os.path.exists(js_path):
+            with open(js_path, 'r', encoding='utf-8') as f:
+                for key, url in parse_js(f.read()).items():
+                    self.entries.setdefault(key, {})[source_of(url)] = url
+        if os.path.exists(drive_path):
+            with open(drive_path, 'r', encoding='utf-8') as f:
+                for key, url in json.load(f).items():
+                    self.entries.setdefault(key, {})["drive"] = url
+        self.changed = True
+        print(f"  -> Bootstrapped catalog with {len(self.entries)} exercises")
+
+    def save(self):
+        if not self.changed:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"entries": self.entries, "broken": sorted(self.broken)}, f, indent=1)
+        os.replace(tmp_path, self.path)
+        self.changed = False
+
+    def source(self, name):
+        return {key: urls[name] for key, urls in self.entries.items() if name in urls}
+
+    def set(self, name, key, url):
+        urls = self.entries.setdefault(key, {})
+        if urls.get(name) != url:
+            urls[name] = url
+            self.changed = True
+        # A source writing (or re-uploading) a URL is fresh evidence that it
+        # exists; validate_videos.py marks it again if it is still broken
+        if url in self.broken:
+            self.broken.discard(url)
+            self.changed = True
+
+    def discard(self, name, key):
+        urls = self.entries.get(key, {})
+        if name in urls:
+            del urls[name]
+            if not urls:
+                del self.entries[key]
+            self.changed = True
+
+    def update_source(self, name, videos):
+        for key, url in videos.items():
+            self.set(name, key, url)
+
+    def replace_source(self, name, videos):
+        # The tool owning `name` knows every key it has; other sources stay
+        removed = [key for key, urls in self.entries.items() if name in urls and key not in videos]
+        for key in removed:
+            self.discard(name, key)
+        self.update_source(name, videos)
+        return len(removed)
+
+    def mark_broken(self, urls, broken=True):
+        before = len(self.broken)
+        self.broken = self.broken | set(urls) if broken else self.broken - set(urls)
+        self.changed = self.changed or len(self.broken) != before
+
+    def pick(self, urls, policy=None):
+        for name in (policy or self.policy):
+            url = urls.get(name)
+            if url and url not in self.broken:
+                return url
+        return None
+
+    def resolve(self, policy=None):
+        videos = {}
+        for key, urls in self.entries.items():
+            url = self.pick(urls, policy)
+            if url:
+                videos[key] = url
+        return videos
+
+    def write_js(self, js_path=JS_FILE, policy=None, **compact_options):
+        # One journal batch and one compaction, whatever changed
+        self.save()
+        store = VideoMapStore(js_path)
+        changed = store.replace(self.resolve(policy))
+        store.close(**compact_options)
+        return changed
+
+    def stats(self):
+        counts = {}
+        for urls in self.entries.values():
+            combo = "+".join(sorted(urls))
+            counts[combo] = counts.get(combo, 0) + 1
+        return counts
+
+
+class SourceWriter:
+    # VideoMapStore-shaped view (get/set/close) of one source, for tools that
+    # used to write exercise_videos.js directly
+    def __init__(self, catalog, name, js_path=JS_FILE):
+        self.catalog = catalog
+        self.name = name
+        self.js_path = js_path
+        self.videos = catalog.source(name)
+
+    def get(self, key, default=None):
+        return self.videos.get(key, default)
+
+    def set(self, key, url):
+        self.videos[key] = url
+        self.catalog.set(self.name, key, url)
+
+    def delete(self, key):
+        self.videos.pop(key, None)
+        self.catalog.discard(self.name, key)
+
+    def close(self, **compact_options):
+        return self.catalog.write_js(self.js_path, **compact_options)
+
+
+def main():
+    args = sys.argv[1:]
+    policy = None
+    if "--prefer" in args:
+        first = args[args.index("--prefer") + 1]
+        policy = [first] + [name for name in POLICY if name != first]
+
+    catalog = VideoCatalog()
+    if "--stats" in args:
+        for combo, count in sorted(catalog.stats().items()):
+            print(f"{combo:<20} : {count}")
+        print(f"{'broken URLs':<20} : {len(catalog.broken)}")
+        catalog.save()
+        return
+
+    changed = catalog.write_js(policy=policy, minified="--minified" in args, sharded="--sharded" in args)
+    print(f"{JS_FILE}: {changed} entries changed ({len(catalog.entries)} exercises in catalog).")
+
+if __name__ == "__main__":
+    main()
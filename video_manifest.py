@@ -0,0 +1,94 @@
+import os
+import json
+import hashlib
+
+LOCAL_MANIFEST_FILE = "local_manifest.json"
+REMOTE_MANIFEST_FILE = "b2_manifest.json"
+VIDEO_EXTENSIONS = ('.mp4', '.mov')
+HASH_CHUNK = 1024 * 1024
+
+# Manifests are plain dicts of file name -> {"size", "sha1", ...}.
+# Local entries also carry "mtime" so unchanged files are never re-hashed;
+# remote entries carry "file_id" so renames can be done as server-side copies.
+
+
+def file_sha1(path):
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_manifest(path, manifest):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def build_local_manifest(folder, cached=None):
+    # Re-uses the cached SHA1 whenever size and mtime are unchanged
+    cached = cached or {}
+    manifest = {}
+    hashed = 0
+    for entry in os.scandir(folder):
+        if not entry.is_file() or not entry.name.lower().endswith(VIDEO_EXTENSIONS):
+            continue
+        stat = entry.stat()
+        size, mtime = stat.st_size, int(stat.st_mtime)
+        old = cached.get(entry.name)
+        if old and old['size'] == size and old['mtime'] == mtime:
+            manifest[entry.name] = old
+            continue
+        manifest[entry.name] = {"size": size, "mtime": mtime, "sha1": file_sha1(entry.path)}
+        hashed += 1
+    return manifest, hashed
+
+def diff_manifests(local, remote):
+    # Returns a dict of lists:
+    #   new      - local files whose content is not in the bucket at all
+    #   changed  - same name, different content
+    #   renamed  - (old_name, new_name) where the content moved to a new name
+    #   dedup    - (name, existing_remote_name) for content already stored elsewhere
+    #   deleted  - remote names with no local file
+    #   unchanged
+    remote_by_hash = {}
+    for name, entry in remote.items():
+        remote_by_hash.setdefault((entry['sha1'], entry['size']), []).append(name)
+
+    result = {"new": [], "changed": [], "renamed": [], "dedup": [], "deleted": [], "unchanged": []}
+    claimed = set()
+
+    for name in sorted(local):
+        entry = local[name]
+        old = remote.get(name)
+        if old and old['sha1'] == entry['sha1'] and old['size'] == entry['size']:
+            result["unchanged"].append(name)
+            continue
+
+        matches = remote_by_hash.get((entry['sha1'], entry['size']), [])
+        if old is None and matches:
+            # Prefer treating a vanished remote name as the source of a rename
+            gone = [m for m in matches if m not in local and m not in claimed]
+            if gone:
+                claimed.add(gone[0])
+                result["renamed"].append((gone[0], name))
+            else:
+                result["dedup"].append((name, matches[0]))
+        elif old is None:
+            result["new"].append(name)
+        else:
+            result["changed"].append(name)
+
+    for name in sorted(remote):
+        if name not in local and name not in claimed:
+            result["deleted"].append(name)
+    return result
+
+def summarize(diff):
+    return ", ".join(f"{len(items)} {kind}" for kind, items in diff.items())
@@ -0,0 +1,246 @@
+import os
+import re
+import json
+
+JS_FILE = "exercise_videos.js"
+JOURNAL_SUFFIX = ".journal.jsonl"
+MIN_FILE_SUFFIX = ".min.js"
+SHARD_DIR = "exercise_videos"
+JS_PREFIX = "const EXERCISE_VIDEOS = "
+COMPACT_EVERY = 500     # journal ops before a mid-run compaction
+
+# exercise_videos.js stays the canonical file the pages load. While a tool runs,
+# every change is appended to <js>.journal.jsonl (one {"op", "key", "url"} line
+# per change) instead of rewriting the whole 290 KB object; compact() folds the
+# journal back into the JS file with an atomic temp-file + rename.
+#
+# The JS file is hand-edited too (section comments, duplicate keys), so it is
+# read line by line rather than as JSON, and compaction streams the existing
+# lines through, only touching entries whose value changed.
+
+# One `"key": "url",` entry per line, as json.dumps(indent=2) writes it
+ENTRY_RE = re.compile(r'^(\s*)("(?:[^"\\]|\\.)*")\s*:\s*("(?:[^"\\]|\\.)*")\s*,?\s*$')
+
+
+def atomic_write(path, text):
+    atomic_write_lines(path, [text])
+
+def atomic_write_lines(path, lines):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def parse_js(content):
+    # Later duplicates win, same as the browser
+    videos = {}
+    for line in content.splitlines():
+        match = ENTRY_RE.match(line)
+        if match:
+            videos[json.loads(match.group(2))] = json.loads(match.group(3))
+    if videos:
+        return videos
+
+    # Minified single-line output
+    prefix = content.find(JS_PREFIX.strip())
+    if prefix == -1:
+        return {}
+    start = content.find("{", prefix)
+    end = content.rfind("}")
+    if start == -1 or end < start:
+        return {}
+    return json.loads(content[start:end + 1])
+
+def merge_lines(lines, videos, base=None):
+    # Yields the JS file with `videos` applied: changed entries rewritten,
+    # removed ones dropped, new ones added before the closing brace. Comments
+    # and layout pass through. The comma after an entry is only decided once
+    # the next line that matters is known. Keys whose value matches `base`
+    # (the map as last read from the file) keep every line as-is, so
+    # duplicate keys are not collapsed.
+    base = base or {}
+    seen = set()
+    pending = None      # last entry written, without its comma
+    held = []           # comment/blank lines that came after it
+
+    def flush(comma):
+        nonlocal pending, held
+        out = [pending + (",\n" if comma else "\n")] if pending is not None else []
+        out += held
+        pending, held = None, []
+        return out
+
+    for line in lines:
+        match = ENTRY_RE.match(line)
+        if match:
+            key = json.loads(match.group(2))
+            if key not in videos:
+                continue
+            seen.add(key)
+            value = match.group(3)
+            unchanged = key in base and base[key] == videos[key]
+            if not unchanged and json.loads(value) != videos[key]:
+                value = json.dumps(videos[key])
+            yield from flush(comma=True)
+            pending = f"{match.group(1)}{match.group(2)}: {value}"
+        elif line.lstrip().startswith("}"):
+            for key, url in videos.items():
+                if key not in seen:
+                    yield from flush(comma=True)
+                    pending = f"  {json.dumps(key)}: {json.dumps(url)}"
+            yield from flush(comma=False)
+            yield line
+        elif pending is not None:
+            held.append(line)
+        else:
+            yield line
+    yield from flush(comma=False)
+
+def render_js(video_map, minify=False):
+    if minify:
+        return JS_PREFIX.strip() + json.dumps(video_map, separators=(',', ':')) + ";"
+    return JS_PREFIX + json.dumps(video_map, indent=2) + ";"
+
+def shard_key(name):
+    first = name[:1].lower()
+    return first if first.isalpha() else "_"
+
+
+class VideoMapStore:
+    def __init__(self, js_path=JS_FILE, compact_every=COMPACT_EVERY):
+        self.js_path = js_path
+        self.journal_path = js_path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.videos = {}
+        self.base = {}
+        self.pending_ops = 0
+        self.load()
+
+    def load(self):
+        self.base = {}
+        if os.path.exists(self.js_path):
+            with open(self.js_path, 'r', encoding='utf-8') as f:
+                self.base = parse_js(f.read())
+        self.videos = dict(self.base)
+        self.pending_ops = self.replay_journal()
+
+    def replay_journal(self):
+        # Picks up changes from a run that died before compacting
+        if not os.path.exists(self.journal_path):
+            return 0
+        ops = 0
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    continue    # torn write at the tail
+                if op['op'] == 'set':
+                    self.videos[op['key']] = op['url']
+                elif op['op'] == 'del':
+                    self.videos.pop(op['key'], None)
+                ops += 1
+        return ops
+
+    def append(self, ops):
+        if not ops:
+            return
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            for op in ops:
+                f.write(json.dumps(op) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending_ops += len(ops)
+        if self.pending_ops >= self.compact_every:
+            self.compact()
+
+    def get(self, key, default=None):
+        return self.videos.get(key, default)
+
+    def set(self, key, url):
+        self.update({key: url})
+
+    def update(self, changes):
+        ops = []
+        for key, url in changes.items():
+            if self.videos.get(key) != url:
+                self.videos[key] = url
+                ops.append({"op": "set", "key": key, "url": url})
+        self.append(ops)
+        return len(ops)
+
+    def delete(self, keys):
+        ops = []
+        for key in keys:
+            if key in self.videos:
+                del self.videos[key]
+                ops.append({"op": "del", "key": key})
+        self.append(ops)
+        return len(ops)
+
+    def replace(self, videos):
+        # Swap in a whole new map - used by importers that own every key
+        self.delete([key for key in self.videos if key not in videos])
+        return self.update(videos)
+
+    def compact(self, minified=False, sharded=False):
+        if os.path.exists(self.js_path) and self.is_line_layout():
+            # Read fully first - Windows can't replace a file that is still open
+            with open(self.js_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+            atomic_write_lines(self.js_path, merge_lines(lines, self.videos, self.base))
+        else:
+            atomic_write(self.js_path, render_js(self.videos))
+        self.base = dict(self.videos)
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.pending_ops = 0
+        if minified:
+            self.write_minified()
+        if sharded:
+            self.write_shards()
+
+    def is_line_layout(self):
+        with open(self.js_path, 'r', encoding='utf-8') as f:
+            return any(ENTRY_RE.match(line) for line in f)
+
+    def write_minified(self):
+        path = self.js_path[:-len(".js")] + MIN_FILE_SUFFIX
+        atomic_write(path, render_js(self.videos, minify=True))
+        return path
+
+    def write_shards(self, shard_dir=SHARD_DIR):
+        # One JSON file per first letter plus an index the dashboard can use
+        # to fetch only the shard it needs
+        os.makedirs(shard_dir, exist_ok=True)
+        shards = {}
+        for key, url in self.videos.items():
+            shards.setdefault(shard_key(key), {})[key] = url
+
+        index = {}
+        for letter, videos in sorted(shards.items()):
+            filename = f"{letter}.json"
+            atomic_write(os.path.join(shard_dir, filename),
+                         json.dumps(videos, separators=(',', ':'), sort_keys=True))
+            index[letter] = {"file": filename, "count": len(videos)}
+
+        for filename in os.listdir(shard_dir):
+            letter = filename[:-len(".json")]
+            if filename.endswith(".json") and filename != "index.json" and letter not in index:
+                os.remove(os.path.join(shard_dir, filename))
+        atomic_write(os.path.join(shard_dir, "index.json"), json.dumps(index, indent=1))
+        return index
+
+    def close(self, **compact_options):
+        if self.pending_ops or compact_options:
+            self.compact(**compact_options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # On a crash the journal is left in place and replayed next time
+        if exc_type is None:
+            self.close()
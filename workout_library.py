@@ -0,0 +1,340 @@
+import os
+import re
+import sys
+import json
+from video_map_store import atomic_write
+
+LIBRARY_FILES = [
+    ("workout_library.js", "WORKOUT_LIBRARY"),
+    ("workout_library_extended.js", "WORKOUT_LIBRARY_EXTENDED"),
+]
+OUTPUT_DIR = "workout_data"
+DIFFICULTIES = ("Beginner", "Intermediate", "Advanced")
+# Upper bound (minutes) of each duration bucket; anything longer is the last bucket
+DURATION_BUCKETS = [20, 30, 40]
+
+# Reads WORKOUT_LIBRARY / WORKOUT_LIBRARY_EXTENDED with a real tokenizer for
+# the JS object-literal subset the files use (comments, quoted or bare keys,
+# single/double-quoted strings, numbers, trailing commas), validates every
+# workout and writes a compact build to workout_data/:
+#
+#   index.json      string table of exercise names, category/subcategory tree,
+#                   and workout ids by equipment, difficulty and duration
+#   <category>.json one shard per category; each workout is
+#                   [num, id, name, subcategory, minutes, difficulty,
+#                    [equipment], [[name idx, sets, reps, desc], ...]]
+#
+# `num` is the workout's integer id - its position across all shards - and is
+# what the indexes hold.
+#
+# workout_data/ is a local build (gitignored) - nothing in the app loads it
+# yet; dashboard.html still includes workout_library.js and
+# workout_library_extended.js. --check fails when an existing build no longer
+# matches the JS sources.
+#
+#   python workout_library.py           -> validate and build (+ .workout_search_index.json)
+#   python workout_library.py --check   -> validate, and fail if workout_data/ is stale
+#   python workout_library.py --tree    -> category/subcategory summary
+
+TOKEN_RE = re.compile(r'''
+    (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<word>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}\[\]:,;=])
+''', re.VERBOSE | re.DOTALL)
+WORDS = {"true": True, "false": False, "null": None}
+
+
+class ParseError(ValueError):
+    pass
+
+
+def tokenize(text, pos=0):
+    # Lazy, so parsing can stop at the end of a value and ignore the code after it
+    while pos < len(text):
+        m = TOKEN_RE.match(text, pos)
+        if not m:
+            line = text.count("\n", 0, pos) + 1
+            raise ParseError(f"line {line}: unexpected {text[pos:pos + 20]!r}")
+        kind = m.lastgroup
+        if kind != "space":
+            yield kind, m.group(), pos
+        pos = m.end()
+
+def js_string(token):
+    body = token[1:-1]
+    if token[0] == "'":
+        body = body.replace('\\"', '"').replace("\\'", "'").replace('"', '\\"')
+    return json.loads(f'"{body}"')
+
+
+class Parser:
+    def __init__(self, text, pos=0):
+        self.text = text
+        self.tokens = tokenize(text, pos)
+        self.current = next(self.tokens, (None, None, len(text)))
+
+    def error(self, message):
+        return ParseError(f"line {self.text.count(chr(10), 0, self.current[2]) + 1}: {message}")
+
+    def peek(self):
+        return self.current
+
+    def take(self, value=None):
+        kind, token, _ = self.current
+        if kind is None or (value is not None and token != value):
+            raise self.error(f"expected {value!r}, got {token!r}")
+        self.current = next(self.tokens, (None, None, len(self.text)))
+        return kind, token
+
+    def value(self):
+        kind, token, _ = self.peek()
+        if token == "{":
+            return self.obj()
+        if token == "[":
+            return self.array()
+        self.take()
+        if kind == "string":
+            return js_string(token)
+        if kind == "number":
+            return float(token) if "." in token else int(token)
+        if kind == "word" and token in WORDS:
+            return WORDS[token]
+        raise self.error(f"unexpected {token!r}")
+
+    def obj(self):
+        self.take("{")
+        result = {}
+        while self.peek()[1] != "}":
+            kind, token = self.take()
+            if kind == "string":
+                key = js_string(token)
+            elif kind in ("word", "number"):
+                key = token
+            else:
+                raise self.error(f"bad key {token!r}")
+            if key in result:
+                raise self.error(f"duplicate key {key!r}")
+            self.take(":")
+            result[key] = self.value()
+            if self.peek()[1] != ",":
+                break
+            self.take(",")
+        self.take("}")
+        return result
+
+    def array(self):
+        self.take("[")
+        result = []
+        while self.peek()[1] != "]":
+            result.append(self.value())
+            if self.peek()[1] != ",":
+                break
+            self.take(",")
+        self.take("]")
+        return result
+
+    @classmethod
+    def const(cls, text, name):
+        # The value assigned by `const NAME = ...`
+        m = re.search(rf'\b(?:const|let|var)\s+{re.escape(name)}\s*=', text)
+        if not m:
+            raise ParseError(f"{name} not defined")
+        return cls(text, m.end()).value()
+
+
+def load_library(files=LIBRARY_FILES, replaced=None):
+    # -> {category key: category}. A later file's category replaces an earlier
+    # one whole, as dashboard.html does with WORKOUT_LIBRARY_EXTENDED.yoga etc.;
+    # (key, file) pairs that were replaced are appended to `replaced`
+    library = {}
+    for path, name in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            part = Parser.const(f.read(), name)
+        for key, category in part.items():
+            if key in library and replaced is not None:
+                replaced.append((key, path))
+            library[key] = category
+    return library
+
+def iter_workouts(library):
+    # (category key, subcategory key, workout) in library order
+    for cat_key, category in library.items():
+        for sub_key, sub in category.get("subcategories", {}).items():
+            for workout in sub.get("workouts", []):
+                yield cat_key, sub_key, workout
+
+def minutes(duration):
+    m = re.match(r'(\d+)\s*min', duration or "")
+    return int(m.group(1)) if m else None
+
+def duration_bucket(mins):
+    for i, limit in enumerate(DURATION_BUCKETS):
+        if mins <= limit:
+            return f"{DURATION_BUCKETS[i - 1] + 1 if i else 0}-{limit}"
+    return f"{DURATION_BUCKETS[-1] + 1}+"
+
+def validate(library):
+    # -> list of problem strings; empty when the library is sound
+    problems = []
+    seen_ids = {}
+    for cat_key, category in library.items():
+        for field in ("name", "subcategories"):
+            if field not in category:
+                problems.append(f"{cat_key}: missing {field}")
+        for sub_key, sub in category.get("subcategories", {}).items():
+            if not sub.get("workouts"):
+                problems.append(f"{cat_key}/{sub_key}: no workouts")
+    for cat_key, sub_key, workout in iter_workouts(library):
+        where = f"{cat_key}/{sub_key}/{workout.get('id', '?')}"
+        for field in ("id", "name", "duration", "difficulty", "equipment", "exercises"):
+            if field not in workout:
+                problems.append(f"{where}: missing {field}")
+        # The dashboard finds workouts by id within a category
+        wid = (cat_key, workout.get("id"))
+        if wid in seen_ids:
+            problems.append(f"{where}: id also used in {seen_ids[wid]}")
+        seen_ids[wid] = f"{cat_key}/{sub_key}"
+        if "duration" in workout and minutes(workout["duration"]) is None:
+            problems.append(f"{where}: unreadable duration {workout['duration']!r}")
+        if workout.get("difficulty") not in DIFFICULTIES:
+            problems.append(f"{where}: unknown difficulty {workout.get('difficulty')!r}")
+        if not isinstance(workout.get("equipment", []), list):
+            problems.append(f"{where}: equipment is not a list")
+        if not workout.get("exercises"):
+            problems.append(f"{where}: no exercises")
+        for n, ex in enumerate(workout.get("exercises", []), 1):
+            if not isinstance(ex.get("name"), str) or not ex["name"].strip():
+                problems.append(f"{where}: exercise {n} has no name")
+            if not isinstance(ex.get("sets"), int) or ex["sets"] < 1:
+                problems.append(f"{where}: exercise {n} ({ex.get('name')}) has bad sets {ex.get('sets')!r}")
+            if "reps" not in ex:
+                problems.append(f"{where}: exercise {n} ({ex.get('name')}) has no reps")
+    return problems
+
+def compile_library(library):
+    # -> (index, {category key: shard})
+    strings, string_ids = [], {}
+    def string_id(text):
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text)
+        return string_ids[text]
+
+    shards = {key: {"workouts": []} for key in library}
+    indexes = {"equipment": {}, "difficulty": {}, "duration": {}}
+    workout_ids = []
+    for cat_key, sub_key, workout in iter_workouts(library):
+        num = len(workout_ids)
+        workout_ids.append(workout["id"])
+        mins = minutes(workout["duration"])
+        shards[cat_key]["workouts"].append([
+            num, workout["id"], workout["name"], sub_key, mins, workout["difficulty"],
+            workout["equipment"],
+            [[string_id(ex["name"]), ex["sets"], ex["reps"], ex.get("desc", "")] for ex in workout["exercises"]],
+        ])
+        for item in workout["equipment"]:
+            indexes["equipment"].setdefault(item, []).append(num)
+        indexes["difficulty"].setdefault(workout["difficulty"], []).append(num)
+        indexes["duration"].setdefault(duration_bucket(mins), []).append(num)
+
+    categories = {}
+    for cat_key, category in library.items():
+        categories[cat_key] = {
+            "name": category.get("name"),
+            "icon": category.get("icon"),
+            "description": category.get("description"),
+            "file": f"{cat_key}.json",
+            "subcategories": {
+                sub_key: {"name": sub.get("name"), "description": sub.get("description"),
+                          "count": len(sub.get("workouts", []))}
+                for sub_key, sub in category.get("subcategories", {}).items()
+            },
+        }
+    index = {"strings": strings, "workout_ids": workout_ids, "categories": categories,
+             "duration_buckets": DURATION_BUCKETS, "indexes": indexes}
+    return index, shards
+
+def build_files(index, shards):
+    # -> {filename: JSON text}; index.json is written last
+    compact = dict(separators=(',', ':'), ensure_ascii=False)
+    files = {f"{cat_key}.json": json.dumps(shard, **compact) for cat_key, shard in shards.items()}
+    files["index.json"] = json.dumps(index, **compact)
+    return files
+
+def write_build(index, shards, output_dir=OUTPUT_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    files = build_files(index, shards)
+    for filename, text in files.items():
+        atomic_write(os.path.join(output_dir, filename), text)
+    for filename in os.listdir(output_dir):
+        if filename.endswith(".json") and filename not in files:
+            os.remove(os.path.join(output_dir, filename))
+
+def stale_files(index, shards, output_dir=OUTPUT_DIR):
+    # Build files that are missing, extra, or differ from a fresh compile
+    files = build_files(index, shards)
+    stale = sorted(name for name in os.listdir(output_dir)
+                   if name.endswith(".json") and name not in files)
+    for name, text in files.items():
+        path = os.path.join(output_dir, name)
+        if not os.path.exists(path):
+            stale.append(name)
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() != text:
+                stale.append(name)
+    return stale
+
+def print_tree(library):
+    for cat_key, category in library.items():
+        print(f"Category: {cat_key}")
+        for sub_key, sub in category.get("subcategories", {}).items():
+            print(f"  - {sub_key} ({len(sub.get('workouts', []))} workouts)")
+
+def main():
+    args = sys.argv[1:]
+    replaced = []
+    library = load_library(replaced=replaced)
+    workouts = sum(1 for _ in iter_workouts(library))
+    print(f"  -> Parsed {len(library)} categories, {workouts} workouts")
+    for key, path in replaced:
+        print(f"  -> '{key}' from {path} replaces the earlier definition")
+    if "--tree" in args:
+        print_tree(library)
+        return
+
+    problems = validate(library)
+    for problem in problems:
+        print(f"[!] {problem}")
+    if problems:
+        print(f"{len(problems)} problem(s) - build skipped.")
+        sys.exit(1)
+    if "--check" in args:
+        print("Library is valid.")
+        if not os.path.isdir(OUTPUT_DIR):
+            print(f"{OUTPUT_DIR}/ not built (python workout_library.py).")
+            return
+        stale = stale_files(*compile_library(library))
+        if stale:
+            print(f"[!] {OUTPUT_DIR}/ is out of date with the JS sources: {', '.join(stale)}")
+            print("Rebuild with: python workout_library.py")
+            sys.exit(1)
+        print(f"{OUTPUT_DIR}/ is up to date.")
+        return
+
+    index, shards = compile_library(library)
+    write_build(index, shards)
+    sizes = sum(os.path.getsize(os.path.join(OUTPUT_DIR, f)) for f in os.listdir(OUTPUT_DIR))
+    source = sum(os.path.getsize(path) for path, _ in LIBRARY_FILES)
+    print(f"Saved {len(shards)} shards + index to {OUTPUT_DIR}/ "
+          f"({sizes / 1024:.0f} KB vs {source / 1024:.0f} KB of JS, {len(index['strings'])} exercise names)")
+
+    # Search bitsets share the workout numbering, so they are rebuilt together
+    import workout_search
+    workout_search.WorkoutSearch.build(library).save()
+    print(f"Saved search index to {workout_search.OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    main()
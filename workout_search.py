@@ -0,0 +1,199 @@
+import sys
+import json
+import workout_library
+from video_map_store import atomic_write
+
+OUTPUT_FILE = ".workout_search_index.json"
+WORD_BITS = 32          # bitsets are saved as arrays of 32-bit words
+
+# Facet bitsets over every workout in the library: bit n is set when workout
+# n (workout_library's integer id - the same order as workout_data/) has the
+# facet value. A multi-facet question is then a few ORs within a facet and an
+# AND across facets, instead of a walk over the nested library:
+#
+#   equipment   required equipment, normalised ("Light Dumbbells" -> "Dumbbells",
+#               "Optional: ..." / "None" -> nothing required)
+#   difficulty  Beginner / Intermediate / Advanced
+#   duration    workout_library.DURATION_BUCKETS labels; minutes: exact values
+#   muscle      from the subcategory (gym/push -> chest, shoulders, arms)
+#
+# plus an inverted exercise name -> workout ids index. The index is saved to
+# .workout_search_index.json (a local build, like workout_data/).
+#
+#   python workout_search.py --build
+#   python workout_search.py --equipment Dumbbells --max-minutes 30
+#   python workout_search.py --muscle legs --difficulty Beginner --exercise "Goblet Squat"
+
+NO_EQUIPMENT = {"None", "Mat", "Bench or Floor"}
+EQUIPMENT_ALIASES = {
+    "Light Dumbbells": "Dumbbells",
+    "Light Resistance Band": "Resistance Bands",
+    "Pull-up bar": "Pull-up Bar",
+    "Pull-up bar or door frame": "Pull-up Bar",
+}
+UPPER = ["chest", "back", "shoulders", "arms"]
+MUSCLE_GROUPS = {
+    "back": ["back"], "legs": ["legs"], "chest": ["chest"], "shoulders": ["shoulders"],
+    "arms": ["arms"], "core": ["core"], "armscore": ["arms", "core"],
+    "push": ["chest", "shoulders", "arms"], "pull": ["back", "arms"],
+    "upper": UPPER, "upperbody": UPPER, "lower": ["legs"], "lowerbody": ["legs"],
+    "fullbody": ["full body"],
+    # rehab
+    "shoulder": ["shoulders"], "knee": ["legs"], "hip": ["legs"], "ankle": ["legs"],
+    "lower_back": ["back", "core"], "neck": ["neck"],
+}
+# Whole categories whose subcategories are styles, not body parts
+CATEGORY_MUSCLES = {"hiit": ["full body"], "yoga": ["full body"], "recovery": ["full body"]}
+
+
+def required_equipment(items):
+    required = set()
+    for item in items:
+        if item in NO_EQUIPMENT or item.startswith("Optional"):
+            continue
+        required.add(EQUIPMENT_ALIASES.get(item, item))
+    return required
+
+def muscles_for(cat_key, sub_key):
+    return CATEGORY_MUSCLES.get(cat_key) or MUSCLE_GROUPS.get(sub_key, [])
+
+def to_words(bits, count):
+    return [(bits >> i) & 0xFFFFFFFF for i in range(0, count, WORD_BITS)]
+
+def from_words(words):
+    bits = 0
+    for i, word in enumerate(words):
+        bits |= word << (i * WORD_BITS)
+    return bits
+
+
+class WorkoutSearch:
+    def __init__(self, workouts, facets, exercises):
+        self.workouts = workouts        # [[category, subcategory, id, name, minutes], ...]
+        self.facets = facets            # facet -> value -> int bitset
+        self.exercises = exercises      # exercise name -> [workout ids]
+        self.all = (1 << len(workouts)) - 1
+
+    @classmethod
+    def build(cls, library):
+        workouts, facets, exercises = [], {}, {}
+        def add(facet, value, num):
+            values = facets.setdefault(facet, {})
+            values[value] = values.get(value, 0) | (1 << num)
+        for num, (cat_key, sub_key, workout) in enumerate(workout_library.iter_workouts(library)):
+            mins = workout_library.minutes(workout["duration"])
+            workouts.append([cat_key, sub_key, workout["id"], workout["name"], mins])
+            for item in sorted(required_equipment(workout["equipment"])):
+                add("equipment", item, num)
+            add("difficulty", workout["difficulty"], num)
+            add("duration", workout_library.duration_bucket(mins), num)
+            add("minutes", str(mins), num)
+            add("category", cat_key, num)
+            for muscle in muscles_for(cat_key, sub_key):
+                add("muscle", muscle, num)
+            for ex in workout["exercises"]:
+                nums = exercises.setdefault(ex["name"], [])
+                if not nums or nums[-1] != num:
+                    nums.append(num)
+        return cls(workouts, facets, dict(sorted(exercises.items())))
+
+    @classmethod
+    def load(cls, path=OUTPUT_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        facets = {facet: {value: from_words(words) for value, words in values.items()}
+                  for facet, values in data["facets"].items()}
+        return cls(data["workouts"], facets, data["exercises"])
+
+    def to_data(self):
+        count = len(self.workouts)
+        return {
+            "count": count,
+            "word_bits": WORD_BITS,
+            "workouts": self.workouts,
+            "facets": {facet: {value: to_words(bits, count) for value, bits in values.items()}
+                       for facet, values in self.facets.items()},
+            "exercises": self.exercises,
+        }
+
+    def save(self, path=OUTPUT_FILE):
+        atomic_write(path, json.dumps(self.to_data(), separators=(',', ':'), ensure_ascii=False))
+
+    def any_of(self, facet, values):
+        bits = 0
+        for value in values:
+            bits |= self.facets.get(facet, {}).get(value, 0)
+        return bits
+
+    def query(self, equipment=None, uses=None, difficulty=None, duration=None,
+              max_minutes=None, muscle=None, category=None, exercise=None):
+        # -> bitset. equipment: only needs these (subset); uses: needs any of
+        # these; the other filters match any of their values. None = no filter.
+        bits = self.all
+        if equipment is not None:
+            others = [e for e in self.facets.get("equipment", {}) if e not in equipment]
+            bits &= ~self.any_of("equipment", others)
+        if uses:
+            bits &= self.any_of("equipment", uses)
+        if difficulty:
+            bits &= self.any_of("difficulty", difficulty)
+        if duration:
+            bits &= self.any_of("duration", duration)
+        if max_minutes is not None:
+            bits &= self.any_of("minutes", [m for m in self.facets.get("minutes", {}) if int(m) <= max_minutes])
+        if muscle:
+            bits &= self.any_of("muscle", muscle)
+        if category:
+            bits &= self.any_of("category", category)
+        if exercise:
+            with_exercise = 0
+            for name in exercise:
+                for num in self.exercises.get(name, ()):
+                    with_exercise |= 1 << num
+            bits &= with_exercise
+        return bits
+
+    def ids(self, bits):
+        nums = []
+        while bits:
+            low = bits & -bits
+            nums.append(low.bit_length() - 1)
+            bits ^= low
+        return nums
+
+    def find(self, **filters):
+        return [self.workouts[num] for num in self.ids(self.query(**filters))]
+
+
+def option_list(args, name):
+    values = [args[i + 1] for i, a in enumerate(args[:-1]) if a == name]
+    return values or None
+
+def main():
+    args = sys.argv[1:]
+    if "--build" in args:
+        library = workout_library.load_library()
+        search = WorkoutSearch.build(library)
+        search.save()
+        facets = ", ".join(f"{facet} {len(values)}" for facet, values in search.facets.items())
+        print(f"Saved {len(search.workouts)} workouts ({facets}; {len(search.exercises)} exercises) to {OUTPUT_FILE}")
+        return
+
+    search = WorkoutSearch.load()
+    max_minutes = option_list(args, "--max-minutes")
+    results = search.find(
+        equipment=option_list(args, "--equipment"),
+        uses=option_list(args, "--uses"),
+        difficulty=option_list(args, "--difficulty"),
+        duration=option_list(args, "--duration"),
+        max_minutes=int(max_minutes[0]) if max_minutes else None,
+        muscle=option_list(args, "--muscle"),
+        category=option_list(args, "--category"),
+        exercise=option_list(args, "--exercise"),
+    )
+    for cat_key, sub_key, wid, name, mins in results:
+        print(f"{cat_key}/{sub_key:<16} {wid:<24} {mins:>3} min  {name}")
+    print(f"\n{len(results)} of {len(search.workouts)} workouts")
+
+if __name__ == "__main__":
+    main()